@@ -0,0 +1,65 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled ADS-B altitude kernels
+
+Optional C extension mirroring the pure-Python kernels in
+adsb_altitude_decoder. Build in place with:
+
+    python setup.py build_ext --inplace
+
+adsb_altitude_decoder picks these up automatically when the extension
+is importable.
+"""
+
+# Sentinel returned when a field cannot be decoded (matches ALTITUDE_INVALID)
+cdef long long ALTITUDE_INVALID = -2147483648
+
+
+cdef inline long long _gray_to_binary(long long gray_code) nogil:
+    gray_code ^= gray_code >> 1
+    gray_code ^= gray_code >> 2
+    gray_code ^= gray_code >> 4
+    gray_code ^= gray_code >> 8
+    return gray_code
+
+
+cpdef long long decode_baro_bits(unsigned char b2, unsigned char b3, unsigned char b4) nogil:
+    """Decode barometric altitude in feet from message bytes 2-4."""
+    cdef long long altitude_bits = (<long long>b2 << 16) | (<long long>b3 << 8) | b4
+    cdef long long altitude_field = (altitude_bits >> 4) & 0x1FFF
+    cdef long long altitude_code, altitude_ft
+
+    if altitude_field & 0x01:
+        altitude_code = ((altitude_field & 0x1FE0) >> 1) | (altitude_field & 0x000F)
+    else:
+        altitude_code = _gray_to_binary(altitude_field) << 2
+
+    altitude_ft = altitude_code * 25 - 1000
+    if ((altitude_code >> 6) & 0x07) == 5:
+        altitude_ft += 1000
+
+    return altitude_ft
+
+
+cpdef long long decode_geo_bits(unsigned char b2, unsigned char b3, unsigned char b4) nogil:
+    """Decode geometric altitude in feet from message bytes 2-4."""
+    cdef long long altitude_bits = (<long long>b2 << 16) | (<long long>b3 << 8) | b4
+    cdef long long quarter_ft = ((altitude_bits >> 5) & 0x0FFF) * 25 - 4000
+    if quarter_ft < 0:
+        quarter_ft += 3
+    return quarter_ft >> 2
+
+
+def decode_batch(const unsigned char[:, :] msgs, const long long[:] type_codes,
+                 long long[:] baro, long long[:] geo):
+    """Fill raw barometric/geometric altitude columns without holding the GIL."""
+    cdef Py_ssize_t i
+    cdef long long tc
+
+    with nogil:
+        for i in range(msgs.shape[0]):
+            tc = type_codes[i]
+            if 9 <= tc <= 18:
+                baro[i] = decode_baro_bits(msgs[i, 2], msgs[i, 3], msgs[i, 4])
+            elif tc == 31:
+                geo[i] = decode_geo_bits(msgs[i, 2], msgs[i, 3], msgs[i, 4])
@@ -16,13 +16,231 @@ Supports:
 Author: NASA G-III Navigation Validation System
 """
 
+import array
 import struct
 import logging
+import os
+import time
+from collections.abc import Mapping
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 import config
 from logger import logger
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; only the batch decode API needs it
+    np = None
+
+try:
+    from numba import config as numba_config, njit, prange
+except ImportError:
+    # Numba is optional; the kernels below run as plain Python without it
+    njit = None
+
+try:
+    import adsb_alt_fast
+except ImportError:
+    # Compiled kernels are optional; build with: python setup.py build_ext --inplace
+    adsb_alt_fast = None
+
+
+# Sentinel returned by the bit-level kernels when a field cannot be decoded
+ALTITUDE_INVALID = -2**31
+
+# Altitude validation settings, resolved once at import
+MIN_VALID_ALTITUDE_FT = getattr(config, 'MIN_VALID_ALTITUDE_FT', -1000)
+MAX_VALID_ALTITUDE_FT = getattr(config, 'MAX_VALID_ALTITUDE_FT', 60000)
+ENABLE_ALTITUDE_SANITY_CHECKS = getattr(config, 'ENABLE_ALTITUDE_SANITY_CHECKS', True)
+
+
+def _gray_to_binary(gray_code):
+    """Convert a Gray-coded integer (up to 16 bits) to binary."""
+    # Prefix-XOR folding: constant four steps, no data-dependent loop
+    gray_code ^= gray_code >> 1
+    gray_code ^= gray_code >> 2
+    gray_code ^= gray_code >> 4
+    gray_code ^= gray_code >> 8
+    return gray_code
+
+
+def _decode_baro_bits(b2, b3, b4):
+    """
+    Decode barometric altitude from message bytes 2-4.
+
+    Pure integer kernel shared by the scalar decoder; compiled with Numba
+    when it is installed.
+
+    Args:
+        b2, b3, b4: Message bytes 2, 3 and 4
+
+    Returns:
+        Altitude in feet, or ALTITUDE_INVALID if decoding failed
+    """
+    altitude_bits = (b2 << 16) | (b3 << 8) | b4
+    altitude_field = (altitude_bits >> 4) & 0x1FFF
+
+    # Work in 25-ft units so both encodings share one conversion and offset check
+    if altitude_field & 0x01:
+        # Q-bit = 1: Direct 25-ft LSB encoding
+        altitude_code = ((altitude_field & 0x1FE0) >> 1) | (altitude_field & 0x000F)
+    else:
+        # Q-bit = 0: Gillham (Gray) code encoding in 100-ft increments
+        altitude_code = _gray_to_binary(altitude_field) << 2
+
+    altitude_ft = altitude_code * 25 - 1000
+
+    # Apply offset correction if needed (bits 6-8 of the code == 5)
+    if (altitude_code >> 6) & 0x07 == 5:
+        altitude_ft += 1000
+
+    return altitude_ft
+
+
+def _decode_geo_bits(b2, b3, b4):
+    """
+    Decode geometric altitude from message bytes 2-4.
+
+    Args:
+        b2, b3, b4: Message bytes 2, 3 and 4
+
+    Returns:
+        Altitude in feet (12-bit field, 6.25 ft resolution)
+    """
+    altitude_bits = (b2 << 16) | (b3 << 8) | b4
+    # 6.25 ft = 25/4 ft, kept in integer arithmetic (quarter feet, truncated toward zero)
+    quarter_ft = ((altitude_bits >> 5) & 0x0FFF) * 25 - 4000
+    if quarter_ft < 0:
+        quarter_ft += 3
+    return quarter_ft >> 2
+
+
+def _gray_to_binary_np(gray_codes):
+    """Vectorized Gray-to-binary conversion over an integer array (up to 16 bits)."""
+    binary = gray_codes.copy()
+    binary ^= binary >> 1
+    binary ^= binary >> 2
+    binary ^= binary >> 4
+    binary ^= binary >> 8
+    return binary
+
+
+if np is not None:
+    # ASCII code -> nibble value; 0xFF marks characters that are not hex digits
+    _HEX_NIBBLE_LUT = np.full(256, 0xFF, dtype=np.uint8)
+    for _digit in '0123456789abcdefABCDEF':
+        _HEX_NIBBLE_LUT[ord(_digit)] = int(_digit, 16)
+    del _digit
+
+
+def hex_to_message_array(raw_msgs):
+    """
+    Convert ADS-B hex strings into an (N, 14) uint8 array for batch decoding.
+    
+    The hex digits of all messages are translated through a nibble lookup
+    table in one NumPy pass instead of calling bytes.fromhex per message.
+    
+    Args:
+        raw_msgs: Sequence of 28-character hex strings
+        
+    Returns:
+        (N, 14) uint8 array of message bytes
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batch altitude decoding")
+    
+    if any(len(raw_msg) != 28 for raw_msg in raw_msgs):
+        raise ValueError("Batch messages must be 28-character hex strings")
+    
+    ascii_digits = np.frombuffer(''.join(raw_msgs).encode('ascii'), dtype=np.uint8)
+    nibbles = _HEX_NIBBLE_LUT[ascii_digits].reshape(len(raw_msgs), 28)
+    if (nibbles == 0xFF).any():
+        raise ValueError("Batch messages contain non-hex characters")
+    
+    return (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+
+
+if njit is not None:
+    if not (os.environ.get('NUMBA_THREADING_LAYER') or os.environ.get('NUMBA_THREADING_LAYER_PRIORITY')):
+        # ADSBParser.parse_batch forks worker processes, and a process that has
+        # started TBB threads can hang at exit after a fork; try TBB last
+        numba_config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+    _gray_to_binary = njit('int64(int64)', cache=True)(_gray_to_binary)
+    # Own names, so the compiled extension below cannot replace what the
+    # parallel kernel resolves when Numba first compiles it
+    _baro_bits_jit = njit('int64(uint8, uint8, uint8)', cache=True,
+                          boundscheck=False)(_decode_baro_bits)
+    _geo_bits_jit = njit('int64(uint8, uint8, uint8)', cache=True,
+                         boundscheck=False)(_decode_geo_bits)
+    _decode_baro_bits = _baro_bits_jit
+    _decode_geo_bits = _geo_bits_jit
+
+    @njit(parallel=True, cache=True)
+    def _decode_batch_parallel(msgs, type_codes, baro, geo):
+        """Fill raw barometric/geometric altitude columns in parallel."""
+        for i in prange(msgs.shape[0]):
+            tc = type_codes[i]
+            if 9 <= tc <= 18:
+                baro[i] = _baro_bits_jit(msgs[i, 2], msgs[i, 3], msgs[i, 4])
+            elif tc == 31:
+                geo[i] = _geo_bits_jit(msgs[i, 2], msgs[i, 3], msgs[i, 4])
+elif adsb_alt_fast is not None:
+    # Not parallel, but runs the whole batch in C with the GIL released
+    _decode_batch_parallel = adsb_alt_fast.decode_batch
+else:
+    _decode_batch_parallel = None
+
+if adsb_alt_fast is not None:
+    # The compiled extension has no JIT warmup, so prefer it for scalar calls
+    _decode_baro_bits = adsb_alt_fast.decode_baro_bits
+    _decode_geo_bits = adsb_alt_fast.decode_geo_bits
+
+
+class ADSBAltitudeResult(Mapping):
+    """
+    Decoded altitude for a single message.
+    
+    A fixed-layout record instead of a per-message dict. It also behaves as
+    a read-only mapping of the fields that are set, so existing callers can
+    keep using ``'altitude_baro_ft' in result``, ``result[key]`` and
+    ``data.update(result)``.
+    """
+    
+    __slots__ = ('altitude_baro_ft', 'altitude_geo_ft', 'altitude_decoded_at_ns')
+    
+    def __init__(self, altitude_baro_ft: Optional[int] = None, altitude_geo_ft: Optional[int] = None,
+                 altitude_decoded_at_ns: Optional[int] = None):
+        self.altitude_baro_ft = altitude_baro_ft
+        self.altitude_geo_ft = altitude_geo_ft
+        self.altitude_decoded_at_ns = altitude_decoded_at_ns
+    
+    def __getitem__(self, key: str):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+    
+    def __iter__(self):
+        return (key for key in self.__slots__ if getattr(self, key) is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the fields that are set as a plain dict."""
+        return {key: getattr(self, key) for key in self}
+    
+    def __repr__(self) -> str:
+        return f"ADSBAltitudeResult({self.as_dict()})"
+
 
 class ADSBAltitudeDecoder:
     """
@@ -35,48 +253,47 @@ class ADSBAltitudeDecoder:
     - Comprehensive sanity checking
     """
     
-    # Gillham code to binary conversion table
-    GILLHAM_TO_BINARY = {
-        # Gray code to binary lookup for altitude decoding
-        # This table maps 4-bit Gray code values to binary
-        0b0000: 0b0000,  # 0
-        0b0001: 0b0001,  # 1
-        0b0011: 0b0010,  # 2
-        0b0010: 0b0011,  # 3
-        0b0110: 0b0100,  # 4
-        0b0111: 0b0101,  # 5
-        0b0101: 0b0110,  # 6
-        0b0100: 0b0111,  # 7
-        0b1100: 0b1000,  # 8
-        0b1101: 0b1001,  # 9
-        0b1111: 0b1010,  # 10
-        0b1110: 0b1011,  # 11
-        0b1010: 0b1100,  # 12
-        0b1011: 0b1101,  # 13
-        0b1001: 0b1110,  # 14
-        0b1000: 0b1111,  # 15
-    }
+    # Gillham code to binary conversion table for a single 4-bit Gray nibble,
+    # indexed by the Gray value (GILLHAM_TO_BINARY[gray] -> binary). The
+    # decoder converts whole fields with _gray_to_binary; the table is kept
+    # for nibble-wise callers and matches it for 0-15.
+    GILLHAM_TO_BINARY = (
+        0b0000, 0b0001, 0b0011, 0b0010,  # Gray 0-3
+        0b0111, 0b0110, 0b0100, 0b0101,  # Gray 4-7
+        0b1111, 0b1110, 0b1100, 0b1101,  # Gray 8-11
+        0b1000, 0b1001, 0b1011, 0b1010,  # Gray 12-15
+    )
+    
+    # Statistics counters, in the order used by get_stats_array()
+    STAT_COUNTERS = (
+        'altitudes_decoded',
+        'barometric_altitudes',
+        'geometric_altitudes',
+        'q_bit_zero_count',
+        'q_bit_one_count',
+        'gillham_conversions',
+        'sanity_check_failures',
+        'decode_errors',
+    )
+    
+    # Validation limits shared by all instances; assign on an instance to override
+    min_valid_altitude = MIN_VALID_ALTITUDE_FT
+    max_valid_altitude = MAX_VALID_ALTITUDE_FT
+    enable_sanity_checks = ENABLE_ALTITUDE_SANITY_CHECKS
     
     def __init__(self):
         """Initialize the altitude decoder."""
-        self.logger = logging.getLogger(__name__)
-        
         # Statistics
-        self.altitudes_decoded = 0
-        self.barometric_altitudes = 0
-        self.geometric_altitudes = 0
-        self.q_bit_zero_count = 0
-        self.q_bit_one_count = 0
-        self.gillham_conversions = 0
-        self.sanity_check_failures = 0
-        self.decode_errors = 0
-        
-        # Configuration
-        self.min_valid_altitude = getattr(config, 'MIN_VALID_ALTITUDE_FT', -1000)
-        self.max_valid_altitude = getattr(config, 'MAX_VALID_ALTITUDE_FT', 60000)
-        self.enable_sanity_checks = getattr(config, 'ENABLE_ALTITUDE_SANITY_CHECKS', True)
-        
-    def decode_altitude(self, raw_msg: str, type_code: int) -> Optional[Dict[str, Any]]:
+        self.reset_stats()
+        
+        # Configuration (validation limits are class-level defaults, see above)
+        self.log_decoding = getattr(config, 'LOG_ALTITUDE_DECODING', False)
+        
+        # Type code -> (decoder, is barometric), built once so decoding is a single lookup
+        self._dispatch = {tc: (self._decode_barometric_altitude, True) for tc in range(9, 19)}
+        self._dispatch[31] = (self._decode_geometric_altitude, False)
+        
+    def decode_altitude(self, raw_msg: str, type_code: int) -> Optional[ADSBAltitudeResult]:
         """
         Main altitude decoding method.
         
@@ -85,261 +302,348 @@ class ADSBAltitudeDecoder:
             type_code: ADS-B type code
             
         Returns:
-            Dictionary with altitude data or None if decoding failed
+            ADSBAltitudeResult with altitude data or None if decoding failed
         """
         try:
-            if config.LOG_ALTITUDE_DECODING:
-                logger.debug(f"[ALT] Decoding altitude for TC={type_code}")
-            
-            altitude_data = {}
+            if self.log_decoding:
+                logger.debug("[ALT] Decoding altitude for TC=%s", type_code)
             
-            # Decode based on type code
-            if 9 <= type_code <= 18:
-                # Barometric altitude
-                baro_alt = self._decode_barometric_altitude(raw_msg)
-                if baro_alt is not None:
-                    altitude_data['altitude_baro_ft'] = baro_alt
-                    self.barometric_altitudes += 1
-                    
-            elif type_code == 31:
-                # Geometric altitude
-                geo_alt = self._decode_geometric_altitude(raw_msg)
-                if geo_alt is not None:
-                    altitude_data['altitude_geo_ft'] = geo_alt
-                    self.geometric_altitudes += 1
+            # Decode based on type code (barometric for TC 9-18, geometric for TC 31)
+            dispatch = self._dispatch.get(type_code)
+            if dispatch is None:
+                return None
             
-            # Apply sanity checks
-            if altitude_data and self.enable_sanity_checks:
-                if not self._validate_altitude_data(altitude_data):
-                    self.sanity_check_failures += 1
-                    return None
+            decode_fn, is_barometric = dispatch
+            altitude = decode_fn(raw_msg)
+            if altitude is None:
+                return None
             
-            if altitude_data:
-                self.altitudes_decoded += 1
-                altitude_data['altitude_decoded_at'] = datetime.now(timezone.utc)
-                
-                if config.LOG_ALTITUDE_DECODING:
-                    logger.debug(f"[ALT] Successfully decoded: {altitude_data}")
+            if is_barometric:
+                altitude_data = ADSBAltitudeResult(altitude_baro_ft=altitude)
+                self.barometric_altitudes += 1
+            else:
+                altitude_data = ADSBAltitudeResult(altitude_geo_ft=altitude)
+                self.geometric_altitudes += 1
             
-            return altitude_data if altitude_data else None
+            return self._finalize_result(altitude_data)
             
         except Exception as e:
             self.decode_errors += 1
-            logger.error(f"[ALT] Altitude decoding error: {e}")
+            logger.error("[ALT] Altitude decoding error: %s", e)
             return None
     
-    def _decode_barometric_altitude(self, raw_msg: str) -> Optional[int]:
+    @classmethod
+    def specialize(cls, type_codes=range(9, 19)) -> 'ADSBAltitudeDecoder':
         """
-        Decode barometric altitude from ADS-B message.
+        Create a decoder specialized for a known subset of type codes.
+        
+        When the subset is barometric-only (TC 9-18) or geometric-only (TC 31),
+        decode_altitude is bound to a single-path variant without the type-code
+        dispatch. Type codes outside the subset decode to None.
         
         Args:
-            raw_msg: Hex string of the ADS-B message
+            type_codes: Type codes the decoder will accept
             
         Returns:
-            Altitude in feet, or None if decoding failed
+            Specialized ADSBAltitudeDecoder instance
         """
+        decoder = cls()
+        codes = frozenset(type_codes)
+        unsupported = codes - decoder._dispatch.keys()
+        if unsupported:
+            raise ValueError(f"No altitude decoding for type codes: {sorted(unsupported)}")
+        
+        decoder._dispatch = {tc: entry for tc, entry in decoder._dispatch.items() if tc in codes}
+        if codes == {31}:
+            decoder.decode_altitude = decoder._decode_altitude_geometric
+        elif codes and 31 not in codes:
+            decoder.decode_altitude = decoder._decode_altitude_barometric
+        
+        return decoder
+    
+    def _decode_altitude_barometric(self, raw_msg: str, type_code: int) -> Optional[ADSBAltitudeResult]:
+        """decode_altitude specialized for barometric-only type codes."""
         try:
-            # Convert hex string to bytes
-            msg_bytes = bytes.fromhex(raw_msg)
-            if len(msg_bytes) < 14:
+            if type_code not in self._dispatch:
                 return None
             
-            # Extract altitude field (bits 20-32 of the message)
-            # This is in bytes 2-4 of the message
-            altitude_bits = (msg_bytes[2] << 16) | (msg_bytes[3] << 8) | msg_bytes[4]
-            
-            # Extract 13-bit altitude field (bits 20-32)
-            altitude_field = (altitude_bits >> 4) & 0x1FFF
-            
-            # Check Q-bit (bit 4 of the altitude field, which is bit 24 of the message)
-            q_bit = (altitude_bits >> 4) & 0x01
+            altitude = self._decode_barometric_altitude(raw_msg)
+            if altitude is None:
+                return None
             
-            if config.LOG_ALTITUDE_DECODING:
-                logger.debug(f"[ALT] Altitude field: 0x{altitude_field:04x}, Q-bit: {q_bit}")
+            self.barometric_altitudes += 1
+            return self._finalize_result(ADSBAltitudeResult(altitude_baro_ft=altitude))
             
-            if q_bit == 1:
-                # Q-bit = 1: Direct 25-ft LSB encoding
-                self.q_bit_one_count += 1
-                
-                # Remove Q-bit and decode
-                altitude_code = ((altitude_field & 0x1FE0) >> 1) | (altitude_field & 0x000F)
-                altitude_ft = altitude_code * 25 - 1000
-                
-                if config.LOG_ALTITUDE_DECODING:
-                    logger.debug(f"[ALT] Q-bit=1 decoding: code={altitude_code}, alt={altitude_ft} ft")
-                
-            else:
-                # Q-bit = 0: Gillham (Gray) code encoding
-                self.q_bit_zero_count += 1
-                
-                altitude_ft = self._decode_gillham_altitude(altitude_field)
-                if altitude_ft is None:
-                    return None
-                
-                if config.LOG_ALTITUDE_DECODING:
-                    logger.debug(f"[ALT] Q-bit=0 (Gillham) decoding: alt={altitude_ft} ft")
+        except Exception as e:
+            self.decode_errors += 1
+            logger.error("[ALT] Altitude decoding error: %s", e)
+            return None
+    
+    def _decode_altitude_geometric(self, raw_msg: str, type_code: int) -> Optional[ADSBAltitudeResult]:
+        """decode_altitude specialized for geometric-only (TC 31) decoding."""
+        try:
+            if type_code != 31:
+                return None
             
-            # Apply offset correction if needed (bits 6-8 of result == 5)
-            if altitude_ft is not None:
-                altitude_bits_check = (altitude_ft + 1000) // 25
-                if (altitude_bits_check >> 6) & 0x07 == 5:
-                    altitude_ft += 1000
-                    
-                    if config.LOG_ALTITUDE_DECODING:
-                        logger.debug(f"[ALT] Applied 1000 ft offset correction: {altitude_ft} ft")
+            altitude = self._decode_geometric_altitude(raw_msg)
+            if altitude is None:
+                return None
             
-            return altitude_ft
+            self.geometric_altitudes += 1
+            return self._finalize_result(ADSBAltitudeResult(altitude_geo_ft=altitude))
             
         except Exception as e:
-            logger.error(f"[ALT] Barometric altitude decoding error: {e}")
+            self.decode_errors += 1
+            logger.error("[ALT] Altitude decoding error: %s", e)
             return None
     
-    def _decode_geometric_altitude(self, raw_msg: str) -> Optional[int]:
+    def _finalize_result(self, altitude_data: ADSBAltitudeResult) -> Optional[ADSBAltitudeResult]:
+        """Apply sanity checks, count and timestamp a decoded result."""
+        if self.enable_sanity_checks and not self._validate_altitude_data(altitude_data):
+            self.sanity_check_failures += 1
+            return None
+        
+        self.altitudes_decoded += 1
+        altitude_data.altitude_decoded_at_ns = int(time.time() * 1e9)
+        
+        if self.log_decoding:
+            logger.debug("[ALT] Successfully decoded: %s", altitude_data)
+        
+        return altitude_data
+    
+    def decode_altitudes_batch(self, raw_msgs, type_codes, parallel: bool = False):
         """
-        Decode geometric altitude from Type Code 31 message.
+        Decode altitudes for a batch of messages in one vectorized pass.
         
         Args:
-            raw_msg: Hex string of the ADS-B message
+            raw_msgs: (N, 14) uint8 array of message bytes, e.g. from hex_to_message_array()
+            type_codes: (N,) array of ADS-B type codes
+            parallel: Use the Numba prange kernel when Numba is available
             
         Returns:
-            Geometric altitude in feet, or None if decoding failed
+            (N, 2) int32 array of [barometric, geometric] altitudes in feet;
+            entries not decoded or failing sanity checks hold ALTITUDE_INVALID
         """
-        try:
-            # Convert hex string to bytes
-            msg_bytes = bytes.fromhex(raw_msg)
-            if len(msg_bytes) < 14:
-                return None
-            
-            # For TC=31, geometric altitude is in different position
-            # Extract from the appropriate message fields
-            # This is a simplified implementation - actual position depends on message subtype
-            
-            # Extract altitude field (assuming similar position to barometric)
-            altitude_bits = (msg_bytes[2] << 16) | (msg_bytes[3] << 8) | msg_bytes[4]
-            
-            # Geometric altitude typically uses 12-bit field with 6.25 ft resolution
-            geo_altitude_code = (altitude_bits >> 5) & 0x0FFF
-            
-            # Convert to feet (assuming 6.25 ft resolution)
-            geo_altitude_ft = geo_altitude_code * 6.25 - 1000
+        if np is None:
+            raise ImportError("NumPy is required for batch altitude decoding")
+        
+        msgs = np.ascontiguousarray(raw_msgs, dtype=np.uint8)
+        tcs = np.ascontiguousarray(type_codes, dtype=np.int64)
+        if msgs.ndim != 2 or msgs.shape[1] < 14 or tcs.shape != (msgs.shape[0],):
+            raise ValueError(f"Expected (N, 14) messages and (N,) type codes, got {msgs.shape} and {tcs.shape}")
+        
+        baro_mask = (tcs >= 9) & (tcs <= 18)
+        geo_mask = tcs == 31
+        
+        if parallel and _decode_batch_parallel is not None:
+            baro = np.full(len(tcs), ALTITUDE_INVALID, dtype=np.int64)
+            geo = np.full(len(tcs), ALTITUDE_INVALID, dtype=np.int64)
+            _decode_batch_parallel(msgs, tcs, baro, geo)
+        else:
+            altitude_bits = (msgs[:, 2].astype(np.int64) << 16) | (msgs[:, 3].astype(np.int64) << 8) | msgs[:, 4]
+            altitude_field = (altitude_bits >> 4) & 0x1FFF
             
-            if config.LOG_ALTITUDE_DECODING:
-                logger.debug(f"[ALT] Geometric altitude: code={geo_altitude_code}, alt={geo_altitude_ft} ft")
+            # Q-bit = 1: direct 25-ft LSB; Q-bit = 0: Gillham code in 100-ft steps
+            direct = ((altitude_field & 0x1FE0) >> 1) | (altitude_field & 0x000F)
+            gillham = _gray_to_binary_np(altitude_field) << 2
+            altitude_code = np.where(altitude_field & 0x01, direct, gillham)
+            baro = altitude_code * 25 - 1000
+            baro += np.where((altitude_code >> 6) & 0x07 == 5, 1000, 0)
             
-            return int(geo_altitude_ft)
+            geo = ((altitude_bits >> 5) & 0x0FFF) * 25 - 4000
+            geo = (geo + np.where(geo < 0, 3, 0)) >> 2
+        
+        baro_ok = baro_mask.copy()
+        geo_ok = geo_mask.copy()
+        if self.enable_sanity_checks:
+            baro_ok &= (baro >= self.min_valid_altitude) & (baro <= self.max_valid_altitude)
+            geo_ok &= (geo >= self.min_valid_altitude) & (geo <= self.max_valid_altitude)
+        
+        result = np.full((len(tcs), 2), ALTITUDE_INVALID, dtype=np.int32)
+        result[baro_ok, 0] = baro[baro_ok]
+        result[geo_ok, 1] = geo[geo_ok]
+        
+        # Keep statistics consistent with the scalar decode path
+        q_bits = (msgs[baro_mask, 4] >> 4) & 0x01
+        baro_count = int(baro_mask.sum())
+        q_one = int(q_bits.sum())
+        decoded = int(baro_ok.sum()) + int(geo_ok.sum())
+        self.barometric_altitudes += baro_count
+        self.geometric_altitudes += int(geo_mask.sum())
+        self.q_bit_one_count += q_one
+        self.q_bit_zero_count += baro_count - q_one
+        self.gillham_conversions += baro_count - q_one
+        self.altitudes_decoded += decoded
+        self.sanity_check_failures += baro_count + int(geo_mask.sum()) - decoded
+        
+        if self.log_decoding and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[ALT] Batch decoded %d altitudes from %d messages", decoded, len(tcs))
+        
+        return result
+    
+    def _extract_altitude_bytes(self, raw_msg: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Extract the three message bytes that carry the altitude field.
+        
+        This is the only step of the decode path that can fail on bad input;
+        everything downstream is pure integer math.
+        
+        Args:
+            raw_msg: Hex string of the ADS-B message
             
-        except Exception as e:
-            logger.error(f"[ALT] Geometric altitude decoding error: {e}")
+        Returns:
+            Tuple of message bytes 2-4, or None for short or malformed messages
+        """
+        # Reject short messages before paying for the hex conversion
+        try:
+            if len(raw_msg) < 28:
+                return None
+            msg_bytes = bytes.fromhex(raw_msg)
+        except (ValueError, TypeError) as e:
+            logger.error("[ALT] Invalid altitude message: %s", e)
             return None
+        
+        if len(msg_bytes) < 14:
+            return None
+        
+        return msg_bytes[2], msg_bytes[3], msg_bytes[4]
     
-    def _decode_gillham_altitude(self, altitude_field: int) -> Optional[int]:
+    def _decode_barometric_altitude(self, raw_msg: str) -> Optional[int]:
         """
-        Decode altitude using Gillham (Gray) code conversion.
+        Decode barometric altitude from ADS-B message.
         
         Args:
-            altitude_field: 13-bit altitude field from ADS-B message
+            raw_msg: Hex string of the ADS-B message
             
         Returns:
             Altitude in feet, or None if decoding failed
         """
-        try:
+        altitude_bytes = self._extract_altitude_bytes(raw_msg)
+        if altitude_bytes is None:
+            return None
+        
+        # Altitude field is bits 20-32 of the message (bytes 2-4); the
+        # Q-bit is bit 4 of the field, i.e. bit 4 of byte 4
+        b2, b3, b4 = altitude_bytes
+        q_bit = (b4 >> 4) & 0x01
+        
+        if q_bit == 1:
+            self.q_bit_one_count += 1
+        else:
+            self.q_bit_zero_count += 1
             self.gillham_conversions += 1
-            
-            # Convert Gillham code to binary
-            # The altitude field contains multiple Gray-coded segments
-            
-            # Extract the different bit groups
-            # This is a simplified Gillham conversion - real implementation is more complex
-            
-            # For now, implement a basic Gray to binary conversion
-            binary_altitude = self._convert_gray_to_binary(altitude_field)
-            
-            if binary_altitude is None:
-                return None
-            
-            # Convert to altitude in feet
-            # Gillham code represents altitude in 100-foot increments
-            altitude_ft = binary_altitude * 100 - 1000
-            
-            if config.LOG_ALTITUDE_DECODING:
-                logger.debug(f"[ALT] Gillham conversion: field=0x{altitude_field:04x}, binary={binary_altitude}, alt={altitude_ft} ft")
-            
-            return altitude_ft
-            
-        except Exception as e:
-            logger.error(f"[ALT] Gillham decoding error: {e}")
+        
+        altitude_ft = _decode_baro_bits(b2, b3, b4)
+        if altitude_ft == ALTITUDE_INVALID:
             return None
+        
+        if self.log_decoding:
+            altitude_field = (int.from_bytes(altitude_bytes, 'big') >> 4) & 0x1FFF
+            logger.debug("[ALT] Altitude field: 0x%04x, Q-bit: %d, alt=%d ft", altitude_field, q_bit, altitude_ft)
+        
+        return altitude_ft
     
-    def _convert_gray_to_binary(self, gray_code: int) -> Optional[int]:
+    def _decode_geometric_altitude(self, raw_msg: str) -> Optional[int]:
         """
-        Convert Gray code to binary.
+        Decode geometric altitude from Type Code 31 message.
         
         Args:
-            gray_code: Gray code value
+            raw_msg: Hex string of the ADS-B message
             
         Returns:
-            Binary equivalent, or None if conversion failed
+            Geometric altitude in feet, or None if decoding failed
         """
-        try:
-            # Standard Gray to binary conversion algorithm
-            binary = 0
-            mask = gray_code >> 1
-            
-            while mask:
-                gray_code ^= mask
-                mask >>= 1
+        altitude_bytes = self._extract_altitude_bytes(raw_msg)
+        if altitude_bytes is None:
+            return None
+        
+        # For TC=31, geometric altitude is in different position
+        # This is a simplified implementation - actual position depends on message subtype;
+        # the 12-bit field is assumed to sit next to the barometric one (bytes 2-4)
+        geo_altitude_ft = _decode_geo_bits(*altitude_bytes)
+        
+        if self.log_decoding:
+            logger.debug("[ALT] Geometric altitude: %d ft", geo_altitude_ft)
+        
+        return geo_altitude_ft
+    
+    def _decode_gillham_altitude(self, altitude_field: int) -> int:
+        """
+        Decode altitude using Gillham (Gray) code conversion.
+        
+        Pure integer helper with no failure path, like the kernels it mirrors.
+        
+        Args:
+            altitude_field: 13-bit altitude field from ADS-B message
             
-            return gray_code
+        Returns:
+            Altitude in feet
+        """
+        self.gillham_conversions += 1
+        
+        # This is a simplified Gillham conversion - real implementation is more complex;
+        # the whole field is treated as one Gray-coded value in 100-foot increments
+        binary_altitude = self._convert_gray_to_binary(altitude_field)
+        altitude_ft = binary_altitude * 100 - 1000
+        
+        if self.log_decoding:
+            logger.debug("[ALT] Gillham conversion: field=0x%04x, binary=%d, alt=%d ft", altitude_field, binary_altitude, altitude_ft)
+        
+        return altitude_ft
+    
+    def _convert_gray_to_binary(self, gray_code: int) -> int:
+        """
+        Convert Gray code to binary.
+        
+        Args:
+            gray_code: Gray code value (up to 16 bits)
             
-        except Exception as e:
-            logger.error(f"[ALT] Gray to binary conversion error: {e}")
-            return None
+        Returns:
+            Binary equivalent
+        """
+        return _gray_to_binary(gray_code)
     
-    def _validate_altitude_data(self, altitude_data: Dict[str, Any]) -> bool:
+    def _validate_altitude_data(self, altitude_data: Mapping) -> bool:
         """
         Validate altitude data against sanity checks.
         
         Args:
-            altitude_data: Dictionary containing altitude values
+            altitude_data: ADSBAltitudeResult or dictionary containing altitude values
             
         Returns:
             True if altitude data is valid, False otherwise
         """
-        try:
-            # Check barometric altitude
-            if 'altitude_baro_ft' in altitude_data:
-                baro_alt = altitude_data['altitude_baro_ft']
-                if not self._is_altitude_valid(baro_alt):
-                    if config.LOG_ALTITUDE_DECODING:
-                        logger.warning(f"[ALT] Invalid barometric altitude: {baro_alt} ft")
-                    return False
-            
-            # Check geometric altitude
-            if 'altitude_geo_ft' in altitude_data:
-                geo_alt = altitude_data['altitude_geo_ft']
-                if not self._is_altitude_valid(geo_alt):
-                    if config.LOG_ALTITUDE_DECODING:
-                        logger.warning(f"[ALT] Invalid geometric altitude: {geo_alt} ft")
-                    return False
-            
-            # Check altitude consistency if both present
-            if 'altitude_baro_ft' in altitude_data and 'altitude_geo_ft' in altitude_data:
-                baro_alt = altitude_data['altitude_baro_ft']
-                geo_alt = altitude_data['altitude_geo_ft']
-                
-                # Geometric altitude should be higher than barometric (due to geoid separation)
-                # But allow reasonable tolerance
-                altitude_diff = abs(geo_alt - baro_alt)
-                if altitude_diff > 1000:  # More than 1000 ft difference is suspicious
-                    if config.LOG_ALTITUDE_DECODING:
-                        logger.warning(f"[ALT] Large altitude difference: baro={baro_alt}, geo={geo_alt}")
-                    # Don't reject, just log warning
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"[ALT] Altitude validation error: {e}")
+        baro_alt = altitude_data.get('altitude_baro_ft')
+        geo_alt = altitude_data.get('altitude_geo_ft')
+        
+        # Check barometric altitude
+        if baro_alt is not None and not self._is_altitude_valid(baro_alt):
+            if self.log_decoding:
+                logger.warning("[ALT] Invalid barometric altitude: %s ft", baro_alt)
+            return False
+        
+        # Check geometric altitude
+        if geo_alt is not None and not self._is_altitude_valid(geo_alt):
+            if self.log_decoding:
+                logger.warning("[ALT] Invalid geometric altitude: %s ft", geo_alt)
             return False
+        
+        # Check altitude consistency if both present; geometric altitude differs from
+        # barometric (geoid separation), but more than 1000 ft is suspicious - log, don't reject
+        if baro_alt is not None and geo_alt is not None and abs(geo_alt - baro_alt) > 1000:
+            if self.log_decoding:
+                logger.warning("[ALT] Large altitude difference: baro=%s, geo=%s", baro_alt, geo_alt)
+        
+        return True
+    
+    @staticmethod
+    def ns_to_datetime(timestamp_ns: int) -> datetime:
+        """Convert an altitude_decoded_at_ns timestamp to a UTC datetime."""
+        return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc)
+    
+    def set_logging(self, enabled: bool):
+        """Enable or disable detailed altitude decoding logs at runtime."""
+        self.log_decoding = enabled
     
     def _is_altitude_valid(self, altitude: int) -> bool:
         """
@@ -371,16 +675,19 @@ class ADSBAltitudeDecoder:
             }
         }
     
+    def get_stats_array(self) -> array.array:
+        """
+        Get the raw decoder counters as a flat int64 array.
+        
+        Counters are ordered as in STAT_COUNTERS; the array supports the
+        buffer protocol, so it can be wrapped with np.frombuffer.
+        """
+        return array.array('q', [getattr(self, name) for name in self.STAT_COUNTERS])
+    
     def reset_stats(self):
         """Reset decoder statistics."""
-        self.altitudes_decoded = 0
-        self.barometric_altitudes = 0
-        self.geometric_altitudes = 0
-        self.q_bit_zero_count = 0
-        self.q_bit_one_count = 0
-        self.gillham_conversions = 0
-        self.sanity_check_failures = 0
-        self.decode_errors = 0
+        for name in self.STAT_COUNTERS:
+            setattr(self, name, 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled ADS-B payload classifier
+
+Optional C extension mirroring the pure-Python classifier in adsb_parser.
+Build in place with:
+
+    python setup.py build_ext --inplace
+
+adsb_parser picks this up automatically when the extension is importable.
+"""
+
+from cpython.unicode cimport PyUnicode_DecodeASCII
+
+cdef const char* HEX_DIGITS = b"0123456789ABCDEF"
+
+
+cdef inline str _icao_hex(const unsigned char[::1] buf):
+    cdef char out[6]
+    cdef Py_ssize_t i
+    for i in range(3):
+        out[2 * i] = HEX_DIGITS[buf[i + 1] >> 4]
+        out[2 * i + 1] = HEX_DIGITS[buf[i + 1] & 0x0F]
+    return PyUnicode_DecodeASCII(out, 6, NULL)
+
+
+cpdef tuple classify(const unsigned char[::1] buf):
+    """Return (downlink format, type code, ICAO or None) for a Mode S payload."""
+    cdef int df
+
+    if buf.shape[0] == 0:
+        raise IndexError("empty Mode S payload")
+
+    df = buf[0] >> 3
+    if df > 24:
+        df = 24
+
+    if df == 17 or df == 18 or df == 11:
+        if buf.shape[0] < 5:
+            raise IndexError("Mode S payload too short")
+        if df == 11:
+            return df, 0, _icao_hex(buf)
+        return df, buf[4] >> 3, _icao_hex(buf)
+
+    return df, 0, None
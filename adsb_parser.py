@@ -3,9 +3,14 @@ ADS-B Message Parser for Aviation Data
 Enhanced with GDL-90 deframing and NovAtel PASSCOM support
 """
 
+import sys
+import threading
 import time
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional, Any, List
+from typing import Callable, Dict, Optional, Any, Iterable, List, Tuple
 from pyModeS.decoder import adsb
 import config
 from gdl90_deframer import GDL90Deframer
@@ -13,72 +18,575 @@ from novatel_passcom_parser import NovAtelPasscomParser
 from adsb_altitude_decoder import ADSBAltitudeDecoder
 from logger import logger
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; parse_messages falls back to per-byte classification
+    np = None
+
+try:
+    import adsb_fastpath
+except ImportError:
+    # Compiled classifier is optional; build with: python setup.py build_ext --inplace
+    adsb_fastpath = None
+
+__all__ = ['ADSBParser', 'AviationRecord']
+
+
+# Errors pyModeS raises on malformed or unexpected messages
+_DECODE_ERRORS = (ValueError, TypeError, IndexError, RuntimeError)
+
+
+# ADS-B identification character set indexed by 6-bit code; unassigned codes
+# ('#' in the spec table) decode to nothing and code 32 is a space
+_CALLSIGN_CHARS = tuple(
+    '' if c == '#' else c for c in
+    "#ABCDEFGHIJKLMNOPQRSTUVWXYZ##### ###############0123456789######"
+)
+_CALLSIGN_SHIFTS = (42, 36, 30, 24, 18, 12, 6, 0)
+
+
+def _decode_callsign(raw_msg: str) -> str:
+    """
+    Decode the callsign of an identification message (TC 1-4)
+    
+    Args:
+        raw_msg: 28-character hex message
+        
+    Returns:
+        Callsign with padding spaces stripped
+    """
+    bits = int(raw_msg[10:22], 16)  # 8 x 6-bit characters following TC and category
+    chars = _CALLSIGN_CHARS
+    return ''.join([chars[(bits >> shift) & 0x3F] for shift in _CALLSIGN_SHIFTS]).strip()
+
+
+def _classify_payload(buf: bytes) -> Tuple[int, int, Optional[str]]:
+    """
+    Classify a Mode S payload using integer ops on the raw bytes
+    
+    Args:
+        buf: Mode S payload bytes
+        
+    Returns:
+        Tuple of (downlink format, type code, ICAO). The type code is 0
+        unless the message is a DF 17/18 extended squitter; the ICAO is
+        None where it is not carried in the clear (DF 11/17/18 only).
+    """
+    df = buf[0] >> 3
+    if df > 24:
+        df = 24  # DF 24..31 all denote Comm-D (ELM)
+    if df == 17 or df == 18:
+        return df, buf[4] >> 3, buf[1:4].hex().upper()
+    if df == 11:
+        return df, 0, buf[1:4].hex().upper()
+    return df, 0, None
+
+
+if adsb_fastpath is not None:
+    _classify_payload = adsb_fastpath.classify
+
+
+class AviationRecord(MutableMapping):
+    """
+    Accumulated state of one aircraft in ADSBParser.aircraft_data.
+    
+    Fixed slots for the fields the parser produces instead of one long-lived
+    dict per aircraft; unexpected keys go to an overflow dict. It behaves as
+    a mutable mapping of the fields that are set, so callers can keep using
+    ``record['callsign']``, ``'latitude' in record`` and ``dict(record)``.
+    """
+    
+    FIELDS = (
+        'icao', 'type_code', 'parsed_timestamp', 'callsign', 'category',
+        'latitude', 'longitude', 'altitude_baro_ft', 'altitude_geo_ft',
+        'altitude_decoded_at_ns', 'altitude_legacy_ft',
+        'speed_knots', 'heading', 'vertical_rate',
+    )
+    __slots__ = FIELDS + ('_extra',)
+    
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self._extra = None
+        if data:
+            self.update(data)
+    
+    def __getitem__(self, key: str):
+        if key in _RECORD_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+    
+    def __setitem__(self, key: str, value):
+        if key in _RECORD_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __delitem__(self, key: str):
+        if key in _RECORD_FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+    
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def update(self, data: Dict[str, Any]):
+        """Merge freshly parsed fields (overrides MutableMapping.update for speed)"""
+        for key, value in data.items():
+            if key in _RECORD_FIELDS:
+                setattr(self, key, value)
+            else:
+                self[key] = value
+    
+    def copy(self) -> Dict[str, Any]:
+        """Return the fields that are set as a plain dict."""
+        return {key: self[key] for key in self}
+    
+    as_dict = copy
+    
+    def __repr__(self) -> str:
+        return f"AviationRecord({self.copy()})"
+
+
+_RECORD_FIELDS = frozenset(AviationRecord.FIELDS)
+
+
+def _stat_counter(key: str) -> property:
+    """Attribute view onto one live counter in ADSBParser._stats"""
+    def fget(self):
+        return self._stats[key]
+    
+    def fset(self, value):
+        self._stats[key] = value
+    
+    return property(fget, fset, doc=f"Live '{key}' counter")
+
 
 class ADSBParser:
     """Parser for ADS-B aviation messages"""
     
+    # Counter attributes kept for callers; hot paths increment self._stats directly
+    messages_parsed = _stat_counter('messages_parsed')
+    parse_error_count = _stat_counter('parse_errors')
+    gdl90_messages_processed = _stat_counter('gdl90_messages_processed')
+    raw_messages_processed = _stat_counter('raw_messages_processed')
+    passcom_messages_processed = _stat_counter('passcom_messages_processed')
+    
+    # Max age difference (seconds) between an even and odd CPR frame for a global decode
+    CPR_PAIR_WINDOW = 10.0
+    
     def __init__(self):
         """Initialize ADS-B parser"""
-        self.parse_error_count = 0
-        self.messages_parsed = 0
-        self.last_valid_data = {}
-        self.aircraft_data = {}  # Store data by ICAO address
+        # Live counters in get_stats order; the counter attributes are views onto it
+        self._stats = {
+            'messages_parsed': 0,
+            'parse_errors': 0,
+            'success_rate': 0.0,
+            'aircraft_tracked': 0,
+            'gdl90_messages_processed': 0,
+            'raw_messages_processed': 0,
+            'passcom_messages_processed': 0,
+        }
+        self.last_valid_data = {}  # Aliases the most recently updated aircraft_data entry
+        self.aircraft_data = OrderedDict()  # AviationRecord by ICAO address, least recently seen first
+        self.max_tracked_aircraft = getattr(config, 'MAX_TRACKED_AIRCRAFT', 4096)
         self.gdl90_deframer = GDL90Deframer()
-        self.gdl90_messages_processed = 0
-        self.raw_messages_processed = 0
+        self._batch_ts = None  # Shared parsed_timestamp for the message/batch in flight
+        self.log_parse_attempts = config.LOG_PARSE_ATTEMPTS  # Resolved once; checked on every message
         
         # Initialize new components
         if config.ENABLE_PASSCOM_PARSER:
             self.passcom_parser = NovAtelPasscomParser()
-            self.passcom_messages_processed = 0
         else:
             self.passcom_parser = None
-            self.passcom_messages_processed = 0
             
         self.altitude_decoder = ADSBAltitudeDecoder()
         
-    def parse_message(self, message: bytes) -> Optional[Dict[str, Any]]:
+        # Per-message config, resolved once. Accepted downlink formats become a
+        # bitmask: one AND per message instead of a getattr and a list scan
+        accepted_dfs = frozenset(getattr(config, 'ACCEPTED_DOWNLINK_FORMATS', (17, 18, 19)))
+        self._df_mask = sum(1 << df for df in accepted_dfs)
+        self.log_altitude_decoding = getattr(config, 'LOG_ALTITUDE_DECODING', False)
+        self.altitude_compare_interval = max(1, getattr(config, 'ALTITUDE_COMPARISON_SAMPLE_INTERVAL', 1000))
+        self._alt_log_tick = 0
+        
+        # Reference for locally unambiguous CPR decoding; None skips it entirely
+        self._ref_lat = getattr(config, 'ADSB_REFERENCE_LAT', None)
+        self._ref_lon = getattr(config, 'ADSB_REFERENCE_LON', None)
+        if self._ref_lat is None or self._ref_lon is None:
+            self._ref_lat = self._ref_lon = None
+        
+        # Latest even/odd position frame per (ICAO, surface): [even_msg, even_t, odd_msg, odd_t],
+        # timed by when each message was received
+        self._cpr_frames = OrderedDict()
+        self._rx_time = 0.0  # Receive time (epoch seconds) of the message in flight
+        self._pair_cpr = True  # parse_batch workers leave pairing to the parent process
+        
+        # Type code -> extractor specialized for that message type; None = not decoded
+        self._extractors = [None] * 32
+        for tc in range(1, 5):
+            self._extractors[tc] = self._extract_ident
+        for tc in range(5, 9):
+            self._extractors[tc] = self._extract_surface_position
+        for tc in range(9, 19):
+            self._extractors[tc] = self._extract_airborne_position
+        self._extractors[19] = self._extract_velocity
+        if getattr(config, 'ENABLE_GEOMETRIC_ALTITUDE', True):
+            self._extractors[31] = self._extract_geom_alt
+        
+        # Producer/consumer feed: the receive thread enqueues, a parser thread drains in batches
+        self._feed_queue = deque(maxlen=getattr(config, 'FEED_QUEUE_SIZE', 8192))
+        self._feed_ready = threading.Event()
+        self._feed_running = False
+        self._data_lock = threading.RLock()  # Parser state is shared by parse_message and the feed thread
+        self.feed_thread: Optional[threading.Thread] = None
+        self.feed_batch_size = getattr(config, 'FEED_BATCH_SIZE', 64)
+        self.feed_flush_interval = getattr(config, 'FEED_FLUSH_INTERVAL', 0.05)
+        self.feed_messages_dropped = 0
+        self._feed_callback = None
+        
+    def parse_message(self, message: bytes, received_at: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Parse a single ADS-B message (with GDL-90 deframing support)
         
         Args:
             message: Raw message bytes (could be GDL-90 wrapped or raw Mode S)
+            received_at: Receive time in epoch seconds, used to pair even/odd
+                position frames (e.g. the logged time when replaying); now if None
             
         Returns:
             Dict with parsed aviation data or None if parsing failed
         """
+        with self._data_lock:
+            return self._parse_message(message, received_at)
+    
+    def _parse_message(self, message: bytes, received_at: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Parse a single ADS-B message with the data lock held (see parse_message)"""
         try:
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.info(f"[ADSB] Attempting to parse: {message.hex()}")
+            if self.log_parse_attempts:
+                logger.info("[ADSB] Attempting to parse: %s", message.hex())
             
             # Skip empty messages
             if not message:
-                if config.LOG_PARSE_ATTEMPTS:
-                    logger.error(f"[ADSB] Skipping empty message")
+                if self.log_parse_attempts:
+                    logger.error("[ADSB] Skipping empty message")
                 return None
             
-            # Preprocess message to handle GDL-90 wrapping
-            processed_messages = self._preprocess_message(message)
-            
-            if not processed_messages:
-                if config.LOG_PARSE_ATTEMPTS:
-                    logger.error(f"[ADSB] No valid messages after preprocessing")
-                return None
+            # One timestamp for every payload extracted from this message
+            self._batch_ts = datetime.now(timezone.utc)
+            self._rx_time = time.time() if received_at is None else received_at
             
-            # Process each extracted message
-            for adsb_payload in processed_messages:
+            # Preprocess message to handle GDL-90 wrapping; payloads are consumed
+            # as they come, so a lazy source stops at the first successful parse
+            processed_any = False
+            for adsb_payload in self._preprocess_message(message):
+                processed_any = True
                 result = self._parse_adsb_payload(adsb_payload)
                 if result:
                     return result  # Return first successful parse
             
+            if not processed_any and self.log_parse_attempts:
+                logger.error("[ADSB] No valid messages after preprocessing")
             return None
             
         except Exception as e:
-            self.parse_error_count += 1
-            logger.error(f"[ADSB] Parse error: {e}")
+            self._stats['parse_errors'] += 1
+            logger.error("[ADSB] Parse error: %s", e)
             return None
     
-    def _preprocess_message(self, raw_message: bytes) -> List[bytes]:
+    def parse_messages(self, batch: List[bytes],
+                       timestamps: Optional[List[float]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a batch of raw Mode S payloads in one pass
+        
+        DF and type code are read directly from the payload bytes (vectorized
+        with NumPy when available) so only accepted messages reach pyModeS.
+        Survivors are grouped by type code range and decoded group by group;
+        aircraft data is then merged in input order.
+        
+        Args:
+            batch: List of deframed Mode S payloads
+            timestamps: Receive times (epoch seconds) aligned with the batch, used
+                to pair even/odd position frames; all now if None
+            
+        Returns:
+            List of parsed aviation data dicts (None where parsing failed),
+            aligned with the input batch
+        """
+        with self._data_lock:
+            results = self._decode_batch(batch, timestamps=timestamps)
+            
+            for aviation_data in results:
+                if aviation_data:
+                    self._store_aviation_data(aviation_data['icao'], aviation_data)
+        
+        return results
+    
+    def parse_batch(self, batch: List[bytes], executor: Optional[Executor] = None, chunk_size: int = 1024,
+                    timestamps: Optional[List[float]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a large batch (e.g. a pcap or log replay) across worker processes
+        
+        The batch is split into chunks decoded in parallel by worker-local
+        parsers; results come back in input order and are merged into
+        aircraft_data serially on the calling thread, together with the
+        workers' message and altitude decoder counters. Even/odd position
+        frames are paired on the calling thread too, in input order, so the
+        result does not depend on how the batch was chunked. Workers read
+        config as inherited by the process start method.
+        
+        Args:
+            batch: List of deframed Mode S payloads
+            executor: Process pool to reuse; a temporary one is created if None
+            chunk_size: Payloads per worker task
+            timestamps: Receive times (epoch seconds) aligned with the batch, used
+                to pair even/odd position frames; all now if None
+            
+        Returns:
+            List of parsed aviation data dicts (None where parsing failed),
+            aligned with the input batch
+        """
+        if len(batch) <= chunk_size:
+            return self.parse_messages(batch, timestamps)
+        
+        chunks = [batch[i:i + chunk_size] for i in range(0, len(batch), chunk_size)]
+        if executor is None:
+            with ProcessPoolExecutor() as pool:
+                decoded = list(pool.map(_decode_batch_worker, chunks))
+        else:
+            decoded = list(executor.map(_decode_batch_worker, chunks))
+        
+        decoder = self.altitude_decoder
+        results = []
+        with self._data_lock:
+            for chunk_results, raw_count, parsed_count, altitude_counters in decoded:
+                results.extend(chunk_results)
+                self._stats['raw_messages_processed'] += raw_count
+                self._stats['messages_parsed'] += parsed_count
+                for name, value in zip(decoder.STAT_COUNTERS, altitude_counters):
+                    setattr(decoder, name, getattr(decoder, name) + value)
+            
+            self._pair_batch_positions(batch, results, timestamps)
+            
+            for aviation_data in results:
+                if aviation_data:
+                    self._store_aviation_data(aviation_data['icao'], aviation_data)
+        
+        return results
+    
+    def _decode_batch(self, batch: List[bytes], count_raw: bool = True,
+                      timestamps: Optional[List[float]] = None) -> List[Optional[Dict[str, Any]]]:
+        """Decode a batch without touching aircraft_data (see parse_messages)"""
+        results = [None] * len(batch)
+        self._batch_ts = datetime.now(timezone.utc)
+        self._rx_time = time.time()
+        df_mask = self._df_mask
+        extractors = self._extractors
+        stats = self._stats
+        dfs, tcs = self._classify_batch(batch)
+        groups = {}
+        
+        for index, payload in enumerate(batch):
+            if not payload:
+                continue
+            
+            if count_raw:
+                stats['raw_messages_processed'] += 1
+            if not (1 << dfs[index]) & df_mask:
+                continue
+            
+            stats['messages_parsed'] += 1
+            extractor = extractors[tcs[index]]
+            if extractor is not None:
+                groups.setdefault(extractor, []).append(index)
+        
+        for indices in groups.values():
+            for index in indices:
+                payload = batch[index]
+                if timestamps is not None:
+                    self._rx_time = timestamps[index]
+                results[index] = self._extract_aviation_data(
+                    payload.hex(), payload[1:4].hex().upper(), tcs[index])
+        
+        return results
+    
+    def _pair_batch_positions(self, batch: List[bytes], results: List[Optional[Dict[str, Any]]],
+                              timestamps: Optional[List[float]]):
+        """
+        Pair the position frames of a parse_batch run, in input order
+        
+        Args:
+            batch: List of deframed Mode S payloads
+            results: Worker results aligned with the batch; updated in place
+            timestamps: Receive times aligned with the batch, or None for now
+        """
+        self._batch_ts = datetime.now(timezone.utc)
+        self._rx_time = time.time()
+        df_mask = self._df_mask
+        dfs, tcs = self._classify_batch(batch)
+        
+        for index, payload in enumerate(batch):
+            tc = tcs[index]
+            if not 5 <= tc <= 18 or not (1 << dfs[index]) & df_mask:
+                continue
+            
+            if timestamps is not None:
+                self._rx_time = timestamps[index]
+            icao = payload[1:4].hex().upper()
+            position = self._decode_cpr_pair(payload.hex(), icao, tc)
+            if position and position[0] and position[1]:
+                data = results[index]
+                if data is None:
+                    # A surface frame decodes to nothing until it is paired
+                    data = results[index] = {'icao': sys.intern(icao), 'type_code': tc,
+                                             'parsed_timestamp': self._batch_ts}
+                data['latitude'], data['longitude'] = position
+    
+    @staticmethod
+    def _classify_batch(batch: List[bytes]):
+        """
+        Extract downlink format and type code for every payload in a batch
+        
+        Args:
+            batch: List of Mode S payloads
+            
+        Returns:
+            Tuple of (dfs, tcs) lists aligned with the batch; the type code is
+            0 for anything that is not a DF 17/18 extended squitter
+        """
+        if np is not None and batch and set(map(len, batch)) == {14}:
+            frames = np.frombuffer(b''.join(batch), dtype=np.uint8).reshape(-1, 14)
+            dfs = np.minimum(frames[:, 0] >> 3, 24)
+            tcs = np.where((dfs == 17) | (dfs == 18), frames[:, 4] >> 3, 0)
+            return dfs.tolist(), tcs.tolist()
+        
+        dfs = [min(payload[0] >> 3, 24) if payload else 0 for payload in batch]
+        tcs = [payload[4] >> 3 if df in (17, 18) and len(payload) > 4 else 0
+               for payload, df in zip(batch, dfs)]
+        return dfs, tcs
+    
+    @property
+    def feed_running(self) -> bool:
+        """Whether the feed thread is draining feed()"""
+        return self._feed_running
+    
+    def start_feed(self, callback: Optional[Callable[[bytes, Dict[str, Any], float], None]] = None):
+        """
+        Start the parser thread that drains feed() in batches
+        
+        Args:
+            callback: Called on the feed thread as callback(raw_message,
+                aviation_data, received_at) for every successful parse
+        """
+        if self.feed_thread and self.feed_thread.is_alive():
+            return
+        
+        self._feed_callback = callback
+        self._feed_running = True
+        self.feed_thread = threading.Thread(target=self._feed_loop, daemon=True)
+        self.feed_thread.start()
+    
+    def stop_feed(self):
+        """Stop the parser thread and parse anything still queued"""
+        self._feed_running = False
+        self._feed_ready.set()
+        
+        if self.feed_thread and self.feed_thread.is_alive():
+            self.feed_thread.join(timeout=1.0)
+        
+        self.flush_feed()
+    
+    def feed(self, raw_bytes: bytes, received_at: Optional[float] = None):
+        """
+        Queue a received message for batched parsing
+        
+        Only appends to a bounded deque, so the receive thread never waits
+        on parsing. When the queue is full the oldest message is dropped.
+        
+        Args:
+            raw_bytes: Raw message bytes, as accepted by parse_message
+            received_at: Receive time in epoch seconds; now if None
+        """
+        queue = self._feed_queue
+        if len(queue) == queue.maxlen:
+            self.feed_messages_dropped += 1
+        
+        queue.append((raw_bytes, time.time() if received_at is None else received_at))
+        if len(queue) >= self.feed_batch_size:
+            self._feed_ready.set()
+    
+    def flush_feed(self) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse everything queued by feed() as one batch
+        
+        Returns:
+            Parsed aviation data for every extracted payload (None where
+            parsing failed)
+        """
+        queue = self._feed_queue
+        sources = []
+        payloads = []
+        timestamps = []
+        
+        with self._data_lock:
+            while queue:
+                raw_message, received_at = queue.popleft()
+                if not raw_message:
+                    continue
+                try:
+                    for payload in self._preprocess_message(raw_message):
+                        sources.append(raw_message)
+                        payloads.append(payload)
+                        timestamps.append(received_at)
+                except Exception as e:
+                    self._stats['parse_errors'] += 1
+                    logger.error("[ADSB] Parse error: %s", e)
+            
+            if not payloads:
+                return []
+            
+            # Raw messages were already counted by _preprocess_message
+            results = self._decode_batch(payloads, count_raw=False, timestamps=timestamps)
+            
+            for aviation_data in results:
+                if aviation_data:
+                    self._store_aviation_data(aviation_data['icao'], aviation_data)
+        
+        callback = self._feed_callback
+        if callback is not None:
+            for raw_message, aviation_data, received_at in zip(sources, results, timestamps):
+                if aviation_data:
+                    callback(raw_message, aviation_data, received_at)
+        
+        return results
+    
+    def _feed_loop(self):
+        """Feed draining loop (runs in separate thread)"""
+        while self._feed_running:
+            self._feed_ready.wait(self.feed_flush_interval)
+            self._feed_ready.clear()
+            self.flush_feed()
+    
+    def _preprocess_message(self, raw_message: bytes) -> Iterable[bytes]:
         """
         Preprocess raw message to extract ADS-B payloads
         
@@ -88,52 +596,57 @@ class ADSBParser:
             raw_message: Raw message bytes
             
         Returns:
-            List of ADS-B payload bytes
+            Iterable of ADS-B payload bytes (callers iterate it once)
         """
         # Check if this looks like NovAtel PASSCOM wrapped data
         if self.passcom_parser and self._is_passcom_wrapped(raw_message):
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.info(f"[ADSB] Detected NovAtel PASSCOM wrapped data")
+            if self.log_parse_attempts:
+                logger.info("[ADSB] Detected NovAtel PASSCOM wrapped data")
             
-            self.passcom_messages_processed += 1
+            self._stats['passcom_messages_processed'] += 1
             
-            # Use PASSCOM parser to extract ADS-B messages
+            # Use PASSCOM parser to extract ADS-B messages; it drains its reassembly
+            # buffer on every packet, so its output is always materialized
             passcom_messages = self.passcom_parser.parse_passcom_frame(raw_message)
             
-            if config.LOG_PARSE_ATTEMPTS and passcom_messages:
-                logger.info(f"[ADSB] Extracted {len(passcom_messages)} ADS-B messages from PASSCOM")
+            if self.log_parse_attempts and passcom_messages:
+                logger.info("[ADSB] Extracted %d ADS-B messages from PASSCOM", len(passcom_messages))
                 for i, msg in enumerate(passcom_messages):
                     if len(msg) > 0:
                         df = (msg[0] >> 3) & 0x1F
-                        logger.info(f"[ADSB] PASSCOM message {i+1}: {msg.hex()} (DF={df})")
+                        logger.info("[ADSB] PASSCOM message %d: %s (DF=%d)", i + 1, msg.hex(), df)
             
             return passcom_messages
         
         # Check if this looks like GDL-90 wrapped data
         elif self._is_gdl90_wrapped(raw_message):
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.info(f"[ADSB] Detected GDL-90 wrapped data")
+            if self.log_parse_attempts:
+                logger.info("[ADSB] Detected GDL-90 wrapped data")
             
-            self.gdl90_messages_processed += 1
+            self._stats['gdl90_messages_processed'] += 1
             
-            # Use GDL-90 deframer to extract ADS-B messages
-            deframed_messages = self.gdl90_deframer.deframe_message(raw_message)
+            # Frames are deframed only as far as the caller reads, so parse_message
+            # stops deframing once a payload parses
+            deframed_messages = self.gdl90_deframer.iter_deframe_message(raw_message)
+            if not self.log_parse_attempts:
+                return deframed_messages
             
-            if config.LOG_PARSE_ATTEMPTS and deframed_messages:
-                logger.info(f"[ADSB] Deframed {len(deframed_messages)} ADS-B messages")
+            deframed_messages = list(deframed_messages)
+            if deframed_messages:
+                logger.info("[ADSB] Deframed %d ADS-B messages", len(deframed_messages))
                 for i, msg in enumerate(deframed_messages):
                     df = (msg[0] >> 3) & 0x1F
-                    logger.info(f"[ADSB] Deframed message {i+1}: {msg.hex()} (DF={df})")
+                    logger.info("[ADSB] Deframed message %d: %s (DF=%d)", i + 1, msg.hex(), df)
             
             return deframed_messages
         else:
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.info(f"[ADSB] Treating as raw Mode S message")
+            if self.log_parse_attempts:
+                logger.info("[ADSB] Treating as raw Mode S message")
             
-            self.raw_messages_processed += 1
+            self._stats['raw_messages_processed'] += 1
             
             # Return as single raw message
-            return [raw_message]
+            return (raw_message,)
     
     def _is_gdl90_wrapped(self, data: bytes) -> bool:
         """
@@ -171,144 +684,258 @@ class ADSBParser:
         Returns:
             Dict with parsed aviation data or None if parsing failed
         """
-        # Convert bytes to hex string for pyModeS
-        if isinstance(adsb_payload, bytes):
-            raw_msg = adsb_payload.hex()
-        else:
-            raw_msg = adsb_payload
-            
-        if config.LOG_PARSE_ATTEMPTS:
-            logger.info(f"[ADSB] Processing ADS-B payload: {raw_msg}")
-            
-        # Get the Downlink Format
-        df = adsb.df(raw_msg)
+        # Classify straight from the bytes; rejected messages never hit pyModeS
+        df, tc, icao = self._quick_classify(adsb_payload)
         
-        if config.LOG_PARSE_ATTEMPTS:
-            logger.info(f"[ADSB] Downlink Format: {df}")
+        if self.log_parse_attempts:
+            logger.info("[ADSB] Processing ADS-B payload: %s", adsb_payload.hex())
+            logger.info("[ADSB] Downlink Format: %d", df)
         
         # Check if it's an accepted ADS-B message
-        accepted_dfs = getattr(config, 'ACCEPTED_DOWNLINK_FORMATS', [17, 18, 19])
-        if df not in accepted_dfs:
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.error(f"[ADSB] Not an accepted ADS-B message (DF={df}), skipping")
+        if not (1 << df) & self._df_mask:
+            if self.log_parse_attempts:
+                logger.error("[ADSB] Not an accepted ADS-B message (DF=%d), skipping", df)
             return None
             
-        self.messages_parsed += 1
+        self._stats['messages_parsed'] += 1
         
-        # Extract basic information
-        icao = adsb.icao(raw_msg)
-        tc = adsb.typecode(raw_msg)
+        # Only materialize the hex string once pyModeS is actually needed
+        raw_msg = adsb_payload.hex()
+        if icao is None:
+            icao = adsb.icao(raw_msg)
         
-        if config.LOG_PARSE_ATTEMPTS:
-            logger.info(f"[ADSB] ICAO: {icao}, Type Code: {tc}")
+        if self.log_parse_attempts:
+            logger.info("[ADSB] ICAO: %s, Type Code: %s", icao, tc)
         
         # Extract data based on message type
         aviation_data = self._extract_aviation_data(raw_msg, icao, tc)
         
         if aviation_data:
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.info(f"[ADSB] Extracted aviation data: {aviation_data}")
-            
-            # Update aircraft-specific data
-            if icao not in self.aircraft_data:
-                self.aircraft_data[icao] = {}
+            if self.log_parse_attempts:
+                logger.info("[ADSB] Extracted aviation data: %s", aviation_data)
             
-            self.aircraft_data[icao].update(aviation_data)
-            self.last_valid_data.update(aviation_data)
+            self._store_aviation_data(icao, aviation_data)
             return aviation_data
         else:
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.info(f"[ADSB] No aviation data extracted from type code: {tc}")
+            if self.log_parse_attempts:
+                logger.info("[ADSB] No aviation data extracted from type code: %s", tc)
             
         return None
     
+    def _parse_adsb_hex(self, hex_message: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a single ADS-B payload given as a hex string
+        
+        Args:
+            hex_message: 28-character hex encoding of the 14-byte payload
+            
+        Returns:
+            Dict with parsed aviation data or None if parsing failed
+        """
+        return self._parse_adsb_payload(bytes.fromhex(hex_message))
+    
+    # Byte-level DF/TC/ICAO classifier (compiled when adsb_fastpath is built)
+    _quick_classify = staticmethod(_classify_payload)
+    
+    def _store_aviation_data(self, icao: str, aviation_data: Dict[str, Any]):
+        """Merge freshly parsed data into the aircraft store (one dict update)"""
+        aircraft = self.aircraft_data.get(icao)
+        if aircraft is None:
+            icao = sys.intern(icao)
+            aircraft = self.aircraft_data[icao] = AviationRecord()
+            if len(self.aircraft_data) > self.max_tracked_aircraft:
+                self.aircraft_data.popitem(last=False)  # Evict the least recently seen aircraft
+        else:
+            self.aircraft_data.move_to_end(icao)
+        
+        aircraft.update(aviation_data)
+        self.last_valid_data = aircraft  # Latest view is the most recently updated aircraft
+    
     def _extract_aviation_data(self, raw_msg: str, icao: str, tc: int) -> Optional[Dict[str, Any]]:
         """Extract aviation data from ADS-B message"""
-        data = {'icao': icao, 'type_code': tc, 'parsed_timestamp': datetime.now(timezone.utc)}
-        
         try:
-            # Aircraft identification (TC 1-4)
-            if 1 <= tc <= 4:
-                data['callsign'] = adsb.callsign(raw_msg).strip()
-                data['category'] = adsb.category(raw_msg)
-            
-            # Surface position (TC 5-8) or Airborne position (TC 9-18)
-            elif 5 <= tc <= 18:
-                # Try to get position if available
-                try:
-                    lat, lon = adsb.position_with_ref(raw_msg, 0, 0, 0, 0)  # Needs reference
-                    if lat and lon:
-                        data['latitude'] = lat
-                        data['longitude'] = lon
-                except:
-                    pass
-                
-                # Get altitude for airborne messages using enhanced decoder
-                if 9 <= tc <= 18:
-                    altitude_data = self.altitude_decoder.decode_altitude(raw_msg, tc)
-                    if altitude_data:
-                        data.update(altitude_data)
-                        
-                        # Also try legacy decoder for comparison if logging enabled
-                        if config.LOG_ALTITUDE_DECODING:
-                            try:
-                                legacy_alt = adsb.altitude(raw_msg)
-                                if legacy_alt:
-                                    data['altitude_legacy_ft'] = legacy_alt
-                                    if 'altitude_baro_ft' in altitude_data:
-                                        diff = abs(altitude_data['altitude_baro_ft'] - legacy_alt)
-                                        if diff > 100:  # More than 100 ft difference
-                                            logger.warning(f"[ADSB] Altitude decoder difference: enhanced={altitude_data['altitude_baro_ft']}, legacy={legacy_alt}, diff={diff} ft")
-                            except:
-                                pass
-            
-            # Airborne velocity (TC 19)
-            elif tc == 19:
-                velocity = adsb.velocity(raw_msg)
-                if velocity:
-                    data['speed_knots'] = velocity[0] if velocity[0] else None
-                    data['heading'] = velocity[1] if velocity[1] else None
-                    data['vertical_rate'] = velocity[2] if velocity[2] else None
-            
-            # Geometric altitude (TC 31)
-            elif tc == 31:
-                if config.ENABLE_GEOMETRIC_ALTITUDE:
-                    altitude_data = self.altitude_decoder.decode_altitude(raw_msg, tc)
-                    if altitude_data:
-                        data.update(altitude_data)
-            
-            return data if len(data) > 3 else None  # Return only if we got more than basic fields
+            extractor = self._extractors[tc]
+            return extractor(raw_msg, icao, tc) if extractor else None
             
         except Exception as e:
-            if config.LOG_PARSE_ATTEMPTS:
-                logger.error(f"[ADSB] Data extraction error: {e}")
+            if self.log_parse_attempts:
+                logger.error("[ADSB] Data extraction error: %s", e)
             return None
     
+    # Per-TC extractors. Each builds its own record, with the ICAO interned so every
+    # record and store key for an aircraft shares one string, and returns None
+    # when nothing beyond the basic fields was decoded
+    
+    def _extract_ident(self, raw_msg: str, icao: str, tc: int) -> Dict[str, Any]:
+        """Aircraft identification (TC 1-4)"""
+        return {
+            'icao': sys.intern(icao),
+            'type_code': tc,
+            'parsed_timestamp': self._batch_ts or datetime.now(timezone.utc),
+            'callsign': sys.intern(_decode_callsign(raw_msg)),
+            'category': adsb.category(raw_msg),
+        }
+    
+    def _extract_surface_position(self, raw_msg: str, icao: str, tc: int) -> Optional[Dict[str, Any]]:
+        """Surface position (TC 5-8); carries no altitude"""
+        data = {'icao': sys.intern(icao), 'type_code': tc, 'parsed_timestamp': self._batch_ts or datetime.now(timezone.utc)}
+        self._decode_position(raw_msg, icao, data)
+        return data if len(data) > 3 else None
+    
+    def _extract_airborne_position(self, raw_msg: str, icao: str, tc: int) -> Optional[Dict[str, Any]]:
+        """Airborne position (TC 9-18)"""
+        data = {'icao': sys.intern(icao), 'type_code': tc, 'parsed_timestamp': self._batch_ts or datetime.now(timezone.utc)}
+        self._decode_position(raw_msg, icao, data)
+        
+        # Get altitude using enhanced decoder
+        altitude_data = self.altitude_decoder.decode_altitude(raw_msg, tc)
+        if altitude_data:
+            data.update(altitude_data)
+            
+            # Cross-check a sample against the legacy decoder if logging enabled;
+            # decoding every message twice would halve field throughput
+            if self.log_altitude_decoding:
+                tick = self._alt_log_tick
+                self._alt_log_tick = tick + 1
+                if tick % self.altitude_compare_interval == 0:
+                    self._compare_legacy_altitude(raw_msg, altitude_data, data)
+        
+        return data if len(data) > 3 else None
+    
+    def _extract_velocity(self, raw_msg: str, icao: str, tc: int) -> Optional[Dict[str, Any]]:
+        """Airborne velocity (TC 19)"""
+        velocity = adsb.velocity(raw_msg)
+        if not velocity:
+            return None
+        return {
+            'icao': sys.intern(icao),
+            'type_code': tc,
+            'parsed_timestamp': self._batch_ts or datetime.now(timezone.utc),
+            'speed_knots': velocity[0] if velocity[0] else None,
+            'heading': velocity[1] if velocity[1] else None,
+            'vertical_rate': velocity[2] if velocity[2] else None,
+        }
+    
+    def _extract_geom_alt(self, raw_msg: str, icao: str, tc: int) -> Optional[Dict[str, Any]]:
+        """Geometric altitude (TC 31, registered only if ENABLE_GEOMETRIC_ALTITUDE)"""
+        altitude_data = self.altitude_decoder.decode_altitude(raw_msg, tc)
+        if not altitude_data:
+            return None
+        data = {'icao': sys.intern(icao), 'type_code': tc, 'parsed_timestamp': self._batch_ts or datetime.now(timezone.utc)}
+        data.update(altitude_data)
+        return data
+    
+    def _decode_position(self, raw_msg: str, icao: str, data: Dict[str, Any]):
+        """Decode position from a fresh even/odd CPR pair, else against the configured reference"""
+        position = self._decode_cpr_pair(raw_msg, icao, data['type_code']) if self._pair_cpr else None
+        try:
+            if position is None and self._ref_lat is not None:
+                position = adsb.position_with_ref(raw_msg, self._ref_lat, self._ref_lon)
+            if position:
+                lat, lon = position
+                if lat and lon:
+                    data['latitude'] = lat
+                    data['longitude'] = lon
+        except _DECODE_ERRORS:
+            pass
+    
+    def _decode_cpr_pair(self, raw_msg: str, icao: str, tc: int) -> Optional[Tuple[float, float]]:
+        """
+        Cache this position frame and globally decode it with its partner
+        
+        Frames are timed by when they were received (_rx_time), not when they
+        are parsed, so replays and batches pair the same way live traffic does.
+        
+        Args:
+            raw_msg: Hex string of a position message (TC 5-18)
+            icao: ICAO address the frame belongs to
+            tc: Type code of the message
+            
+        Returns:
+            (latitude, longitude) of this frame once an even and an odd frame
+            were received within CPR_PAIR_WINDOW seconds of each other,
+            otherwise None
+        """
+        surface = tc <= 8
+        if surface and self._ref_lat is None:
+            return None  # Surface pairs are ambiguous without a receiver reference
+        
+        try:
+            odd = (int(raw_msg[13], 16) >> 2) & 1  # CPR format bit (ME bit 22)
+        except _DECODE_ERRORS:
+            return None
+        
+        now = self._rx_time
+        key = (icao, surface)
+        frames = self._cpr_frames.get(key)
+        if frames is None:
+            frames = self._cpr_frames[key] = [None, 0.0, None, 0.0]
+            if len(self._cpr_frames) > self.max_tracked_aircraft:
+                self._cpr_frames.popitem(last=False)
+        else:
+            self._cpr_frames.move_to_end(key)
+        
+        slot = 2 * odd
+        if frames[slot] is None or now >= frames[slot + 1]:
+            frames[slot] = raw_msg  # A late, out-of-order frame does not replace a newer one
+            frames[slot + 1] = now
+        
+        partner_msg = frames[2 - slot]
+        if partner_msg is None or abs(now - frames[3 - slot]) > self.CPR_PAIR_WINDOW:
+            return None
+        
+        # pyModeS reports the position of whichever frame it is told is newer;
+        # that is always this one, even when the partner was received later
+        if odd:
+            even_msg, odd_msg, even_t, odd_t = partner_msg, raw_msg, 0, 1
+        else:
+            even_msg, odd_msg, even_t, odd_t = raw_msg, partner_msg, 1, 0
+        try:
+            return adsb.position(even_msg, odd_msg, even_t, odd_t, self._ref_lat, self._ref_lon)
+        except _DECODE_ERRORS:
+            return None
+    
+    def _compare_legacy_altitude(self, raw_msg: str, altitude_data: Dict[str, Any], data: Dict[str, Any]):
+        """Log where the enhanced altitude decoder disagrees with pyModeS"""
+        try:
+            legacy_alt = adsb.altitude(raw_msg)
+            if legacy_alt:
+                data['altitude_legacy_ft'] = legacy_alt
+                if 'altitude_baro_ft' in altitude_data:
+                    diff = abs(altitude_data['altitude_baro_ft'] - legacy_alt)
+                    if diff > 100:  # More than 100 ft difference
+                        logger.warning("[ADSB] Altitude decoder difference: enhanced=%s, legacy=%s, diff=%s ft",
+                                       altitude_data['altitude_baro_ft'], legacy_alt, diff)
+        except _DECODE_ERRORS:
+            pass
+    
     def get_latest_aviation_data(self) -> Dict[str, Any]:
-        """Get the most recent aviation data"""
-        return self.last_valid_data.copy()
+        """Get the accumulated data of the most recently updated aircraft"""
+        with self._data_lock:
+            return self.last_valid_data.copy()
     
     def get_aircraft_data(self) -> Dict[str, Dict[str, Any]]:
         """Get all aircraft data by ICAO"""
-        return self.aircraft_data.copy()
+        with self._data_lock:
+            return dict(self.aircraft_data)
     
     def get_stats(self) -> Dict[str, int]:
         """Get parser statistics"""
-        gdl90_stats = self.gdl90_deframer.get_stats()
-        altitude_stats = self.altitude_decoder.get_stats()
-        
-        stats = {
-            'messages_parsed': self.messages_parsed,
-            'parse_errors': self.parse_error_count,
-            'success_rate': round((self.messages_parsed / max(1, self.messages_parsed + self.parse_error_count)) * 100, 1),
-            'aircraft_tracked': len(self.aircraft_data),
-            'gdl90_messages_processed': self.gdl90_messages_processed,
-            'raw_messages_processed': self.raw_messages_processed,
+        with self._data_lock:
+            gdl90_stats = self.gdl90_deframer.get_stats()
+            altitude_stats = self.altitude_decoder.get_stats()
+            
+            # Own counters are already live; only the derived values need refreshing
+            live = self._stats
+            live['success_rate'] = round((live['messages_parsed'] / max(1, live['messages_parsed'] + live['parse_errors'])) * 100, 1)
+            live['aircraft_tracked'] = len(self.aircraft_data)
+            
+            stats = live.copy()
+        stats.update({
             'gdl90_frames_processed': gdl90_stats['frames_processed'],
             'gdl90_adsb_found': gdl90_stats['adsb_messages_found'],
             'gdl90_success_rate': gdl90_stats['success_rate'],
-            'passcom_messages_processed': self.passcom_messages_processed
-        }
+        })
         
         # Add PASSCOM stats if parser is enabled
         if self.passcom_parser:
@@ -333,12 +960,44 @@ class ADSBParser:
     
     def reset_stats(self):
         """Reset parser statistics"""
-        self.parse_error_count = 0
-        self.messages_parsed = 0
-        self.gdl90_messages_processed = 0
-        self.raw_messages_processed = 0
-        self.passcom_messages_processed = 0
+        for key in self._stats:
+            self._stats[key] = 0
+        self._stats['success_rate'] = 0.0
         self.gdl90_deframer.reset_stats()
         if self.passcom_parser:
             self.passcom_parser.reset_stats()
         self.altitude_decoder.reset_stats()
+    
+    def reset(self):
+        """Forget all tracked aircraft, unpaired position frames and statistics"""
+        with self._data_lock:
+            self.aircraft_data.clear()
+            self.last_valid_data = {}
+            self._cpr_frames.clear()
+            if self.passcom_parser:
+                self.passcom_parser.clear_buffer()
+            self.reset_stats()
+
+
+# Per-process parser used by parse_batch workers
+_worker_parser = None
+
+
+def _decode_batch_worker(batch: List[bytes]):
+    """
+    Decode one parse_batch chunk inside a worker process
+    
+    Returns:
+        Tuple of (results, raw messages processed, messages parsed,
+        altitude decoder counters) for the chunk
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ADSBParser()
+        _worker_parser._pair_cpr = False  # The parent pairs frames across all chunks
+    
+    parser = _worker_parser
+    parser.reset_stats()
+    results = parser._decode_batch(batch)
+    return (results, parser.raw_messages_processed, parser.messages_parsed,
+            parser.altitude_decoder.get_stats_array())
@@ -0,0 +1,45 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled breakpoint matching kernels
+
+Optional C extension mirroring the pure-Python and Numba scans in
+breakpoint_manager. Build in place with:
+
+    python setup.py build_ext --inplace
+
+breakpoint_manager picks this up automatically when the extension is importable.
+"""
+
+from libc.stdint cimport int64_t
+
+
+cpdef Py_ssize_t first_size_match(int64_t size, const int64_t[::1] mins, const int64_t[::1] maxs):
+    """Return the index of the first (min, max) bound pair that size triggers, or -1."""
+    cdef Py_ssize_t i
+    for i in range(mins.shape[0]):
+        if size >= mins[i] or size <= maxs[i]:
+            return i
+    return -1
+
+
+cpdef Py_ssize_t scan_contains(const unsigned char[::1] data, const unsigned char[::1] patterns,
+                               const int64_t[::1] offsets, const int64_t[::1] lengths,
+                               const int64_t[:, ::1] skips, int64_t[::1] hits):
+    """Boyer-Moore-Horspool search of data for each packed pattern; returns the hit count."""
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t count = 0
+    cdef Py_ssize_t p, i, j, m, start
+    for p in range(lengths.shape[0]):
+        m = lengths[p]
+        start = offsets[p]
+        i = 0
+        while i <= n - m:
+            j = m - 1
+            while j >= 0 and data[i + j] == patterns[start + j]:
+                j -= 1
+            if j < 0:
+                hits[count] = p
+                count += 1
+                break
+            i += skips[p, data[i + m - 1]]
+    return count
@@ -3,25 +3,230 @@ Breakpoint Manager for UDP Replay System
 Provides advanced debugging with conditional stopping points
 """
 
-from typing import List, Callable, Dict, Any, Optional, Set
-from datetime import datetime
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Callable, Dict, Any, Optional, Set, Tuple
 from logger import logger
-from message_inspector import MessageInspector
+import config
+
+if TYPE_CHECKING:
+    # At runtime it is imported only when no inspector is passed in
+    from message_inspector import MessageInspector
+
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; 'contains' patterns then fall back to the scans below
+    ahocorasick = None
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; the JIT pattern scan and vectorized size checks need it
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it 'contains' patterns use one substring scan each
+    njit = None
+
+try:
+    import breakpoint_core
+except ImportError:
+    # Compiled kernels are optional; build with: python setup.py build_ext --inplace
+    breakpoint_core = None
+
+
+# Below this many 'contains' patterns, per-pattern 'in' beats the JIT call overhead
+JIT_SCAN_MIN_PATTERNS = 8
+
+# From this many size breakpoints on, one NumPy comparison beats the Python loop;
+# the compiled scan has less call overhead and pays off sooner
+VECTOR_SIZE_MIN_BPS = 192
+COMPILED_SIZE_MIN_BPS = 32
+
+# Recent message inspections kept for protocol breakpoints and the debugger
+INSPECT_CACHE_SIZE = 64
+
+# Shared stand-in for a missing context, so check_breakpoints allocates none
+_EMPTY_CONTEXT = MappingProxyType({})
+
+
+@lru_cache(maxsize=256)
+def _parse_hex_pattern(hex_pattern: str) -> bytes:
+    """
+    Convert a user-entered hex pattern ("AA 44 12", "0xAA0x44") to bytes
+    
+    Args:
+        hex_pattern: Hex string, optionally with spaces and 0x prefixes
+        
+    Returns:
+        Pattern bytes
+        
+    Raises:
+        ValueError: If the cleaned string is not valid hex
+    """
+    # fromhex accepts either case, so no upper() pass is needed
+    return bytes.fromhex(hex_pattern.replace(' ', '').replace('0x', ''))
+
+
+def _bmh_shift_table(pattern: bytes) -> List[int]:
+    """
+    Build the Boyer-Moore-Horspool bad-character shift table for a pattern
+    
+    Args:
+        pattern: Non-empty binary pattern
+        
+    Returns:
+        256 shifts, indexed by the byte under the pattern's last position
+    """
+    length = len(pattern)
+    shifts = [length] * 256
+    for i, byte in enumerate(pattern[:-1]):
+        shifts[byte] = length - 1 - i
+    return shifts
+
+
+def _scan_contains_kernel(data, patterns, offsets, lengths, skips, hits):
+    """
+    Boyer-Moore-Horspool search of data for each packed pattern
+    
+    Args:
+        data: Message bytes
+        patterns: uint8 concatenation of all patterns
+        offsets: int64 start of each pattern in patterns
+        lengths: int64 length of each pattern
+        skips: int64 (n_patterns, 256) bad-character shift tables
+        hits: int64 output, filled with the indices of the patterns found
+        
+    Returns:
+        Number of indices written to hits
+    """
+    n = len(data)
+    count = 0
+    for p in range(lengths.shape[0]):
+        m = lengths[p]
+        start = offsets[p]
+        i = 0
+        while i <= n - m:
+            j = m - 1
+            while j >= 0 and data[i + j] == patterns[start + j]:
+                j -= 1
+            if j < 0:
+                hits[count] = p
+                count += 1
+                break
+            i += skips[p, data[i + m - 1]]
+    return count
+
+
+if breakpoint_core is not None:
+    _scan_contains_kernel = breakpoint_core.scan_contains
+elif njit is not None:
+    _scan_contains_kernel = njit(cache=True, boundscheck=False)(_scan_contains_kernel)
+
+
+class Breakpoint:
+    """A registered breakpoint; condition is None for the built-in types"""
+    
+    __slots__ = ('id', 'name', 'description', 'type', 'enabled', 'created_ns', 'condition',
+                 'pattern', 'match_type', 'min_size', 'max_size', 'protocol', 'max_consecutive',
+                 'custom_data', 'hit_fields')
+    
+    def __init__(self, breakpoint_id: int, name: str, description: str, breakpoint_type: str,
+                 condition: Optional[Callable] = None, **details):
+        self.id = breakpoint_id
+        self.name = name
+        self.description = description
+        self.type = breakpoint_type
+        self.enabled = True
+        self.created_ns = int(time.time() * 1e9)
+        self.condition = condition
+        
+        # Type-specific fields; only the ones given are reported in hits
+        self.pattern = self.match_type = self.protocol = None
+        self.min_size = self.max_size = self.max_consecutive = self.custom_data = None
+        for key, value in details.items():
+            setattr(self, key, value)
+        
+        # Breakpoint-specific hit entries, built once and merged into every hit
+        self.hit_fields: Dict[str, Any] = {
+            'bp_name': name,
+            'bp_description': description,
+            'bp_type': breakpoint_type,
+            'bp_created_ns': self.created_ns,
+            **{f'bp_{key}': value for key, value in details.items()}
+        }
 
 
 class BreakpointManager:
     """Advanced debugging with conditional stopping points"""
     
-    def __init__(self, inspector: Optional[MessageInspector] = None):
-        self.inspector = inspector or MessageInspector()
-        self.breakpoints: List[Dict[str, Any]] = []
-        self.hit_breakpoints: List[Dict[str, Any]] = []
+    # Match types resolved by the per-message pattern scan
+    _PATTERN_MATCH_TYPES = frozenset(('starts_with', 'ends_with', 'contains', 'exact'))
+    
+    def __init__(self, inspector: Optional['MessageInspector'] = None):
+        if inspector is None:
+            from message_inspector import MessageInspector
+            inspector = MessageInspector()
+        self.inspector = inspector
+        self.breakpoints: List[Breakpoint] = []  # In registration (= ID) order
+        self._bp_by_id: Dict[int, Breakpoint] = {}
+        self._enabled_bps: List[Breakpoint] = []  # Enabled subset, in registration order
+        self._next_id = 0  # IDs only grow, so ID order is registration order
+        
+        # Enabled breakpoints bucketed by how they are matched, each in registration
+        # order; only custom conditions are still called per message
+        self._error_bps: List[Breakpoint] = []
+        self._size_bps: List[Breakpoint] = []
+        self._size_bounds = None  # (mins, maxs) int64 arrays once there are many size bps
+        self._count_bps: List[Breakpoint] = []
+        self._streak_bps: List[Breakpoint] = []  # 'consecutive_errors'
+        self._protocol_bps: List[Breakpoint] = []
+        self._protocol_bps_by_name: Dict[str, List[Breakpoint]] = {}  # Lowercased protocol -> bps
+        self._protocol_keys: Dict[int, str] = {}  # ID -> protocol, lowercased once at creation
+        self._pattern_bps: List[Breakpoint] = []
+        self._min_pattern_len = 0  # Shortest enabled pattern
+        self._custom_bps: List[Breakpoint] = []
+        # Most recent hits only, so long replays don't grow without bound
+        self.hit_breakpoints: deque = deque(maxlen=config.REPLAY_HIT_HISTORY_MAX)
         self.enabled = True
+        self.version = 0  # Bumped whenever breakpoints are added, removed, enabled or disabled
         self.stats = {
             'total_checks': 0,
             'breakpoints_hit': 0,
             'messages_stopped': 0
         }
+        
+        # Pattern breakpoints are matched together, once per message: 'contains'
+        # through one multi-pattern scan, the rest through hashed lookups
+        self._contains_patterns: Dict[int, bytes] = {}
+        self._contains_shifts: Dict[int, List[int]] = {}  # BMH tables, built once per pattern
+        self._prefix_index: Dict[int, Dict[bytes, List[int]]] = {}  # length -> prefix -> IDs
+        self._suffix_index: Dict[int, Dict[bytes, List[int]]] = {}  # length -> suffix -> IDs
+        self._exact_index: Dict[bytes, List[int]] = {}
+        self._indexed_patterns: Dict[int, Tuple[bytes, str]] = {}
+        self._ac_automaton = None
+        self._packed_patterns = None  # JIT scan inputs: (ids, patterns, offsets, lengths, skips, hits)
+        self._contains_dirty = False
+        
+        # Count breakpoints share two running totals: each remembers the totals it
+        # started from and is reached once a total passes that base plus its target
+        self._success_total = 0
+        self._error_total = 0
+        self._count_bases: Dict[int, Tuple[int, int]] = {}  # ID -> (success base, error base)
+        self._success_thresholds: List[Tuple[int, int, Breakpoint]] = []  # (total, ID, bp), ascending
+        self._error_thresholds: List[Tuple[int, int, Breakpoint]] = []
+        self._success_next = 0  # Thresholds before these indexes have been reached
+        self._error_next = 0
+        self._count_reached: Optional[Breakpoint] = None  # Earliest-registered reached count bp
+        
+        # (message number, data) -> inspection, least recently used first
+        self._inspect_cache: OrderedDict = OrderedDict()
     
     def add_error_breakpoint(self, name: str = "parse_errors") -> int:
         """
@@ -33,12 +238,8 @@ class BreakpointManager:
         Returns:
             Breakpoint ID
         """
-        def error_condition(data: bytes, msg_num: int, context: Dict[str, Any]) -> bool:
-            # Check if there was a parsing error
-            return context.get('parse_error', False)
-        
         return self._add_breakpoint(
-            condition=error_condition,
+            condition=None,
             name=name,
             description="Stop on parsing errors",
             breakpoint_type="error"
@@ -57,6 +258,8 @@ class BreakpointManager:
             Breakpoint ID
         """
         breakpoint_name = name or f"pattern_{pattern.hex()[:8]}_{match_type}"
+        # Empty patterns and unknown match types keep their direct per-message check
+        indexed = bool(pattern) and match_type in self._PATTERN_MATCH_TYPES
         
         def pattern_condition(data: bytes, msg_num: int, context: Dict[str, Any]) -> bool:
             if match_type == 'starts_with':
@@ -71,14 +274,19 @@ class BreakpointManager:
                 logger.warning(f"Unknown pattern match type: {match_type}")
                 return False
         
-        return self._add_breakpoint(
-            condition=pattern_condition,
+        bp_id = self._add_breakpoint(
+            condition=None if indexed else pattern_condition,
             name=breakpoint_name,
             description=f"Stop on pattern {pattern.hex()} ({match_type})",
             breakpoint_type="pattern",
             pattern=pattern.hex(),
             match_type=match_type
         )
+        
+        if indexed:
+            self._index_pattern(bp_id, pattern, match_type)
+        
+        return bp_id
     
     def add_hex_pattern_breakpoint(self, hex_pattern: str, match_type: str = "contains", name: str = None) -> int:
         """
@@ -92,10 +300,8 @@ class BreakpointManager:
         Returns:
             Breakpoint ID
         """
-        # Clean up hex pattern
-        hex_pattern = hex_pattern.replace(' ', '').replace('0x', '').upper()
         try:
-            pattern_bytes = bytes.fromhex(hex_pattern)
+            pattern_bytes = _parse_hex_pattern(hex_pattern)
             return self.add_pattern_breakpoint(pattern_bytes, match_type, name)
         except ValueError as e:
             logger.error(f"Invalid hex pattern '{hex_pattern}': {e}")
@@ -123,21 +329,8 @@ class BreakpointManager:
             'target_error': error_count
         }
         
-        def count_condition(data: bytes, msg_num: int, context: Dict[str, Any]) -> bool:
-            # Update counts
-            if context.get('parse_success', False):
-                bp_data['success_count'] += 1
-            if context.get('parse_error', False):
-                bp_data['error_count'] += 1
-            
-            # Check if we've hit the target counts
-            success_hit = (success_count is not None and bp_data['success_count'] >= success_count)
-            error_hit = (error_count is not None and bp_data['error_count'] >= error_count)
-            
-            return success_hit or error_hit
-        
         return self._add_breakpoint(
-            condition=count_condition,
+            condition=None,
             name=breakpoint_name,
             description=f"Stop after {success_count} successes or {error_count} errors",
             breakpoint_type="count",
@@ -158,18 +351,8 @@ class BreakpointManager:
         """
         breakpoint_name = name or f"size_{min_size}_{max_size}"
         
-        def size_condition(data: bytes, msg_num: int, context: Dict[str, Any]) -> bool:
-            size = len(data)
-            
-            if min_size is not None and size >= min_size:
-                return True
-            if max_size is not None and size <= max_size:
-                return True
-            
-            return False
-        
         return self._add_breakpoint(
-            condition=size_condition,
+            condition=None,
             name=breakpoint_name,
             description=f"Stop on size >= {min_size} or <= {max_size}",
             breakpoint_type="size",
@@ -190,14 +373,12 @@ class BreakpointManager:
         """
         breakpoint_name = name or f"protocol_{protocol}"
         
-        def protocol_condition(data: bytes, msg_num: int, context: Dict[str, Any]) -> bool:
-            # Use inspector to detect protocol
-            inspection = self.inspector.inspect_message(data, msg_num)
-            detected = inspection['protocol_detected']
-            return detected.lower() == protocol.lower()
+        # Registered before _add_breakpoint rebuilds the buckets, which key on it
+        bp_id = self._next_id
+        self._protocol_keys[bp_id] = protocol.lower()
         
         return self._add_breakpoint(
-            condition=protocol_condition,
+            condition=None,
             name=breakpoint_name,
             description=f"Stop on protocol {protocol}",
             breakpoint_type="protocol",
@@ -240,16 +421,8 @@ class BreakpointManager:
         # Track consecutive errors in breakpoint data
         bp_data = {'consecutive_errors': 0}
         
-        def consecutive_errors_condition(data: bytes, msg_num: int, context: Dict[str, Any]) -> bool:
-            if context.get('parse_error', False):
-                bp_data['consecutive_errors'] += 1
-                return bp_data['consecutive_errors'] >= max_consecutive
-            else:
-                bp_data['consecutive_errors'] = 0  # Reset on success
-                return False
-        
         return self._add_breakpoint(
-            condition=consecutive_errors_condition,
+            condition=None,
             name=breakpoint_name,
             description=f"Stop on {max_consecutive} consecutive parsing errors",
             breakpoint_type="consecutive_errors",
@@ -272,89 +445,213 @@ class BreakpointManager:
         if not self.enabled or not self.breakpoints:
             return None
         
-        context = context or {}
+        if context is None:
+            context = _EMPTY_CONTEXT
         self.stats['total_checks'] += 1
         
-        for bp in self.breakpoints:
-            if not bp['enabled']:
-                continue
-            
+        # Common case during bulk replay: breakpoints exist but none is enabled
+        enabled_bps = self._enabled_bps
+        if not enabled_bps:
+            return None
+        
+        # Each bucket is in registration (= ID) order, so the earliest enabled
+        # breakpoint that matches wins, as when every condition was called in turn
+        hit = None
+        parse_error = context.get('parse_error', False)
+        
+        if parse_error and self._error_bps:
+            hit = self._error_bps[0]
+        
+        size = len(data)
+        if self._size_bounds is not None:
+            mins, maxs = self._size_bounds
+            if breakpoint_core is not None:
+                first = breakpoint_core.first_size_match(size, mins, maxs)
+            else:
+                mask = (mins <= size) | (maxs >= size)
+                first = int(mask.argmax())
+                if not mask[first]:
+                    first = -1
+            if first >= 0 and (hit is None or self._size_bps[first].id < hit.id):
+                hit = self._size_bps[first]
+        else:
+            for bp in self._size_bps:
+                if hit is not None and bp.id > hit.id:
+                    break
+                min_size = bp.min_size
+                max_size = bp.max_size
+                if (min_size is not None and size >= min_size) or (max_size is not None and size <= max_size):
+                    hit = bp
+                    break
+        
+        # Messages shorter than every enabled pattern skip the pattern scan entirely
+        pattern_bps = self._pattern_bps
+        if pattern_bps and size >= self._min_pattern_len and (hit is None or pattern_bps[0].id < hit.id):
+            pattern_hits = self._scan_patterns(data)
+            if pattern_hits:
+                for bp in pattern_bps:
+                    if hit is not None and bp.id > hit.id:
+                        break
+                    if bp.id in pattern_hits:
+                        hit = bp
+                        break
+        
+        protocol_bps = self._protocol_bps
+        if protocol_bps and (hit is None or protocol_bps[0].id < hit.id):
+            # One inspection per message, then one lookup for all protocol breakpoints
             try:
-                if bp['condition'](data, message_number, context):
-                    # Breakpoint hit!
-                    hit_info = {
-                        'breakpoint_id': bp['id'],
-                        'name': bp['name'],
-                        'description': bp['description'],
-                        'type': bp['type'],
-                        'message_number': message_number,
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'message_size': len(data),
-                        'context': context.copy()
-                    }
-                    
-                    # Add breakpoint-specific data
-                    for key, value in bp.items():
-                        if key not in ['condition', 'id', 'enabled']:
-                            hit_info[f'bp_{key}'] = value
-                    
-                    self.hit_breakpoints.append(hit_info)
-                    self.stats['breakpoints_hit'] += 1
-                    self.stats['messages_stopped'] += 1
-                    
-                    logger.info(f"Breakpoint '{bp['name']}' triggered at message {message_number}")
-                    return hit_info
-                    
+                detected = self.inspect_message(data, message_number)['protocol_detected'].lower()
+                matching = self._protocol_bps_by_name.get(detected)
+                if matching and (hit is None or matching[0].id < hit.id):
+                    hit = matching[0]
             except Exception as e:
-                logger.error(f"Error checking breakpoint '{bp['name']}': {e}")
+                logger.error(f"Error checking protocol breakpoints at message {message_number}: {e}")
+        
+        # Count totals advance on every checked message; a reached count
+        # breakpoint keeps triggering, as its count stays at or past its target
+        if self._count_bps:
+            parse_success = context.get('parse_success', False)
+            if parse_success:
+                self._success_total += 1
+            if parse_error:
+                self._error_total += 1
+            if parse_success or parse_error:
+                self._advance_count_thresholds()
+            reached = self._count_reached
+            if reached is not None and (hit is None or reached.id < hit.id):
+                hit = reached
+        
+        # Every streak follows the messages, even when an earlier breakpoint triggers
+        for bp in self._streak_bps:
+            counts = bp.custom_data
+            if parse_error:
+                counts['consecutive_errors'] += 1
+                if counts['consecutive_errors'] >= bp.max_consecutive and (hit is None or bp.id < hit.id):
+                    hit = bp
+            else:
+                counts['consecutive_errors'] = 0  # Reset on success
+        
+        for bp in self._custom_bps:
+            if hit is not None and bp.id > hit.id:
+                break
+            try:
+                if bp.condition(data, message_number, context):
+                    hit = bp
+                    break
+            except Exception as e:
+                logger.error(f"Error checking breakpoint '{bp.name}': {e}")
                 # Continue checking other breakpoints
         
-        return None
+        if hit is None:
+            return None
+        
+        bp = hit
+        if bp.type == 'count':
+            self._bank_counts(bp)  # Report the counts as of this hit
+        hit_info = {
+            'breakpoint_id': bp.id,
+            'name': bp.name,
+            'description': bp.description,
+            'type': bp.type,
+            'message_number': message_number,
+            'timestamp_ns': int(time.time() * 1e9),  # Formatted only when a report is built
+            'message_size': size,
+            'context': dict(context),  # Snapshot; the caller may reuse its dict
+            **bp.hit_fields  # Breakpoint-specific data
+        }
+        
+        self.hit_breakpoints.append(hit_info)
+        self.stats['breakpoints_hit'] += 1
+        self.stats['messages_stopped'] += 1
+        
+        logger.info(f"Breakpoint '{bp.name}' triggered at message {message_number}")
+        return hit_info
+    
+    def inspect_message(self, data: bytes, message_number: int) -> Dict[str, Any]:
+        """
+        Inspect a message, reusing the result for recently inspected messages
+        
+        Args:
+            data: Binary message data
+            message_number: Sequential message number
+            
+        Returns:
+            Inspection result from the MessageInspector
+        """
+        key = (message_number, data)
+        cache = self._inspect_cache
+        inspection = cache.get(key)
+        if inspection is not None:
+            cache.move_to_end(key)
+            return inspection
+        
+        inspection = self.inspector.inspect_message(data, message_number)
+        cache[key] = inspection
+        if len(cache) > INSPECT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return inspection
     
     def enable_breakpoint(self, breakpoint_id: int) -> bool:
         """Enable a specific breakpoint"""
-        for bp in self.breakpoints:
-            if bp['id'] == breakpoint_id:
-                bp['enabled'] = True
-                logger.info(f"Enabled breakpoint {breakpoint_id}: {bp['name']}")
-                return True
-        return False
+        bp = self._bp_by_id.get(breakpoint_id)
+        if bp is None:
+            return False
+        
+        if not bp.enabled:
+            bp.enabled = True
+            self._refresh_enabled()
+        logger.info(f"Enabled breakpoint {breakpoint_id}: {bp.name}")
+        return True
     
     def disable_breakpoint(self, breakpoint_id: int) -> bool:
         """Disable a specific breakpoint"""
-        for bp in self.breakpoints:
-            if bp['id'] == breakpoint_id:
-                bp['enabled'] = False
-                logger.info(f"Disabled breakpoint {breakpoint_id}: {bp['name']}")
-                return True
-        return False
+        bp = self._bp_by_id.get(breakpoint_id)
+        if bp is None:
+            return False
+        
+        if bp.enabled:
+            bp.enabled = False
+            self._refresh_enabled()
+        logger.info(f"Disabled breakpoint {breakpoint_id}: {bp.name}")
+        return True
     
     def remove_breakpoint(self, breakpoint_id: int) -> bool:
         """Remove a breakpoint completely"""
-        for i, bp in enumerate(self.breakpoints):
-            if bp['id'] == breakpoint_id:
-                removed = self.breakpoints.pop(i)
-                logger.info(f"Removed breakpoint {breakpoint_id}: {removed['name']}")
-                return True
-        return False
+        removed = self._bp_by_id.pop(breakpoint_id, None)
+        if removed is None:
+            return False
+        
+        self.breakpoints.remove(removed)
+        self._unindex_pattern(breakpoint_id)
+        self._protocol_keys.pop(breakpoint_id, None)
+        self._refresh_enabled()
+        logger.info(f"Removed breakpoint {breakpoint_id}: {removed.name}")
+        return True
     
     def clear_all_breakpoints(self) -> int:
         """Clear all breakpoints"""
         count = len(self.breakpoints)
         self.breakpoints.clear()
+        self._bp_by_id.clear()
+        self._protocol_keys.clear()
+        self._refresh_enabled()
+        for bp_id in list(self._indexed_patterns):
+            self._unindex_pattern(bp_id)
         logger.info(f"Cleared all {count} breakpoints")
         return count
     
     def enable_all_breakpoints(self) -> None:
         """Enable all breakpoints"""
         for bp in self.breakpoints:
-            bp['enabled'] = True
+            bp.enabled = True
+        self._refresh_enabled()
         logger.info("Enabled all breakpoints")
     
     def disable_all_breakpoints(self) -> None:
         """Disable all breakpoints"""
         for bp in self.breakpoints:
-            bp['enabled'] = False
+            bp.enabled = False
+        self._refresh_enabled()
         logger.info("Disabled all breakpoints")
     
     def set_enabled(self, enabled: bool) -> None:
@@ -365,25 +662,26 @@ class BreakpointManager:
     def get_breakpoint_list(self) -> List[Dict[str, Any]]:
         """Get list of all breakpoints"""
         return [{
-            'id': bp['id'],
-            'name': bp['name'],
-            'description': bp['description'],
-            'type': bp['type'],
-            'enabled': bp['enabled']
+            'id': bp.id,
+            'name': bp.name,
+            'description': bp.description,
+            'type': bp.type,
+            'enabled': bp.enabled
         } for bp in self.breakpoints]
     
     def get_breakpoint_stats(self) -> Dict[str, Any]:
         """Get breakpoint statistics"""
         stats = self.stats.copy()
         stats['total_breakpoints'] = len(self.breakpoints)
-        stats['enabled_breakpoints'] = sum(1 for bp in self.breakpoints if bp['enabled'])
+        stats['enabled_breakpoints'] = len(self._enabled_bps)
         stats['disabled_breakpoints'] = len(self.breakpoints) - stats['enabled_breakpoints']
-        stats['recent_hits'] = self.hit_breakpoints[-10:]  # Last 10 hits
+        hits = self.hit_breakpoints
+        stats['recent_hits'] = list(islice(hits, max(0, len(hits) - 10), None))  # Last 10 hits
         return stats
     
     def get_hit_history(self) -> List[Dict[str, Any]]:
         """Get history of breakpoint hits"""
-        return self.hit_breakpoints.copy()
+        return list(self.hit_breakpoints)
     
     def clear_hit_history(self) -> None:
         """Clear breakpoint hit history"""
@@ -392,13 +690,15 @@ class BreakpointManager:
     
     def format_breakpoint_report(self, hit_info: Dict[str, Any]) -> str:
         """Format a breakpoint hit into a readable report"""
+        from datetime import datetime
+        
         lines = []
         
         lines.append("=" * 60)
         lines.append(f"BREAKPOINT HIT: {hit_info['name']}")
         lines.append("=" * 60)
         
-        lines.append(f"Timestamp: {hit_info['timestamp']}")
+        lines.append(f"Timestamp: {datetime.utcfromtimestamp(hit_info['timestamp_ns'] / 1e9).isoformat()}")
         lines.append(f"Message Number: {hit_info['message_number']}")
         lines.append(f"Message Size: {hit_info['message_size']} bytes")
         lines.append(f"Breakpoint Type: {hit_info['type']}")
@@ -426,23 +726,223 @@ class BreakpointManager:
         
         return "\n".join(lines)
     
-    def _add_breakpoint(self, condition: Callable, name: str, description: str, 
+    def _index_pattern(self, bp_id: int, pattern: bytes, match_type: str) -> None:
+        """Register a non-empty pattern breakpoint with the per-message pattern scan"""
+        self._indexed_patterns[bp_id] = (pattern, match_type)
+        if match_type == 'contains':
+            self._contains_patterns[bp_id] = pattern
+            self._contains_shifts[bp_id] = _bmh_shift_table(pattern)
+            self._contains_dirty = True
+        elif match_type == 'exact':
+            self._exact_index.setdefault(pattern, []).append(bp_id)
+        else:
+            index = self._prefix_index if match_type == 'starts_with' else self._suffix_index
+            index.setdefault(len(pattern), {}).setdefault(pattern, []).append(bp_id)
+    
+    def _unindex_pattern(self, bp_id: int) -> None:
+        """Drop a pattern breakpoint from the per-message pattern scan, if registered"""
+        entry = self._indexed_patterns.pop(bp_id, None)
+        if entry is None:
+            return
+        
+        pattern, match_type = entry
+        if match_type == 'contains':
+            del self._contains_patterns[bp_id]
+            del self._contains_shifts[bp_id]
+            self._contains_dirty = True
+            return
+        
+        if match_type == 'exact':
+            buckets = self._exact_index
+        else:
+            index = self._prefix_index if match_type == 'starts_with' else self._suffix_index
+            buckets = index[len(pattern)]
+        
+        buckets[pattern].remove(bp_id)
+        if not buckets[pattern]:
+            del buckets[pattern]
+            if match_type != 'exact' and not buckets:
+                del index[len(pattern)]
+    
+    def _refresh_enabled(self) -> None:
+        """Rebuild the enabled-breakpoint list and type buckets after any change"""
+        self.version += 1
+        self._enabled_bps = [bp for bp in self.breakpoints if bp.enabled]
+        
+        # Bank count progress under the old bases before the bases are rebuilt
+        for bp in self._count_bps:
+            self._bank_counts(bp)
+        
+        buckets = {'error': [], 'size': [], 'count': [], 'consecutive_errors': [], 'protocol': [],
+                   'pattern': [], 'custom': []}
+        for bp in self._enabled_bps:
+            if bp.condition is not None:
+                buckets['custom'].append(bp)
+            else:
+                buckets[bp.type].append(bp)
+        
+        self._error_bps = buckets['error']
+        self._size_bps = buckets['size']
+        self._size_bounds = None
+        min_bps = VECTOR_SIZE_MIN_BPS if breakpoint_core is None else COMPILED_SIZE_MIN_BPS
+        if np is not None and len(self._size_bps) >= min_bps:
+            # An unset bound can never trigger: no size reaches int64 max or falls below 0
+            no_min = np.iinfo(np.int64).max
+            self._size_bounds = (
+                np.array([no_min if bp.min_size is None else bp.min_size for bp in self._size_bps], dtype=np.int64),
+                np.array([-1 if bp.max_size is None else bp.max_size for bp in self._size_bps], dtype=np.int64)
+            )
+        self._count_bps = buckets['count']
+        self._streak_bps = buckets['consecutive_errors']
+        self._rebase_counts()
+        self._protocol_bps = buckets['protocol']
+        self._protocol_bps_by_name = {}
+        for bp in self._protocol_bps:
+            self._protocol_bps_by_name.setdefault(self._protocol_keys[bp.id], []).append(bp)
+        self._pattern_bps = buckets['pattern']
+        self._min_pattern_len = min((len(bp.pattern) // 2 for bp in self._pattern_bps), default=0)
+        self._custom_bps = buckets['custom']
+    
+    def _bank_counts(self, bp: Breakpoint) -> None:
+        """Write a count breakpoint's progress, derived from the shared totals, into its data"""
+        base = self._count_bases.get(bp.id)
+        if base is not None:
+            bp.custom_data['success_count'] = self._success_total - base[0]
+            bp.custom_data['error_count'] = self._error_total - base[1]
+    
+    def _rebase_counts(self) -> None:
+        """Rebuild the threshold lists of the enabled count breakpoints from their banked progress"""
+        self._count_bases = {}
+        success_thresholds = []
+        error_thresholds = []
+        for bp in self._count_bps:
+            counts = bp.custom_data
+            base = (self._success_total - counts['success_count'], self._error_total - counts['error_count'])
+            self._count_bases[bp.id] = base
+            if counts['target_success'] is not None:
+                success_thresholds.append((base[0] + counts['target_success'], bp.id, bp))
+            if counts['target_error'] is not None:
+                error_thresholds.append((base[1] + counts['target_error'], bp.id, bp))
+        
+        self._success_thresholds = sorted(success_thresholds)
+        self._error_thresholds = sorted(error_thresholds)
+        self._success_next = self._error_next = 0
+        self._count_reached = None
+        self._advance_count_thresholds()
+    
+    def _advance_count_thresholds(self) -> None:
+        """Move past every count threshold the totals have reached, tracking the earliest breakpoint"""
+        reached = self._count_reached
+        
+        thresholds = self._success_thresholds
+        i = self._success_next
+        while i < len(thresholds) and thresholds[i][0] <= self._success_total:
+            bp = thresholds[i][2]
+            if reached is None or bp.id < reached.id:
+                reached = bp
+            i += 1
+        self._success_next = i
+        
+        thresholds = self._error_thresholds
+        i = self._error_next
+        while i < len(thresholds) and thresholds[i][0] <= self._error_total:
+            bp = thresholds[i][2]
+            if reached is None or bp.id < reached.id:
+                reached = bp
+            i += 1
+        self._error_next = i
+        
+        self._count_reached = reached
+    
+    def _scan_patterns(self, data: bytes) -> Set[int]:
+        """
+        Find every indexed pattern breakpoint that matches data
+        
+        Args:
+            data: Binary message data
+            
+        Returns:
+            Set of matching breakpoint IDs
+        """
+        hits = self._scan_contains(data) if self._contains_patterns else set()
+        
+        # One slice and one hash lookup per distinct pattern length that fits
+        size = len(data)
+        for length, prefixes in self._prefix_index.items():
+            if length <= size:
+                bp_ids = prefixes.get(data[:length])
+                if bp_ids:
+                    hits.update(bp_ids)
+        for length, suffixes in self._suffix_index.items():
+            if length <= size:
+                bp_ids = suffixes.get(data[-length:])
+                if bp_ids:
+                    hits.update(bp_ids)
+        bp_ids = self._exact_index.get(data)
+        if bp_ids:
+            hits.update(bp_ids)
+        
+        return hits
+    
+    def _scan_contains(self, data: bytes) -> Set[int]:
+        """Find every 'contains' pattern breakpoint whose pattern occurs in data"""
+        if ahocorasick is None:
+            compiled = njit is not None or breakpoint_core is not None
+            if not compiled or np is None or len(self._contains_patterns) < JIT_SCAN_MIN_PATTERNS:
+                return {bp_id for bp_id, pattern in self._contains_patterns.items() if pattern in data}
+            
+            if self._contains_dirty:
+                self._pack_patterns()
+            bp_ids, patterns, offsets, lengths, skips, hits = self._packed_patterns
+            count = _scan_contains_kernel(data, patterns, offsets, lengths, skips, hits)
+            return {bp_ids[i] for i in hits[:count].tolist()}
+        
+        if self._contains_dirty:
+            self._build_automaton()
+        
+        # One Aho-Corasick pass over the message tests all patterns at once;
+        # latin-1 maps bytes 1:1 onto code points for the str-keyed automaton
+        return {bp_id for _, bp_ids in self._ac_automaton.iter(data.decode('latin-1')) for bp_id in bp_ids}
+    
+    def _build_automaton(self) -> None:
+        """Rebuild the Aho-Corasick automaton from the registered 'contains' patterns"""
+        ids_by_pattern: Dict[bytes, List[int]] = {}
+        for bp_id, pattern in self._contains_patterns.items():
+            ids_by_pattern.setdefault(pattern, []).append(bp_id)
+        
+        automaton = ahocorasick.Automaton()
+        for pattern, bp_ids in ids_by_pattern.items():
+            automaton.add_word(pattern.decode('latin-1'), tuple(bp_ids))
+        automaton.make_automaton()
+        
+        self._ac_automaton = automaton
+        self._contains_dirty = False
+    
+    def _pack_patterns(self) -> None:
+        """Pack the registered 'contains' patterns and their cached BMH tables for the JIT scan"""
+        bp_ids = list(self._contains_patterns)
+        patterns = [self._contains_patterns[bp_id] for bp_id in bp_ids]
+        lengths = np.array([len(pattern) for pattern in patterns], dtype=np.int64)
+        offsets = np.zeros(len(patterns), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        
+        skips = np.array([self._contains_shifts[bp_id] for bp_id in bp_ids], dtype=np.int64)
+        packed = np.frombuffer(b''.join(patterns), dtype=np.uint8)
+        hits = np.empty(len(patterns), dtype=np.int64)
+        self._packed_patterns = (bp_ids, packed, offsets, lengths, skips, hits)
+        self._contains_dirty = False
+    
+    def _add_breakpoint(self, condition: Optional[Callable], name: str, description: str, 
                        breakpoint_type: str, **kwargs) -> int:
-        """Internal method to add a breakpoint"""
-        breakpoint_id = len(self.breakpoints)
-        
-        breakpoint = {
-            'id': breakpoint_id,
-            'condition': condition,
-            'name': name,
-            'description': description,
-            'type': breakpoint_type,
-            'enabled': True,
-            'created': datetime.utcnow().isoformat(),
-            **kwargs
-        }
+        """Internal method to add a breakpoint; condition is None for the built-in types"""
+        breakpoint_id = self._next_id
+        self._next_id += 1
+        
+        breakpoint = Breakpoint(breakpoint_id, name, description, breakpoint_type, condition, **kwargs)
         
         self.breakpoints.append(breakpoint)
+        self._bp_by_id[breakpoint_id] = breakpoint
+        self._refresh_enabled()
         logger.info(f"Added breakpoint {breakpoint_id}: {name} ({breakpoint_type})")
         
         return breakpoint_id
@@ -455,7 +955,7 @@ class BreakpointManager:
         lines = [f"Breakpoints ({len(self.breakpoints)} total, {self.stats['breakpoints_hit']} hits):"]
         
         for bp in self.breakpoints:
-            status = "✓" if bp['enabled'] else "✗"
-            lines.append(f"  {status} [{bp['id']}] {bp['name']} ({bp['type']}) - {bp['description']}")
+            status = "✓" if bp.enabled else "✗"
+            lines.append(f"  {status} [{bp.id}] {bp.name} ({bp.type}) - {bp.description}")
         
         return "\n".join(lines)
\ No newline at end of file
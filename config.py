@@ -2,6 +2,8 @@
 Configuration settings for Novatel ProPak6 Navigation Data Toolkit
 """
 
+import math
+
 # Network Configuration
 UDP_PORT = 4001
 UDP_HOST = '0.0.0.0'  # Listen on all interfaces
@@ -19,8 +21,8 @@ SPEED_UNITS = 'both'      # 'knots', 'kmh', 'mph', or 'both'
 
 # Protocol Configuration
 PROTOCOL_MODE = 'nmea'    # 'nmea', 'adsb', 'novatel', or 'auto'
-ADSB_REFERENCE_LAT = 0.0  # Reference latitude for ADS-B position decoding
-ADSB_REFERENCE_LON = 0.0  # Reference longitude for ADS-B position decoding
+ADSB_REFERENCE_LAT = None  # Receiver latitude for local ADS-B position decoding (None disables)
+ADSB_REFERENCE_LON = None  # Receiver longitude for local ADS-B position decoding (None disables)
 
 # Serial Port Configuration (for Novatel interface)
 SERIAL_PORT = '/dev/ttyUSB0'    # Serial port device (Linux/Mac) or 'COM1' (Windows)
@@ -73,7 +75,7 @@ REPLAY_MAX_INSPECT_BYTES = 1024
 
 # Message Filtering
 REPLAY_FILTER_MIN_SIZE = 0
-REPLAY_FILTER_MAX_SIZE = float('inf')
+REPLAY_FILTER_MAX_SIZE = math.inf
 REPLAY_FILTER_PATTERNS = []
 REPLAY_SKIP_CORRUPTED = False
 
@@ -81,6 +83,7 @@ REPLAY_SKIP_CORRUPTED = False
 REPLAY_BREAKPOINT_ON_ERRORS = False
 REPLAY_BREAKPOINT_PATTERNS = []
 REPLAY_MAX_CONSECUTIVE_ERRORS = 10
+REPLAY_HIT_HISTORY_MAX = 1024  # Breakpoint hits kept in history; oldest dropped first
 
 # Statistics
 REPLAY_ENABLE_STATISTICS = True
@@ -92,6 +95,7 @@ REPLAY_STATISTICS_FILE = 'logs/replay_statistics.json'
 ENABLE_PASSCOM_PARSER = True
 LOG_PASSCOM_FRAMES = False
 LOG_ALTITUDE_DECODING = False
+ALTITUDE_COMPARISON_SAMPLE_INTERVAL = 1000  # Cross-check 1 in N altitudes against pyModeS when logging
 PASSCOM_FRAME_TIMEOUT_MS = 1000
 
 # Altitude Validation
@@ -108,6 +112,10 @@ ENABLE_GEOMETRIC_ALTITUDE = True
 # Performance Settings
 PASSCOM_BUFFER_SIZE = 4096
 MAX_FRAMES_PER_PACKET = 10
+MAX_TRACKED_AIRCRAFT = 4096  # Least recently seen aircraft are evicted past this
+FEED_QUEUE_SIZE = 8192       # ADSBParser.feed() backlog; oldest messages dropped when full
+FEED_BATCH_SIZE = 64         # Wake the feed parser thread once this many messages are queued
+FEED_FLUSH_INTERVAL = 0.05   # Seconds between feed drains when traffic is light
 
 # JSON Event Logging
 ENABLE_JSON_EVENT_LOGGING = False   # Enable JSON event streaming to json_events.log
@@ -20,11 +20,13 @@ Key Features:
 
 Usage:
     python parse_adsb_message.py <hex_message> [options]
+    python parse_adsb_message.py --file <path|-> [options]
 
 Examples:
     python parse_adsb_message.py "8D4840D6202CC371C32CE0576098"
     python parse_adsb_message.py "8D 48 40 D6 20 2C C3 71 C3 2C E0 57 60 98"
     python parse_adsb_message.py 8D4840D6202CC371C32CE0576098 --pretty
+    python parse_adsb_message.py --file messages.txt
 
 Author: Generated for Novatel ProPak6 Navigation Data Toolkit
 License: See project LICENSE file
@@ -33,8 +35,10 @@ License: See project LICENSE file
 import sys
 import json
 import argparse
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Tuple, Union
 
 # Add parent directory to Python path to access project modules
 # This allows the script to import the main ADS-B parser without requiring
@@ -45,6 +49,83 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from adsb_parser import ADSBParser
 import config
 
+# Separators stripped from hex input in one str.translate() pass
+_HEX_SEP_TABLE = str.maketrans('', '', ' -:\t\r\n')
+
+# Parser shared by every parse_adsb_message call; created on first use
+_parser = None
+
+# Fields stamped with the wall-clock time of a decode; never served from the cache
+_TIMESTAMP_FIELDS = ('parsed_timestamp', 'altitude_decoded_at_ns')
+
+
+def _get_parser() -> ADSBParser:
+    """
+    Return the shared ADS-B parser, reset so each message is decoded on its own.
+    
+    Constructing an ADSBParser sets up the GDL-90, PASSCOM and altitude
+    decoders, so batch callers reuse one instance. Statistics and tracked
+    aircraft (including CPR frames) are cleared before every message so the
+    output matches what a freshly constructed parser would report.
+    
+    Returns:
+        ADSBParser: The shared parser instance
+    """
+    global _parser
+    if _parser is None:
+        _parser = ADSBParser()
+    else:
+        _parser.reset()
+    return _parser
+
+
+def decode_hex_input(hex_input: str) -> Tuple[str, bytes]:
+    """
+    Clean, validate and convert hexadecimal input in a single pass.
+    
+    bytes.fromhex() both validates the digits and produces the message bytes,
+    so the hex string is parsed only once instead of being checked with int()
+    and then converted again.
+    
+    Args:
+        hex_input (str): Raw hex string input that may contain spaces, 
+                        dashes, colons, or other separators
+                        
+    Returns:
+        Tuple[str, bytes]: Clean uppercase hex string and its binary form
+        
+    Raises:
+        ValueError: If input contains non-hex characters or has odd length
+        
+    Examples:
+        >>> decode_hex_input("8d 48 40 d6")
+        ('8D4840D6', b'\x8dH@\xd6')
+    """
+    # Remove common separators that are often used in hex representations
+    # This makes the script more user-friendly by accepting various formats
+    cleaned = hex_input.translate(_HEX_SEP_TABLE).strip()
+    
+    # Ensure even number of characters (each byte requires exactly 2 hex digits)
+    # Odd-length hex strings would indicate incomplete byte data
+    if len(cleaned) % 2 != 0:
+        # Report bad digits first, as before; this only runs on the error path
+        try:
+            int(cleaned, 16)
+        except ValueError:
+            raise ValueError(f"Invalid hex string: {hex_input}")
+        raise ValueError(f"Hex string must have even number of characters: {cleaned}")
+    
+    # Validate and convert in one C-level pass (0-9, A-F, a-f only)
+    try:
+        message_bytes = bytes.fromhex(cleaned)
+    except ValueError:
+        raise ValueError(f"Invalid hex string: {hex_input}")
+    if not message_bytes:
+        raise ValueError(f"Invalid hex string: {hex_input}")
+    
+    # Convert to uppercase for consistency in output and processing
+    return cleaned.upper(), message_bytes
+
 
 def clean_hex_input(hex_input: str) -> str:
     """
@@ -76,24 +157,7 @@ def clean_hex_input(hex_input: str) -> str:
         >>> clean_hex_input("8d-48-40-d6")
         "8D4840D6"
     """
-    # Remove common separators that are often used in hex representations
-    # This makes the script more user-friendly by accepting various formats
-    cleaned = hex_input.replace(' ', '').replace('-', '').replace(':', '').strip()
-    
-    # Validate that all characters are valid hexadecimal digits (0-9, A-F, a-f)
-    # Using int() conversion is more reliable than character-by-character checking
-    try:
-        int(cleaned, 16)  # This will raise ValueError if not valid hex
-    except ValueError:
-        raise ValueError(f"Invalid hex string: {hex_input}")
-    
-    # Ensure even number of characters (each byte requires exactly 2 hex digits)
-    # Odd-length hex strings would indicate incomplete byte data
-    if len(cleaned) % 2 != 0:
-        raise ValueError(f"Hex string must have even number of characters: {cleaned}")
-    
-    # Convert to uppercase for consistency in output and processing
-    return cleaned.upper()
+    return decode_hex_input(hex_input)[0]
 
 
 def hex_to_bytes(hex_string: str) -> bytes:
@@ -116,6 +180,81 @@ def hex_to_bytes(hex_string: str) -> bytes:
     return bytes.fromhex(hex_string)
 
 
+@lru_cache(maxsize=4096)
+def _decode_message_bytes(message_bytes: bytes) -> Tuple[bool, Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Decode one ADS-B message with the shared parser, memoized on its bytes.
+    
+    Logs often repeat the same message (e.g. a stationary aircraft sending
+    identical reports). The parser is reset before every message, so the
+    decoded fields and statistics depend on the message alone. Wall-clock
+    timestamp fields are cached as None and stamped per call instead.
+    Entries are shared between calls and must not be modified.
+    
+    Args:
+        message_bytes (bytes): Validated binary ADS-B message
+        
+    Returns:
+        Tuple[bool, Optional[Dict[str, Any]], Dict[str, Any]]: Success flag,
+        decoded fields with timestamps blanked (None if empty or failed) and
+        parser statistics
+    """
+    # Temporarily disable verbose logging unless explicitly requested
+    # This prevents cluttering the JSON output with debug information
+    original_log_setting = config.LOG_PARSE_ATTEMPTS
+    config.LOG_PARSE_ATTEMPTS = False
+    
+    # The parser handles both raw Mode S and GDL-90 wrapped messages
+    parser = _get_parser()
+    
+    # This is where the actual ADS-B decoding happens using pyModeS
+    result = parser.parse_message(message_bytes)
+    
+    # Restore original logging configuration
+    config.LOG_PARSE_ATTEMPTS = original_log_setting
+    
+    fields = None
+    if result:
+        # Convert datetime objects to ISO format for JSON serialization
+        # Python datetime objects are not JSON serializable by default;
+        # datetime subclasses date, so one isinstance check covers both
+        fields = {
+            key: None if key in _TIMESTAMP_FIELDS else value.isoformat() if isinstance(value, date) else value
+            for key, value in result.items()
+        }
+    
+    return result is not None, fields, parser.get_stats()
+
+
+def _parse_message_bytes(message_bytes: bytes) -> Tuple[bool, Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Decode one ADS-B message, serving repeated messages from the decode cache.
+    
+    Every call gets its own copies of the parsed data and statistics, with
+    parsed_timestamp (and the altitude decode time, where there is one)
+    set to the time of this call.
+    
+    Args:
+        message_bytes (bytes): Validated binary ADS-B message
+        
+    Returns:
+        Tuple[bool, Optional[Dict[str, Any]], Dict[str, Any]]: Success flag,
+        JSON-ready parsed data (None if empty or failed) and parser statistics
+    """
+    success, fields, parser_stats = _decode_message_bytes(message_bytes)
+    
+    formatted_result = None
+    if fields is not None:
+        now = datetime.now(timezone.utc)
+        formatted_result = dict(fields)
+        if 'parsed_timestamp' in formatted_result:
+            formatted_result['parsed_timestamp'] = now.isoformat()
+        if 'altitude_decoded_at_ns' in formatted_result:
+            formatted_result['altitude_decoded_at_ns'] = int(now.timestamp() * 1e9)
+    
+    return success, formatted_result, dict(parser_stats)
+
+
 def parse_adsb_message(raw_message: str) -> Dict[str, Any]:
     """
     Parse an ADS-B message and return comprehensive results.
@@ -147,33 +286,17 @@ def parse_adsb_message(raw_message: str) -> Dict[str, Any]:
         >>> result['parsing']['success']
         True
         >>> result['parsed_data']['callsign']
-        "KLM1023_"
+        "KLM1023"
     """
     try:
-        # Step 1: Clean and validate the input hex string
-        # This handles user-friendly input formats and ensures data integrity
-        clean_hex = clean_hex_input(raw_message)
-        
-        # Step 2: Convert hex string to binary data
-        # ADS-B messages are processed as binary data by the parser
-        message_bytes = hex_to_bytes(clean_hex)
-        
-        # Step 3: Configure parser logging
-        # Temporarily disable verbose logging unless explicitly requested
-        # This prevents cluttering the JSON output with debug information
-        original_log_setting = config.LOG_PARSE_ATTEMPTS
-        config.LOG_PARSE_ATTEMPTS = False
+        # Steps 1-2: Clean, validate and convert the input hex string
+        # ADS-B messages are processed as binary data by the parser, and
+        # validation and conversion share a single pass over the string
+        clean_hex, message_bytes = decode_hex_input(raw_message)
         
-        # Step 4: Create ADS-B parser instance
-        # The parser handles both raw Mode S and GDL-90 wrapped messages
-        parser = ADSBParser()
-        
-        # Step 5: Parse the message
-        # This is where the actual ADS-B decoding happens using pyModeS
-        result = parser.parse_message(message_bytes)
-        
-        # Step 6: Restore original logging configuration
-        config.LOG_PARSE_ATTEMPTS = original_log_setting
+        # Steps 3-6: Decode the message with the shared parser
+        # Repeated messages are served from the decode cache
+        success, parsed_data, parser_stats = _parse_message_bytes(message_bytes)
         
         # Step 7: Build comprehensive output structure
         # The output includes metadata, statistics, and parsed data
@@ -186,24 +309,15 @@ def parse_adsb_message(raw_message: str) -> Dict[str, Any]:
             },
             # Parsing section: Success status and detailed statistics
             'parsing': {
-                'success': result is not None,  # Boolean success indicator
-                'parser_stats': parser.get_stats() # Detailed parser statistics
+                'success': success,             # Boolean success indicator
+                'parser_stats': parser_stats    # Detailed parser statistics
             }
         }
         
         # Step 8: Process successful parsing results
-        if result:
-            # Convert datetime objects to ISO format for JSON serialization
-            # Python datetime objects are not JSON serializable by default
-            formatted_result = {}
-            for key, value in result.items():
-                if hasattr(value, 'isoformat'):  # Check if it's a datetime object
-                    formatted_result[key] = value.isoformat()
-                else:
-                    formatted_result[key] = value
-            
+        if parsed_data:
             # Add parsed aviation data to output
-            output['parsed_data'] = formatted_result
+            output['parsed_data'] = parsed_data
         else:
             # Add error message for failed parsing
             output['error'] = 'Failed to parse message - may not be a valid ADS-B message'
@@ -263,6 +377,9 @@ Examples:
         
     %(prog)s "8D4840D6580B982C8BA874F80820" --pretty
         Parse airborne position message
+        
+    %(prog)s --file messages.txt
+        Parse one message per line, printing one JSON result per line
 
 Input Format:
     The script accepts ADS-B messages in hexadecimal format with or without
@@ -283,11 +400,19 @@ Output Format:
     
     # Define command line arguments
     
-    # Required positional argument: the ADS-B message to parse
-    parser.add_argument(
+    # Input source: a single message, or a file with one message per line
+    # Batch mode reuses one process and one parser for every message
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         'message',
+        nargs='?',
         help='Raw ADS-B message in hexadecimal format (with or without spaces/separators)'
     )
+    source.add_argument(
+        '--file',
+        metavar='PATH',
+        help="Parse newline-delimited hex messages from PATH ('-' for stdin), one JSON result per line"
+    )
     
     # Optional flag: pretty-print JSON output
     parser.add_argument(
@@ -311,9 +436,30 @@ Output Format:
     if args.verbose:
         config.LOG_PARSE_ATTEMPTS = True
         print("Verbose logging enabled - showing detailed parsing steps:")
-        print(f"Input message: {args.message}")
+        print(f"Input message: {args.message}" if args.file is None else f"Input file: {args.file}")
         print("=" * 50)
     
+    # Batch mode: one JSON document per non-blank input line
+    if args.file is not None:
+        all_parsed = True
+        fh = sys.stdin if args.file == '-' else open(args.file)
+        try:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                result = parse_adsb_message(line)
+                print(json.dumps(result, indent=2 if args.pretty else None))
+                all_parsed = all_parsed and result['parsing']['success']
+        finally:
+            if fh is not sys.stdin:
+                fh.close()
+        
+        # Exit with code 1 if any message failed to parse
+        if not all_parsed:
+            sys.exit(1)
+        return
+    
     # Parse the ADS-B message
     # This is the main processing step that does all the work
     result = parse_adsb_message(args.message)
@@ -4,14 +4,103 @@ Extracts ADS-B payloads from GDL-90/KISS wrapped UDP data
 """
 
 import time
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 import config
 from logger import logger
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; without it frame flags are always located with bytes.find
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it every frame is unstuffed with bytes.replace
+    njit = None
+
+# Stuffed byte sequences (0x7D 0x5E → 0x7E, 0x7D 0x5D → 0x7D)
+_ESCAPED_FLAG = b'\x7d\x5e'
+_ESCAPED_ESC = b'\x7d\x5d'
+
+# From this many flags one vectorized compare beats a bytes.find call per flag
+VECTOR_BOUNDARY_MIN_FLAGS = 32
+
+# Below this frame size the four C-level bytes passes beat the JIT call overhead
+JIT_UNSTUFF_MIN_BYTES = 512
+
+# Debug logs hex-dump at most this many bytes in full; longer data is summarized
+LOG_HEX_MAX_BYTES = 64
+
+
+def _hex_summary(data: bytes) -> str:
+    """
+    Hex-encode data for debug logs, keeping only its head and tail when long
+    
+    Args:
+        data: Bytes to log
+        
+    Returns:
+        Full hex string, or the first 32 and last 16 bytes joined by '...'
+    """
+    if len(data) <= LOG_HEX_MAX_BYTES:
+        return data.hex()
+    return f"{data[:32].hex()}...{data[-16:].hex()}"
+
+
+class _LazyHex:
+    """Log argument that hex-encodes its bytes only if the record is emitted"""
+    
+    __slots__ = ('data',)
+    
+    def __init__(self, data: bytes):
+        self.data = data
+    
+    def __str__(self) -> str:
+        return _hex_summary(self.data)
+
+
+def _unstuff_kernel(data, out):
+    """
+    Single-pass KISS unstuffing state machine
+    
+    Args:
+        data: Stuffed frame bytes
+        out: Writable output buffer, at least len(data) long
+        
+    Returns:
+        Tuple of (bytes written to out, escape sequences replaced)
+    """
+    n = len(data)
+    i = 0
+    written = 0
+    operations = 0
+    while i < n:
+        byte_val = data[i]
+        if byte_val == 0x7D and i + 1 < n and (data[i + 1] == 0x5E or data[i + 1] == 0x5D):
+            out[written] = 0x7E if data[i + 1] == 0x5E else 0x7D
+            operations += 1
+            i += 2
+        else:
+            out[written] = byte_val
+            i += 1
+        written += 1
+    return written, operations
+
+
+if njit is not None:
+    _unstuff_kernel = njit(cache=True, boundscheck=False)(_unstuff_kernel)
+
 
 class GDL90Deframer:
     """GDL-90/KISS deframer for extracting ADS-B messages"""
     
+    # Counters live in fixed slots; '__dict__' is kept (and only allocated on
+    # first use) so instance methods can still be patched, e.g. in tests
+    __slots__ = ('frames_processed', 'frames_extracted', 'adsb_messages_found',
+                 'deframing_errors', 'byte_unstuff_operations', '_unstuff_buffer', '__dict__')
+    
     # GDL-90 constants
     FLAG_BYTE = 0x7E                    # Frame boundary marker
     ESCAPE_BYTE = 0x7D                  # KISS escape byte
@@ -25,6 +114,9 @@ class GDL90Deframer:
     MIN_ADSB_PAYLOAD_LENGTH = 14        # 14 bytes = 112 bits (minimum)
     MAX_ADSB_PAYLOAD_LENGTH = 18        # Maximum reasonable length
     
+    # Valid ADS-B downlink formats as a bit set: DF 17=ADS-B, 18=TIS-B, 19=Military
+    _VALID_DF_MASK = (1 << 17) | (1 << 18) | (1 << 19)
+    
     def __init__(self):
         """Initialize the GDL-90 deframer"""
         self.frames_processed = 0
@@ -32,6 +124,7 @@ class GDL90Deframer:
         self.adsb_messages_found = 0
         self.deframing_errors = 0
         self.byte_unstuff_operations = 0
+        self._unstuff_buffer = bytearray()  # Reused JIT output buffer, grown to the largest frame
         
     def deframe_message(self, raw_data: bytes) -> List[bytes]:
         """
@@ -45,53 +138,82 @@ class GDL90Deframer:
         """
         if not raw_data:
             return []
+        return list(self.iter_deframe_message(raw_data))
+    
+    def iter_deframe_message(self, raw_data: bytes) -> Iterator[bytes]:
+        """
+        Yield ADS-B messages from GDL-90 wrapped data as each frame is deframed
+        
+        Lets callers parse each message while the rest of the datagram is
+        still being deframed. Statistics are written back when iteration ends.
+        
+        Args:
+            raw_data: Raw UDP data containing GDL-90 frames
             
-        if config.LOG_DEFRAMING_PROCESS:
-            logger.debug(f"[GDL90] Processing {len(raw_data)} bytes: {raw_data.hex()}")
+        Yields:
+            Extracted ADS-B message bytes
+        """
+        if not raw_data:
+            return
+            
+        # Bind per-call lookups once; the frame loop below runs for every frame
+        log_deframe = config.LOG_DEFRAMING_PROCESS
+        unstuff_bytes = self._unstuff_bytes
+        extract_adsb_payload = self._extract_adsb_payload
+        
+        if log_deframe:
+            logger.debug("[GDL90] Processing %d bytes: %s", len(raw_data), _LazyHex(raw_data))
         
-        adsb_messages = []
+        messages_found = 0
+        frames_processed = self.frames_processed
+        failed = False
         
         try:
             # Find all frame boundaries in the data
             frame_boundaries = self._find_frame_boundaries(raw_data)
             
-            if config.LOG_DEFRAMING_PROCESS:
-                logger.info(f"[GDL90] Found {len(frame_boundaries)} frames")
+            if log_deframe:
+                logger.info("[GDL90] Found %d frames", len(frame_boundaries))
             
             # Process each frame
             for start_pos, end_pos in frame_boundaries:
-                self.frames_processed += 1
+                frames_processed += 1
                 
                 # Extract frame content (excluding flags)
                 frame_data = raw_data[start_pos + 1:end_pos]
                 
-                if config.LOG_DEFRAMING_PROCESS:
-                    logger.debug(f"[GDL90] Frame {self.frames_processed}: {frame_data.hex()}")
+                if log_deframe:
+                    logger.debug("[GDL90] Frame %d: %s", frames_processed, _LazyHex(frame_data))
                 
                 # Unstuff bytes (KISS/HDLC protocol)
-                unstuffed_data = self._unstuff_bytes(frame_data)
+                unstuffed_data = unstuff_bytes(frame_data)
                 
                 if not unstuffed_data:
                     continue
                     
                 # Extract ADS-B payload if this is an ADS-B frame
-                adsb_payload = self._extract_adsb_payload(unstuffed_data)
+                adsb_payload = extract_adsb_payload(unstuffed_data)
                 
                 if adsb_payload:
-                    self.adsb_messages_found += 1
-                    adsb_messages.append(adsb_payload)
+                    messages_found += 1
+                    
+                    if log_deframe:
+                        logger.info("[GDL90] Extracted ADS-B payload: %s", _LazyHex(adsb_payload))
                     
-                    if config.LOG_DEFRAMING_PROCESS:
-                        logger.info(f"[GDL90] Extracted ADS-B payload: {adsb_payload.hex()}")
-                        
-            self.frames_extracted += len(adsb_messages)
+                    yield adsb_payload
             
         except Exception as e:
+            failed = True
             self.deframing_errors += 1
-            if config.LOG_DEFRAMING_PROCESS:
-                logger.error(f"[GDL90] Deframing error: {e}")
-        
-        return adsb_messages
+            if log_deframe:
+                logger.error("[GDL90] Deframing error: %s", e)
+        finally:
+            # Counters are written back once per call, including when the caller
+            # stops iterating early; a deframing error leaves frames_extracted alone
+            self.frames_processed = frames_processed
+            self.adsb_messages_found += messages_found
+            if not failed:
+                self.frames_extracted += messages_found
     
     def _find_frame_boundaries(self, data: bytes) -> List[Tuple[int, int]]:
         """
@@ -103,19 +225,29 @@ class GDL90Deframer:
         Returns:
             List of (start_pos, end_pos) tuples for each frame
         """
+        flag = self.FLAG_BYTE
+        
+        # Datagrams packed with frames: locate every flag in one NumPy compare
+        # and pair neighbouring flags, dropping pairs with nothing between them
+        if np is not None and data.count(flag) >= VECTOR_BOUNDARY_MIN_FLAGS:
+            flags = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == flag)
+            starts = flags[:-1]
+            ends = flags[1:]
+            keep = ends > starts + 1  # Must have content between flags
+            return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+        
         boundaries = []
-        start_pos = None
-        
-        for i, byte_val in enumerate(data):
-            if byte_val == self.FLAG_BYTE:
-                if start_pos is None:
-                    # Found frame start
-                    start_pos = i
-                else:
-                    # Found frame end
-                    if i > start_pos + 1:  # Must have content between flags
-                        boundaries.append((start_pos, i))
-                    start_pos = i  # This end flag could be start of next frame
+        find = data.find
+        
+        # bytes.find locates each flag with a C memchr scan instead of a per-byte loop
+        start_pos = find(flag)
+        while start_pos != -1:
+            end_pos = find(flag, start_pos + 1)
+            if end_pos == -1:
+                break
+            if end_pos > start_pos + 1:  # Must have content between flags
+                boundaries.append((start_pos, end_pos))
+            start_pos = end_pos  # This end flag could be start of next frame
         
         return boundaries
     
@@ -136,34 +268,25 @@ class GDL90Deframer:
         if not frame_data:
             return None
             
-        unstuffed = bytearray()
-        i = 0
+        # Most frames carry no escapes at all
+        if self.ESCAPE_BYTE not in frame_data:
+            return bytes(frame_data)
         
-        while i < len(frame_data):
-            if frame_data[i] == self.ESCAPE_BYTE and i + 1 < len(frame_data):
-                # Found escape sequence
-                next_byte = frame_data[i + 1]
-                
-                if next_byte == self.ESCAPE_FLAG:
-                    # 0x7D 0x5E → 0x7E
-                    unstuffed.append(self.FLAG_BYTE)
-                    self.byte_unstuff_operations += 1
-                    i += 2
-                elif next_byte == self.ESCAPE_ESC:
-                    # 0x7D 0x5D → 0x7D
-                    unstuffed.append(self.ESCAPE_BYTE)
-                    self.byte_unstuff_operations += 1
-                    i += 2
-                else:
-                    # Invalid escape sequence, but continue
-                    unstuffed.append(frame_data[i])
-                    i += 1
-            else:
-                # Normal byte
-                unstuffed.append(frame_data[i])
-                i += 1
-        
-        return bytes(unstuffed)
+        if njit is not None and len(frame_data) >= JIT_UNSTUFF_MIN_BYTES:
+            # Unstuffed output is never longer than its input, so one buffer
+            # sized to the largest frame so far serves every call
+            out = self._unstuff_buffer
+            if len(out) < len(frame_data):
+                out = self._unstuff_buffer = bytearray(len(frame_data))
+            written, operations = _unstuff_kernel(bytes(frame_data), out)
+            self.byte_unstuff_operations += operations
+            return bytes(memoryview(out)[:written])
+        
+        # An escape pair never starts with its own second byte, so the two
+        # sequences cannot overlap and can be replaced independently.
+        # Invalid escapes and a trailing 0x7D are left in place.
+        self.byte_unstuff_operations += frame_data.count(_ESCAPED_FLAG) + frame_data.count(_ESCAPED_ESC)
+        return bytes(frame_data).replace(_ESCAPED_FLAG, b'\x7e').replace(_ESCAPED_ESC, b'\x7d')
     
     def _extract_adsb_payload(self, unstuffed_data: bytes) -> Optional[bytes]:
         """
@@ -180,7 +303,8 @@ class GDL90Deframer:
         Returns:
             14-byte ADS-B payload or None if not ADS-B or invalid
         """
-        if len(unstuffed_data) < 2:
+        n = len(unstuffed_data)
+        if n < 2:
             return None
             
         # Check if this is an ADS-B Long Report
@@ -188,54 +312,61 @@ class GDL90Deframer:
         
         if msg_id != self.MSG_ADSB_LONG:
             if config.LOG_DEFRAMING_PROCESS:
-                logger.warning(f"[GDL90] Skipping non-ADS-B message type: 0x{msg_id:02X}")
+                logger.warning("[GDL90] Skipping non-ADS-B message type: 0x%02X", msg_id)
             return None
         
-        # Extract ADS-B payload (skip 2-byte header, use remaining data)
-        if len(unstuffed_data) < 2 + self.MIN_ADSB_PAYLOAD_LENGTH:
+        # Common case: 2-byte header plus a 14-byte (112-bit) Mode S payload,
+        # which always satisfies the length bounds below
+        if n == 16:
+            if (self._VALID_DF_MASK >> ((unstuffed_data[2] >> 3) & 0x1F)) & 1:
+                return unstuffed_data[2:]
             if config.LOG_DEFRAMING_PROCESS:
-                logger.warning(f"[GDL90] ADS-B frame too short: {len(unstuffed_data)} bytes")
+                logger.error("[GDL90] Invalid ADS-B payload: %s", _LazyHex(unstuffed_data[2:]))
             return None
         
-        # Use all remaining data after header as payload
-        adsb_payload = unstuffed_data[2:]
-        
-        # Validate payload length is reasonable
-        if len(adsb_payload) > self.MAX_ADSB_PAYLOAD_LENGTH:
+        # Extract ADS-B payload (skip 2-byte header, use remaining data)
+        if n < 2 + self.MIN_ADSB_PAYLOAD_LENGTH:
             if config.LOG_DEFRAMING_PROCESS:
-                logger.warning(f"[GDL90] ADS-B payload too long: {len(adsb_payload)} bytes")
+                logger.warning("[GDL90] ADS-B frame too short: %d bytes", n)
             return None
         
-        # Validate payload
-        if self._validate_adsb_message(adsb_payload):
-            return adsb_payload
-        else:
+        # Validate payload length is reasonable before slicing it out
+        if n - 2 > self.MAX_ADSB_PAYLOAD_LENGTH:
             if config.LOG_DEFRAMING_PROCESS:
-                logger.error(f"[GDL90] Invalid ADS-B payload: {adsb_payload.hex()}")
+                logger.warning("[GDL90] ADS-B payload too long: %d bytes", n - 2)
             return None
+        
+        # Validate the payload's DF inline; its length was checked above, so
+        # _validate_adsb_message would only repeat that work
+        if (self._VALID_DF_MASK >> ((unstuffed_data[2] >> 3) & 0x1F)) & 1:
+            # Use all remaining data after header as payload
+            return unstuffed_data[2:]
+        
+        if config.LOG_DEFRAMING_PROCESS:
+            logger.error("[GDL90] Invalid ADS-B payload: %s", _LazyHex(unstuffed_data[2:]))
+        return None
     
     def _validate_adsb_message(self, payload: bytes) -> bool:
         """
         Basic validation of ADS-B message payload
         
+        Frame extraction applies the same checks inline; this is kept for
+        callers validating payloads obtained elsewhere.
+        
         Args:
             payload: 14-byte ADS-B message
             
         Returns:
             True if payload appears valid
         """
-        if len(payload) < self.MIN_ADSB_PAYLOAD_LENGTH or len(payload) > self.MAX_ADSB_PAYLOAD_LENGTH:
+        if not self.MIN_ADSB_PAYLOAD_LENGTH <= len(payload) <= self.MAX_ADSB_PAYLOAD_LENGTH:
             return False
             
         # Check if first byte looks like a valid DF
         # ADS-B should have DF=17 (10001xxx) or similar
-        first_byte = payload[0]
-        df = (first_byte >> 3) & 0x1F  # Extract DF from first 5 bits
-        
-        # Valid ADS-B downlink formats
-        valid_dfs = [17, 18, 19]  # DF 17=ADS-B, 18=TIS-B, 19=Military
+        df = (payload[0] >> 3) & 0x1F  # Extract DF from first 5 bits
         
-        return df in valid_dfs
+        return (self._VALID_DF_MASK >> df) & 1 == 1
     
     def is_gdl90_frame(self, data: bytes) -> bool:
         """
@@ -3,23 +3,74 @@ Interactive Debugger for UDP Replay System
 Provides interactive debugging capabilities during replay
 """
 
+import os
 import sys
-import select
+import selectors
 import termios
 import tty
 import threading
 import time
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from datetime import datetime
 
 from logger import logger
 from udp_replayer import UDPReplayer
 from message_inspector import MessageInspector
 
+# Terminal control sequences
+_CLEAR_SCREEN = "\033[2J"
+_CURSOR_HOME = "\033[H"
+_ERASE_LINE = "\033[K"    # Cursor to end of line
+_ERASE_BELOW = "\033[J"   # Cursor to end of screen
+
+# Fixed rows shared by every display frame
+_RULE = "=" * 80
+_SEPARATOR = "-" * 80
+_HEADER_ROWS = (_RULE, "UDP REPLAY INTERACTIVE DEBUGGER", _RULE)
+_FOOTER_ROWS = (
+    _SEPARATOR,
+    "Commands: [SPACE] Pause/Resume | [s] Step | [i] Inspect | [h] Hex | [q] Quit | [?] Help",
+)
+
+_WELCOME_SCREEN = _CLEAR_SCREEN + _CURSOR_HOME + "\n".join([
+    _RULE,
+    "UDP REPLAY INTERACTIVE DEBUGGER",
+    _RULE,
+    "",
+    "Welcome to the interactive debugging mode!",
+    "Use the following keys to control the replay:",
+    "",
+    "  [SPACE]  Pause/Resume replay",
+    "  [s]      Step through messages one by one",
+    "  [i]      Inspect current message in detail",
+    "  [h]      Toggle hex dump display",
+    "  [f]      Show filter information",
+    "  [b]      Show breakpoint information",
+    "  [j]      Jump to specific message number",
+    "  [r]      Restart from beginning",
+    "  [c]      Clear screen",
+    "  [S]      Save statistics",
+    "  [q]      Quit interactive mode",
+    "  [?]      Show this help",
+    "",
+    "Press any key to start...",
+    _RULE,
+]) + "\n"
+
 
 class InteractiveDebugger:
     """Interactive debugging interface for UDP replay"""
     
+    # State read on every key and frame lives in fixed slots; '__dict__' is
+    # kept (and only allocated on first use) so handlers can still be patched
+    __slots__ = ('replayer', 'inspector', 'original_settings', 'raw_mode', 'running', 'event_thread',
+                 'last_display_update', 'display_interval', '_screen_lines', '_screen_stale', '_redraw_now',
+                 '_wake_r', '_wake_w', '_stdout_fd', '_stdout_encoding', 'show_hex_dump',
+                 'show_statistics', 'show_filters', 'show_breakpoints', 'hex_dump_lines', '_hex_cache',
+                 '_filter_rows', '_bp_rows',
+                 'command_history', 'last_inspection', 'key_bindings', '_key_lut',
+                 'status_message', 'status_timestamp', '__dict__')
+    
     def __init__(self, replayer: UDPReplayer):
         """
         Initialize interactive debugger
@@ -36,10 +87,16 @@ class InteractiveDebugger:
         
         # Control state
         self.running = False
-        self.input_thread: Optional[threading.Thread] = None
-        self.display_thread: Optional[threading.Thread] = None
+        self.event_thread: Optional[threading.Thread] = None  # Serves both key presses and redraws
         self.last_display_update = 0
         self.display_interval = 1.0  # seconds
+        self._screen_lines: Optional[List[str]] = None  # Lines currently on screen; None forces a full redraw
+        self._screen_stale = False  # Set when other code wrote to the terminal
+        self._redraw_now = False  # Set by key handlers to redraw before the interval elapses
+        self._wake_r: Optional[int] = None  # Self-pipe that unblocks the event loop on stop
+        self._wake_w: Optional[int] = None
+        self._stdout_fd: Optional[int] = None  # Raw terminal fd frames are written to, when available
+        self._stdout_encoding = 'utf-8'
         
         # Display settings
         self.show_hex_dump = False
@@ -47,6 +104,11 @@ class InteractiveDebugger:
         self.show_filters = True
         self.show_breakpoints = True
         self.hex_dump_lines = 10
+        # (message data, hex_dump_lines, rows) of the last formatted hex dump
+        self._hex_cache: Tuple[Optional[bytes], int, List[str]] = (None, 0, [])
+        # (version, rows) of the filter and breakpoint lists as last formatted
+        self._filter_rows: Tuple[int, List[str]] = (-1, [])
+        self._bp_rows: Tuple[int, List[str]] = (-1, [])
         
         # Command history
         self.command_history = []
@@ -70,6 +132,11 @@ class InteractiveDebugger:
             '\x1b': self._handle_escape,  # Escape key
         }
         
+        # Handlers indexed by key code; every binding is a single 8-bit character
+        self._key_lut: List[Optional[Callable[[], None]]] = [None] * 256
+        for key, handler in self.key_bindings.items():
+            self._key_lut[ord(key)] = handler
+        
         # Status messages
         self.status_message = ""
         self.status_timestamp = 0
@@ -84,14 +151,14 @@ class InteractiveDebugger:
             self._setup_terminal()
             
             self.running = True
+            self._redraw_now = False
+            if sys.platform != 'win32':
+                self._wake_r, self._wake_w = os.pipe()
+                self._open_stdout_fd()
             
-            # Start input handling thread
-            self.input_thread = threading.Thread(target=self._input_loop, daemon=True)
-            self.input_thread.start()
-            
-            # Start display update thread
-            self.display_thread = threading.Thread(target=self._display_loop, daemon=True)
-            self.display_thread.start()
+            # One thread waits on the terminal and the refresh deadline together
+            self.event_thread = threading.Thread(target=self._event_loop, daemon=True)
+            self.event_thread.start()
             
             logger.info("Interactive debugger started")
             self._show_welcome()
@@ -107,12 +174,20 @@ class InteractiveDebugger:
         
         self.running = False
         
-        # Wait for threads to finish
-        if self.input_thread and self.input_thread.is_alive():
-            self.input_thread.join(timeout=1.0)
+        # Wake the event loop out of its blocking wait
+        if self._wake_w is not None:
+            os.write(self._wake_w, b'\0')
+        
+        # Wait for the loop to finish (the quit key stops us from inside it)
+        thread = self.event_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
         
-        if self.display_thread and self.display_thread.is_alive():
-            self.display_thread.join(timeout=1.0)
+        if self._wake_w is not None:
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
+        self._stdout_fd = None
         
         # Restore terminal
         self._restore_terminal()
@@ -141,46 +216,95 @@ class InteractiveDebugger:
         
         self.raw_mode = False
     
-    def _input_loop(self) -> None:
-        """Input handling loop"""
-        try:
-            while self.running:
-                if sys.platform == 'win32':
-                    # Windows input handling
-                    import msvcrt
-                    if msvcrt.kbhit():
-                        key = msvcrt.getch().decode('utf-8', errors='ignore')
-                        self._handle_key(key)
-                    time.sleep(0.1)
-                else:
-                    # Unix input handling
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        key = sys.stdin.read(1)
-                        self._handle_key(key)
+    def _event_loop(self) -> None:
+        """
+        Serve key presses and display refreshes from a single loop
         
-        except Exception as e:
-            logger.error(f"Error in input loop: {e}")
-    
-    def _display_loop(self) -> None:
-        """Display update loop"""
+        On Unix the loop blocks in a selector on the terminal and the wake
+        pipe, with a timeout of whatever is left until the next refresh.
+        Windows console input cannot be selected, so it is polled instead.
+        """
+        selector = None
         try:
+            if sys.platform == 'win32':
+                import msvcrt
+            else:
+                selector = selectors.DefaultSelector()
+                selector.register(sys.stdin.fileno(), selectors.EVENT_READ)
+                selector.register(self._wake_r, selectors.EVENT_READ)
+            
+            next_refresh = time.monotonic() + self.display_interval
             while self.running:
-                current_time = time.time()
+                timeout = max(0.0, next_refresh - time.monotonic())
+                if selector is None:
+                    time.sleep(min(timeout, 0.1))
+                    while msvcrt.kbhit():
+                        self._handle_key(msvcrt.getch().decode('utf-8', errors='ignore'))
+                else:
+                    for key, _ in selector.select(timeout):
+                        if key.fd == self._wake_r:
+                            return
+                        # One read picks up every key already queued (paste, key repeat)
+                        data = os.read(key.fd, 16)
+                        if data:
+                            self._handle_input(data)
+                        else:
+                            # Terminal closed; keep refreshing the display
+                            selector.unregister(key.fd)
                 
-                if current_time - self.last_display_update >= self.display_interval:
-                    self._update_display()
-                    self.last_display_update = current_time
+                if not self.running:
+                    break
                 
-                time.sleep(0.1)
+                if self._redraw_now or time.monotonic() >= next_refresh:
+                    self._redraw_now = False
+                    self._update_display()
+                    self.last_display_update = time.time()
+                    next_refresh = time.monotonic() + self.display_interval
         
         except Exception as e:
-            logger.error(f"Error in display loop: {e}")
+            logger.error(f"Error in event loop: {e}")
+        
+        finally:
+            if selector is not None:
+                selector.close()
+    
+    def _handle_input(self, data: bytes) -> None:
+        """
+        Dispatch a batch of raw key bytes read from the terminal
+        
+        Cursor and function keys arrive as escape sequences (ESC [ ... or
+        ESC O x); a complete sequence in the batch is dropped as a whole
+        rather than dispatched as ESC followed by stray unknown keys.
+        
+        Args:
+            data: Bytes returned by one read of the terminal
+        """
+        i = 0
+        n = len(data)
+        while i < n:
+            code = data[i]
+            if code == 0x1B and i + 2 < n and data[i + 1] in b'[O':
+                # Skip the parameter bytes up to the final byte (0x40-0x7E)
+                end = i + 2
+                if data[i + 1] == 0x5B:
+                    while end < n and not 0x40 <= data[end] <= 0x7E:
+                        end += 1
+                if end < n:
+                    i = end + 1
+                    continue
+            self._handle_key(chr(code))
+            i += 1
     
     def _handle_key(self, key: str) -> None:
         """Handle keyboard input"""
+        # Show the key's effect now rather than at the next refresh; handlers
+        # that draw a screen of their own (help) cancel this to keep it visible
+        self._redraw_now = True
         try:
-            if key in self.key_bindings:
-                self.key_bindings[key]()
+            code = ord(key) if len(key) == 1 else -1
+            handler = self._key_lut[code] if 0 <= code < 256 else None
+            if handler is not None:
+                handler()
             else:
                 # Unknown key
                 self._set_status(f"Unknown key: {repr(key)} - Press '?' for help")
@@ -192,13 +316,8 @@ class InteractiveDebugger:
     def _update_display(self) -> None:
         """Update the interactive display"""
         try:
-            # Clear screen
-            print("\033[2J\033[H", end='')
-            
-            # Header
-            print("=" * 80)
-            print("UDP REPLAY INTERACTIVE DEBUGGER")
-            print("=" * 80)
+            # The frame is assembled first and written once, not line by line
+            lines = list(_HEADER_ROWS)
             
             # Current status
             stats = self.replayer.get_replay_stats()
@@ -206,96 +325,193 @@ class InteractiveDebugger:
             if self.replayer.is_paused:
                 status += " (PAUSED)"
             
-            print(f"Status: {status} | Message: {stats['current_message_number']}/{stats['total_messages_in_file']} "
-                  f"({stats['progress_percentage']:.1f}%) | Speed: {self.replayer.speed_multiplier}x")
+            lines.append(f"Status: {status} | Message: {stats['current_message_number']}/{stats['total_messages_in_file']} "
+                         f"({stats['progress_percentage']:.1f}%) | Speed: {self.replayer.speed_multiplier}x")
             
             # Current message info
             msg_info = self.replayer.get_current_message_info()
             if msg_info:
-                print(f"Current: {msg_info['message_size']} bytes | Protocol: {msg_info['protocol_detected']}")
-                print(f"Preview: {msg_info['ascii_preview'][:60]}...")
+                lines.append(f"Current: {msg_info['message_size']} bytes | Protocol: {msg_info['protocol_detected']}")
+                lines.append(f"Preview: {msg_info['ascii_preview'][:60]}...")
             
-            print("-" * 80)
+            lines.append(_SEPARATOR)
             
             # Statistics
             if self.show_statistics:
-                print("STATISTICS:")
-                print(f"  Messages Sent: {stats['messages_sent']} | Filtered: {stats['messages_filtered']} | "
-                      f"Errors: {stats['network_errors']}")
-                print(f"  Bytes Sent: {stats['bytes_sent']} | Rate: {stats['messages_per_second']:.1f} msg/s")
-                print(f"  Breakpoints Hit: {stats['breakpoints_hit']} | Loops: {stats['replay_loops']}")
-                print()
+                lines.append("STATISTICS:")
+                lines.append(f"  Messages Sent: {stats['messages_sent']} | Filtered: {stats['messages_filtered']} | "
+                             f"Errors: {stats['network_errors']}")
+                lines.append(f"  Bytes Sent: {stats['bytes_sent']} | Rate: {stats['messages_per_second']:.1f} msg/s")
+                lines.append(f"  Breakpoints Hit: {stats['breakpoints_hit']} | Loops: {stats['replay_loops']}")
+                lines.append("")
             
             # Filter information
             if self.show_filters:
                 filter_stats = stats['filter_stats']
                 if filter_stats['active_filter_count'] > 0:
-                    print("ACTIVE FILTERS:")
-                    for filter_info in filter_stats['active_filters']:
-                        print(f"  - {filter_info['name']} ({filter_info['type']})")
-                    print(f"  Pass Rate: {filter_stats['pass_rate']:.1f}%")
-                    print()
+                    lines.append("ACTIVE FILTERS:")
+                    lines.extend(self._filter_list_rows(filter_stats['active_filters']))
+                    lines.append(f"  Pass Rate: {filter_stats['pass_rate']:.1f}%")
+                    lines.append("")
             
             # Breakpoint information
             if self.show_breakpoints:
                 bp_stats = stats['breakpoint_stats']
                 if bp_stats['enabled_breakpoints'] > 0:
-                    print("BREAKPOINTS:")
-                    for bp in self.replayer.breakpoint_manager.get_breakpoint_list():
-                        status_icon = "✓" if bp['enabled'] else "✗"
-                        print(f"  {status_icon} [{bp['id']}] {bp['name']} ({bp['type']})")
-                    print()
+                    lines.append("BREAKPOINTS:")
+                    lines.extend(self._breakpoint_list_rows())
+                    lines.append("")
             
             # Hex dump
-            if self.show_hex_dump and self.replayer.current_message_data:
-                print("HEX DUMP:")
-                hex_dump = self.inspector.hex_dump(
-                    self.replayer.current_message_data[:self.hex_dump_lines * 16],
-                    bytes_per_line=16
-                )
-                print(hex_dump)
-                print()
+            data = self.replayer.current_message_data
+            if self.show_hex_dump and data:
+                lines.append("HEX DUMP:")
+                lines.extend(self._hex_dump_rows(data))
+                lines.append("")
             
             # Status message
             if self.status_message and time.time() - self.status_timestamp < 5.0:
-                print(f"Status: {self.status_message}")
+                lines.append(f"Status: {self.status_message}")
             
             # Command help
-            print("-" * 80)
-            print("Commands: [SPACE] Pause/Resume | [s] Step | [i] Inspect | [h] Hex | [q] Quit | [?] Help")
+            lines.extend(_FOOTER_ROWS)
             
-            # Force output
-            sys.stdout.flush()
+            # Emit only the rows that changed since the last frame, in one write
+            update = self._diff_screen(lines)
+            if update:
+                self._write(update)
         
         except Exception as e:
             logger.error(f"Error updating display: {e}")
     
+    def _filter_list_rows(self, active_filters: List[Dict[str, Any]]) -> List[str]:
+        """
+        Get the display rows listing the active filters
+        
+        Args:
+            active_filters: Filter descriptions from the filter stats
+            
+        Returns:
+            One row per filter, reformatted only after the filters change
+        """
+        version = self.replayer.message_filter.version
+        if self._filter_rows[0] != version:
+            rows = [f"  - {filter_info['name']} ({filter_info['type']})" for filter_info in active_filters]
+            self._filter_rows = (version, rows)
+        return self._filter_rows[1]
+    
+    def _breakpoint_list_rows(self) -> List[str]:
+        """
+        Get the display rows listing every breakpoint
+        
+        Returns:
+            One row per breakpoint, reformatted only after a breakpoint is
+            added, removed, enabled or disabled
+        """
+        manager = self.replayer.breakpoint_manager
+        if self._bp_rows[0] != manager.version:
+            rows = []
+            for bp in manager.get_breakpoint_list():
+                status_icon = "✓" if bp['enabled'] else "✗"
+                rows.append(f"  {status_icon} [{bp['id']}] {bp['name']} ({bp['type']})")
+            self._bp_rows = (manager.version, rows)
+        return self._bp_rows[1]
+    
+    def _hex_dump_rows(self, data: bytes) -> List[str]:
+        """
+        Get the hex dump rows for a message, reusing the last formatting
+        
+        The display redraws every second while a message stays current
+        (paused, stepping or slow replay), so the dump is only reformatted
+        when the message object or the number of rows shown changes.
+        
+        Args:
+            data: Current message data
+            
+        Returns:
+            Hex dump rows
+        """
+        cached_data, cached_lines, rows = self._hex_cache
+        if cached_data is not data or cached_lines != self.hex_dump_lines:
+            rows = self.inspector.hex_dump(data[:self.hex_dump_lines * 16], bytes_per_line=16).split("\n")
+            self._hex_cache = (data, self.hex_dump_lines, rows)
+        return rows
+    
+    def _diff_screen(self, lines: List[str]) -> str:
+        """
+        Build the terminal update that turns the current screen into lines
+        
+        Each changed row is rewritten in place with a cursor move and an
+        erase-to-end-of-line, so steady-state frames (where usually only the
+        counters move) cost a few short writes instead of a full redraw.
+        
+        Args:
+            lines: Display rows of the new frame, top to bottom
+            
+        Returns:
+            ANSI update string, or "" when nothing changed
+        """
+        previous = self._screen_lines
+        if self._screen_stale:
+            # Other output may have scrolled the screen, so no row is where it was drawn
+            self._screen_stale = False
+            previous = None
+        if previous is None:
+            update = [_CLEAR_SCREEN]  # First frame or screen was overwritten
+            previous = []
+        else:
+            update = []
+        
+        for row, line in enumerate(lines, 1):
+            if row > len(previous) or previous[row - 1] != line:
+                update.append(f"\033[{row};1H{line}{_ERASE_LINE}")
+        if len(lines) < len(previous):
+            update.append(f"\033[{len(lines) + 1};1H{_ERASE_BELOW}")  # Erase rows the frame no longer uses
+        
+        self._screen_lines = lines
+        if not update:
+            return ""
+        
+        # Leave the cursor below the frame
+        update.append(f"\033[{len(lines) + 1};1H")
+        return "".join(update)
+    
+    def invalidate_screen(self) -> None:
+        """
+        Repaint the whole display on the next refresh
+        
+        Call after writing to the terminal outside the debugger (e.g. from
+        replay callbacks); rows are otherwise only redrawn when they change.
+        """
+        self._screen_stale = True
+    
     def _show_welcome(self) -> None:
         """Show welcome message"""
-        print("\033[2J\033[H", end='')  # Clear screen
-        print("=" * 80)
-        print("UDP REPLAY INTERACTIVE DEBUGGER")
-        print("=" * 80)
-        print()
-        print("Welcome to the interactive debugging mode!")
-        print("Use the following keys to control the replay:")
-        print()
-        print("  [SPACE]  Pause/Resume replay")
-        print("  [s]      Step through messages one by one")
-        print("  [i]      Inspect current message in detail")
-        print("  [h]      Toggle hex dump display")
-        print("  [f]      Show filter information")
-        print("  [b]      Show breakpoint information")
-        print("  [j]      Jump to specific message number")
-        print("  [r]      Restart from beginning")
-        print("  [c]      Clear screen")
-        print("  [S]      Save statistics")
-        print("  [q]      Quit interactive mode")
-        print("  [?]      Show this help")
-        print()
-        print("Press any key to start...")
-        print("=" * 80)
+        self._screen_lines = None  # Next display update redraws everything
+        self._redraw_now = False  # Leave it up until the next refresh or key press
+        self._write(_WELCOME_SCREEN)
+    
+    def _open_stdout_fd(self) -> None:
+        """Look up the terminal fd so frames can bypass the text layer"""
+        try:
+            self._stdout_fd = sys.stdout.fileno()
+            self._stdout_encoding = sys.stdout.encoding or 'utf-8'
+        except (AttributeError, OSError, ValueError):
+            # Redirected to something without a real fd; keep sys.stdout
+            self._stdout_fd = None
+    
+    def _write(self, text: str) -> None:
+        """Write a complete screen update to the terminal in one call"""
+        if self._stdout_fd is None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        
+        # Anything still buffered in sys.stdout must land before the frame
         sys.stdout.flush()
+        frame = memoryview(text.encode(self._stdout_encoding, errors='replace'))
+        while frame:
+            frame = frame[os.write(self._stdout_fd, frame):]
     
     def _set_status(self, message: str) -> None:
         """Set status message"""
@@ -375,7 +591,8 @@ class InteractiveDebugger:
     
     def _handle_clear_screen(self) -> None:
         """Handle clear screen command"""
-        print("\033[2J\033[H", end='')
+        self._screen_lines = None
+        self._write(_CLEAR_SCREEN + _CURSOR_HOME)
         self._set_status("Screen cleared")
     
     def _handle_statistics(self) -> None:
@@ -398,26 +615,30 @@ class InteractiveDebugger:
 class SimpleDebugger:
     """Simplified debugger for systems without terminal control"""
     
+    __slots__ = ('replayer', 'running')
+    
     def __init__(self, replayer: UDPReplayer):
         self.replayer = replayer
         self.running = False
     
     def start_simple_mode(self) -> None:
         """Start simple debugging mode with basic controls"""
-        print("=" * 60)
-        print("UDP REPLAY SIMPLE DEBUGGER")
-        print("=" * 60)
-        print()
-        print("Simple debugging mode (no terminal control)")
-        print()
-        print("Available commands:")
-        print("  pause    - Pause the replay")
-        print("  resume   - Resume the replay")
-        print("  step     - Enable step mode")
-        print("  inspect  - Inspect current message")
-        print("  stats    - Show statistics")
-        print("  quit     - Stop replay and exit")
-        print()
+        print("\n".join([
+            "=" * 60,
+            "UDP REPLAY SIMPLE DEBUGGER",
+            "=" * 60,
+            "",
+            "Simple debugging mode (no terminal control)",
+            "",
+            "Available commands:",
+            "  pause    - Pause the replay",
+            "  resume   - Resume the replay",
+            "  step     - Enable step mode",
+            "  inspect  - Inspect current message",
+            "  stats    - Show statistics",
+            "  quit     - Stop replay and exit",
+            "",
+        ]))
         
         self.running = True
         
@@ -471,24 +692,28 @@ class SimpleDebugger:
         """Show current statistics"""
         stats = self.replayer.get_replay_stats()
         
-        print("\n" + "=" * 40)
-        print("REPLAY STATISTICS")
-        print("=" * 40)
-        print(f"Messages: {stats['messages_sent']}/{stats['total_messages_in_file']}")
-        print(f"Progress: {stats['progress_percentage']:.1f}%")
-        print(f"Filtered: {stats['messages_filtered']}")
-        print(f"Errors: {stats['network_errors']}")
-        print(f"Rate: {stats['messages_per_second']:.1f} msg/s")
-        print("=" * 40 + "\n")
+        print("\n".join([
+            "\n" + "=" * 40,
+            "REPLAY STATISTICS",
+            "=" * 40,
+            f"Messages: {stats['messages_sent']}/{stats['total_messages_in_file']}",
+            f"Progress: {stats['progress_percentage']:.1f}%",
+            f"Filtered: {stats['messages_filtered']}",
+            f"Errors: {stats['network_errors']}",
+            f"Rate: {stats['messages_per_second']:.1f} msg/s",
+            "=" * 40 + "\n",
+        ]))
     
     def _show_help(self) -> None:
         """Show help"""
-        print("\nAvailable commands:")
-        print("  pause    - Pause the replay")
-        print("  resume   - Resume the replay") 
-        print("  step     - Enable step mode")
-        print("  inspect  - Inspect current message")
-        print("  stats    - Show statistics")
-        print("  help     - Show this help")
-        print("  quit     - Stop replay and exit")
-        print()
\ No newline at end of file
+        print("\n".join([
+            "\nAvailable commands:",
+            "  pause    - Pause the replay",
+            "  resume   - Resume the replay",
+            "  step     - Enable step mode",
+            "  inspect  - Inspect current message",
+            "  stats    - Show statistics",
+            "  help     - Show this help",
+            "  quit     - Stop replay and exit",
+            "",
+        ]))
\ No newline at end of file
@@ -11,7 +11,12 @@ import config
 
 
 class NavigationLogger:
-    """Centralized logger for navigation system"""
+    """
+    Centralized logger for navigation system
+    
+    Level methods accept %-style arguments like logging.Logger, so the
+    message is only formatted when a record is actually emitted.
+    """
     
     _instance: Optional['NavigationLogger'] = None
     _logger: Optional[logging.Logger] = None
@@ -111,30 +116,38 @@ class NavigationLogger:
         self._logger.info(f"Log file: {os.path.abspath(log_file)}")
         self._logger.info("=" * 60)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log debug message"""
         if config.ENABLE_LOGGING and self._logger:
-            self._logger.debug(message)
+            self._logger.debug(message, *args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log info message"""
         if config.ENABLE_LOGGING and self._logger:
-            self._logger.info(message)
+            self._logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
         if self._logger:
-            self._logger.warning(message)
+            self._logger.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
         if self._logger:
-            self._logger.error(message)
+            self._logger.error(message, *args)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """Log critical message"""
         if self._logger:
-            self._logger.critical(message)
+            self._logger.critical(message, *args)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a message at this level would be written"""
+        if not self._logger:
+            return False
+        if level < logging.WARNING and not config.ENABLE_LOGGING:
+            return False
+        return self._logger.isEnabledFor(level)
     
     def udp_traffic(self, message: str):
         """Log UDP traffic if enabled"""
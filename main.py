@@ -160,11 +160,16 @@ class NavigationListener:
         logger.main_process("Creating UDP listener...")
         self.udp_listener = UDPListener(self._handle_udp_data)
         
+        # ADS-B messages are queued by the receive thread and parsed in batches
+        if config.PROTOCOL_MODE in ('adsb', 'auto'):
+            self.adsb_parser.start_feed(self._log_adsb_result)
+        
         # Start UDP listener
         logger.main_process("Starting UDP listener...")
         if not self.udp_listener.start():
             logger.error("Failed to start UDP listener")
             console_print("Failed to start UDP listener", force=True)
+            self.adsb_parser.stop_feed()
             return False
         
         logger.main_process("UDP listener started successfully")
@@ -202,6 +207,7 @@ class NavigationListener:
         
         if self.udp_listener:
             self.udp_listener.stop()
+            self.adsb_parser.stop_feed()
         
         if self.serial_listener:
             self.serial_listener.stop()
@@ -346,25 +352,41 @@ class NavigationListener:
         """Handle ADS-B data"""
         logger.udp_traffic(f"Received ADS-B data callback with {len(data)} bytes")
         
-        # Parse ADS-B message
         parse_start_time = time.time()
+        if self.adsb_parser.feed_running:
+            # Parsed on the feed thread, which reports back via _log_adsb_result
+            self.adsb_parser.feed(data, parse_start_time)
+            return
+        
+        # Parse ADS-B message
         parsed_data = self.adsb_parser.parse_message(data)
         
         if parsed_data:
-            logger.info(f"Successfully parsed ADS-B data: {parsed_data}")
-            # Log to JSON events if enabled
-            json_event_logger.log_adsb_event(parsed_data)
-            # Log to comprehensive JSON if enabled
-            comprehensive_json_logger.log_decoded_message(
-                data=parsed_data,
-                source="ADS-B",
-                parser_name="ADSBParser",
-                raw_data=data,
-                parsing_start_time=parse_start_time
-            )
+            self._log_adsb_result(data, parsed_data, parse_start_time)
         else:
             logger.debug("No data extracted from ADS-B message")
     
+    def _log_adsb_result(self, data: bytes, parsed_data: dict, parse_start_time: float):
+        """
+        Log a parsed ADS-B message
+        
+        Args:
+            data: Raw message bytes
+            parsed_data: Parsed aviation data
+            parse_start_time: Time the message was received
+        """
+        logger.info(f"Successfully parsed ADS-B data: {parsed_data}")
+        # Log to JSON events if enabled
+        json_event_logger.log_adsb_event(parsed_data)
+        # Log to comprehensive JSON if enabled
+        comprehensive_json_logger.log_decoded_message(
+            data=parsed_data,
+            source="ADS-B",
+            parser_name="ADSBParser",
+            raw_data=data,
+            parsing_start_time=parse_start_time
+        )
+    
     def _display_loop(self):
         """Display update loop (runs in separate thread)"""
         while self.running:
@@ -3,6 +3,7 @@ Message Filter for UDP Replay System
 Provides filtering capabilities for binary messages
 """
 
+import math
 import re
 from typing import List, Callable, Dict, Any, Optional, Tuple
 from logger import logger
@@ -21,8 +22,9 @@ class MessageFilter:
             'filter_reasons': {}
         }
         self.active_filters = []
+        self.version = 0  # Bumped whenever filters are added or cleared
     
-    def add_size_filter(self, min_size: int = 0, max_size: int = float('inf'), name: str = None) -> None:
+    def add_size_filter(self, min_size: int = 0, max_size: int = math.inf, name: str = None) -> None:
         """
         Add size-based filter
         
@@ -46,6 +48,7 @@ class MessageFilter:
             'min_size': min_size,
             'max_size': max_size
         })
+        self.version += 1
         
         logger.info(f"Added size filter: {min_size} <= size <= {max_size}")
     
@@ -84,6 +87,7 @@ class MessageFilter:
             'pattern': pattern.hex(),
             'match_type': match_type
         })
+        self.version += 1
         
         logger.info(f"Added pattern filter: {pattern.hex()} ({match_type})")
     
@@ -128,6 +132,7 @@ class MessageFilter:
             'name': filter_name,
             'protocol': protocol
         })
+        self.version += 1
         
         logger.info(f"Added protocol filter: {protocol}")
     
@@ -155,6 +160,7 @@ class MessageFilter:
             'name': filter_name,
             'skip_corrupted': skip_corrupted
         })
+        self.version += 1
         
         logger.info(f"Added corruption filter: skip_corrupted={skip_corrupted}")
     
@@ -183,6 +189,7 @@ class MessageFilter:
             'name': name,
             'description': description
         })
+        self.version += 1
         
         logger.info(f"Added custom filter: {name} - {description}")
     
@@ -219,6 +226,7 @@ class MessageFilter:
             'start_msg': start_msg,
             'end_msg': end_msg
         })
+        self.version += 1
         
         logger.info(f"Added message number filter: {start_msg} to {end_msg or 'end'}")
     
@@ -263,6 +271,7 @@ class MessageFilter:
         """Clear all active filters"""
         self.filters.clear()
         self.active_filters.clear()
+        self.version += 1
         logger.info("All filters cleared")
     
     def get_filter_stats(self) -> Dict[str, Any]:
@@ -371,7 +380,7 @@ def create_filter_from_config() -> MessageFilter:
     
     # Add size filter if configured
     if hasattr(config, 'REPLAY_FILTER_MIN_SIZE') and hasattr(config, 'REPLAY_FILTER_MAX_SIZE'):
-        if config.REPLAY_FILTER_MIN_SIZE > 0 or config.REPLAY_FILTER_MAX_SIZE < float('inf'):
+        if config.REPLAY_FILTER_MIN_SIZE > 0 or config.REPLAY_FILTER_MAX_SIZE < math.inf:
             filter_obj.add_size_filter(
                 min_size=config.REPLAY_FILTER_MIN_SIZE,
                 max_size=config.REPLAY_FILTER_MAX_SIZE,
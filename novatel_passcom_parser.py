@@ -33,6 +33,7 @@ class NovAtelPasscomParser:
     FRAME_START_MARKER = b'\x7e\x26'  # ~& start-of-record
     
     # Wrapper patterns
+    WRAPPER_PREFIX = b'Received packet from '
     WRAPPER_PATTERN = re.compile(rb'Received packet from [^:]+:\d+: ')
     
     def __init__(self):
@@ -344,8 +345,9 @@ class NovAtelPasscomParser:
         if self.FRAME_START_MARKER in data:
             return True
         
-        # Check for wrapper pattern
-        if self.WRAPPER_PATTERN.search(data):
+        # Check for wrapper pattern; the literal prefix scan keeps the regex
+        # off raw Mode S payloads, which never contain it
+        if self.WRAPPER_PREFIX in data and self.WRAPPER_PATTERN.search(data):
             return True
         
         return False
@@ -164,14 +164,20 @@ class ReplayController:
     
     def _setup_callbacks(self, args) -> None:
         """Setup event callbacks"""
+        def show(message: str):
+            console_print(message, force=True)
+            if self.debugger:
+                # The printed line lands in (and may scroll) the interactive display
+                self.debugger.invalidate_screen()
+        
         if args.verbose:
             def on_message_sent(data: bytes, msg_num: int):
-                console_print(f"Sent message {msg_num}: {len(data)} bytes", force=True)
+                show(f"Sent message {msg_num}: {len(data)} bytes")
             
             self.replayer.set_message_sent_callback(on_message_sent)
         
         def on_breakpoint_hit(hit_info):
-            console_print(f"\nBreakpoint hit: {hit_info['name']} at message {hit_info['message_number']}", force=True)
+            show(f"\nBreakpoint hit: {hit_info['name']} at message {hit_info['message_number']}")
             if args.inspect_on_breakpoint:
                 inspection = self.replayer.inspect_current_message()
                 if inspection:
@@ -181,7 +187,7 @@ class ReplayController:
         self.replayer.set_breakpoint_hit_callback(on_breakpoint_hit)
         
         def on_error(error_type: str, exception: Exception):
-            console_print(f"Error ({error_type}): {exception}", force=True)
+            show(f"Error ({error_type}): {exception}")
         
         self.replayer.set_error_callback(on_error)
         
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Build script for the optional compiled extensions
+
+The toolkit runs as plain Python; these extensions only accelerate hot
+paths when present. Build them in place with:
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+Set NATIVE_BUILD=1 to also tune for the build machine's CPU (-march=native);
+leave it unset for binaries that have to run on other machines.
+"""
+
+import os
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+COMPILE_ARGS = ['-O3', '-funroll-loops']
+if os.environ.get('NATIVE_BUILD') == '1':
+    COMPILE_ARGS.append('-march=native')
+
+extensions = [
+    Extension('adsb_alt_fast', ['adsb_alt_fast.pyx'], extra_compile_args=COMPILE_ARGS),
+    Extension('adsb_fastpath', ['adsb_fastpath.pyx'], extra_compile_args=COMPILE_ARGS),
+    Extension('breakpoint_core', ['breakpoint_core.pyx'], extra_compile_args=COMPILE_ARGS),
+]
+
+setup(
+    name='novatel-nav-toolkit-extensions',
+    ext_modules=cythonize(extensions, compiler_directives={'language_level': 3}),
+)
@@ -13,9 +13,15 @@ import os
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from adsb_altitude_decoder import ADSBAltitudeDecoder
+from adsb_altitude_decoder import (ADSBAltitudeDecoder, ADSBAltitudeResult, ALTITUDE_INVALID, _decode_baro_bits,
+                                   _decode_geo_bits, hex_to_message_array)
 import config
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TestADSBAltitudeDecoder(unittest.TestCase):
     """Test cases for ADS-B Altitude Decoder"""
@@ -63,7 +69,8 @@ class TestADSBAltitudeDecoder(unittest.TestCase):
         self.assertIsInstance(result['altitude_baro_ft'], int)
         
         # Should have timestamp
-        self.assertIn('altitude_decoded_at', result)
+        self.assertIn('altitude_decoded_at_ns', result)
+        self.assertIsInstance(result['altitude_decoded_at_ns'], int)
     
     def test_barometric_altitude_decoding(self):
         """Test barometric altitude decoding with Q-bit handling"""
@@ -103,6 +110,129 @@ class TestADSBAltitudeDecoder(unittest.TestCase):
         # Should have incremented Q-bit=1 counter
         self.assertGreater(self.decoder.q_bit_one_count, initial_q1_count)
     
+    def test_baro_kernel(self):
+        """Test the bit-level barometric kernel against known fields"""
+        # Q-bit=1: code 0xF9 (249) -> 249 * 25 - 1000 = 5225 ft
+        b2, b3, b4 = 0x00, 0x1E, 0x94
+        self.assertEqual(_decode_baro_bits(b2, b3, b4), 5225)
+
+        # Method wrapper delivers the same value as the kernel
+        hex_msg = "8D48" + "001E94" + "00" * 9
+        self.assertEqual(self.decoder._decode_barometric_altitude(hex_msg), 5225)
+
+    def test_geo_kernel_truncates_toward_zero(self):
+        """Test that negative geometric altitudes truncate like int(code * 6.25 - 1000)"""
+        # Code 1 -> -993.75 ft, code 161 -> 6.25 ft, code 0 -> -1000 ft
+        for code in (0, 1, 3, 159, 160, 161):
+            bits = code << 5
+            expected = int(code * 6.25 - 1000)
+            self.assertEqual(_decode_geo_bits(bits >> 16, (bits >> 8) & 0xFF, bits & 0xFF), expected)
+
+        self.assertEqual(self.decoder._decode_geometric_altitude("8DF8" + "000020" + "00" * 9), -993)
+
+        if np is not None:
+            raw = hex_to_message_array(["8DF8" + "000020" + "00" * 9])
+            self.assertEqual(self.decoder.decode_altitudes_batch(raw, [31])[0, 1], -993)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_batch_decoding_matches_scalar(self):
+        """Test batch decoding returns the same altitudes as the scalar path"""
+        messages = [
+            "8D48001E94000000000000000000",  # Barometric, Q-bit=1
+            "8D48001E84000000000000000000",  # Barometric, Q-bit=0
+            "8D4840D6F8220136E0A1473D8A14",  # Geometric
+            "8D4840D6202CC371C32CE0576098",  # Not an altitude type code
+        ]
+        type_codes = [11, 11, 31, 19]
+        raw = hex_to_message_array(messages)
+        self.assertEqual(raw.tolist(), [list(bytes.fromhex(m)) for m in messages])
+
+        result = self.decoder.decode_altitudes_batch(raw, type_codes)
+        self.assertEqual(result.shape, (4, 2))
+
+        scalar_decoder = ADSBAltitudeDecoder()
+        for row, hex_msg, tc in zip(result, messages, type_codes):
+            expected = scalar_decoder.decode_altitude(hex_msg, tc) or {}
+            self.assertEqual(row[0], expected.get('altitude_baro_ft', ALTITUDE_INVALID))
+            self.assertEqual(row[1], expected.get('altitude_geo_ft', ALTITUDE_INVALID))
+
+        self.assertEqual(self.decoder.get_stats()['altitudes_decoded'],
+                         scalar_decoder.get_stats()['altitudes_decoded'])
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_parallel_batch_decoding_matches_serial(self):
+        """Test the parallel batch kernel returns the same altitudes as the serial one"""
+        messages = [
+            "8D48001E94000000000000000000",  # Barometric, Q-bit=1
+            "8D48001E84000000000000000000",  # Barometric, Q-bit=0
+            "8D4840D6F8220136E0A1473D8A14",  # Geometric
+            "8DF8000020000000000000000000",  # Geometric, negative
+            "8D4840D6202CC371C32CE0576098",  # Not an altitude type code
+        ]
+        type_codes = [11, 11, 31, 31, 19]
+        raw = hex_to_message_array(messages)
+
+        parallel = self.decoder.decode_altitudes_batch(raw, type_codes, parallel=True)
+        serial = ADSBAltitudeDecoder().decode_altitudes_batch(raw, type_codes)
+        self.assertEqual(parallel.tolist(), serial.tolist())
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_hex_to_message_array_rejects_bad_input(self):
+        """Test batch hex conversion rejects malformed messages"""
+        with self.assertRaises(ValueError):
+            hex_to_message_array(["8D4840"])
+        with self.assertRaises(ValueError):
+            hex_to_message_array(["8D4840D6202CC371C32CE05760ZZ"])
+
+    def test_decode_timestamp(self):
+        """Test decode timestamps are epoch nanoseconds convertible to UTC datetimes"""
+        result = self.decoder.decode_altitude("8D48001E94000000000000000000", 11)
+        self.assertIsInstance(result['altitude_decoded_at_ns'], int)
+        
+        decoded_at = ADSBAltitudeDecoder.ns_to_datetime(result['altitude_decoded_at_ns'])
+        self.assertEqual(decoded_at.utcoffset().total_seconds(), 0)
+
+    def test_result_mapping_compatibility(self):
+        """Test the slotted result still behaves like the old result dict"""
+        result = self.decoder.decode_altitude("8D48001E94000000000000000000", 11)
+        self.assertIsInstance(result, ADSBAltitudeResult)
+        self.assertIn('altitude_baro_ft', result)
+        self.assertNotIn('altitude_geo_ft', result)
+        self.assertEqual(result['altitude_baro_ft'], 5225)
+        self.assertIsNone(result.get('altitude_geo_ft'))
+        
+        data = {'icao': '4840D6'}
+        data.update(result)
+        self.assertEqual(data, {'icao': '4840D6', **result.as_dict()})
+        self.assertEqual(set(result.as_dict()), {'altitude_baro_ft', 'altitude_decoded_at_ns'})
+
+    def test_stats_array(self):
+        """Test raw counters are exported in STAT_COUNTERS order"""
+        self.decoder.decode_altitude("8D48001E94000000000000000000", 11)
+        counters = self.decoder.get_stats_array()
+        self.assertEqual(len(counters), len(ADSBAltitudeDecoder.STAT_COUNTERS))
+        stats = self.decoder.get_stats()
+        for name, value in zip(ADSBAltitudeDecoder.STAT_COUNTERS, counters):
+            self.assertEqual(stats[name], value)
+
+    def test_specialized_decoders(self):
+        """Test type-code specialized decoders match the generic decoder"""
+        baro_msg = "8D48001E94000000000000000000"
+        geo_msg = "8D4840D6F8220136E0A1473D8A14"
+        
+        baro_decoder = ADSBAltitudeDecoder.specialize(range(9, 19))
+        self.assertEqual(baro_decoder.decode_altitude(baro_msg, 11)['altitude_baro_ft'],
+                         self.decoder.decode_altitude(baro_msg, 11)['altitude_baro_ft'])
+        self.assertIsNone(baro_decoder.decode_altitude(geo_msg, 31))
+        self.assertIsNone(baro_decoder.decode_altitude(baro_msg, 19))
+        
+        geo_decoder = ADSBAltitudeDecoder.specialize([31])
+        self.assertIsNone(geo_decoder.decode_altitude(baro_msg, 11))
+        self.assertEqual(geo_decoder.get_stats()['geometric_altitudes'], 0)
+        
+        with self.assertRaises(ValueError):
+            ADSBAltitudeDecoder.specialize([19])
+
     def test_gillham_conversion(self):
         """Test Gillham (Gray) code conversion"""
         # Test the Gray to binary conversion
@@ -116,6 +246,11 @@ class TestADSBAltitudeDecoder(unittest.TestCase):
         for gray_input, expected_binary in test_cases:
             result = self.decoder._convert_gray_to_binary(gray_input)
             self.assertEqual(result, expected_binary)
+        
+        # Nibble lookup table agrees with the algorithmic conversion
+        for gray_nibble in range(16):
+            self.assertEqual(ADSBAltitudeDecoder.GILLHAM_TO_BINARY[gray_nibble],
+                             self.decoder._convert_gray_to_binary(gray_nibble))
     
     def test_altitude_validation(self):
         """Test altitude validation and sanity checks"""
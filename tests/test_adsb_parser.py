@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from adsb_parser import ADSBParser
+from adsb_parser import ADSBParser, AviationRecord
 import config
 
 
@@ -51,15 +51,14 @@ class TestADSBParser:
         # Mock PASSCOM parser to return False so GDL-90 path is taken
         with patch.object(self.parser, '_is_passcom_wrapped', return_value=False):
             with patch.object(self.parser.gdl90_deframer, 'is_gdl90_frame', return_value=True):
-                with patch.object(self.parser.gdl90_deframer, 'deframe_message') as mock_deframe:
+                with patch.object(self.parser.gdl90_deframer, 'iter_deframe_message') as mock_deframe:
                     # Mock deframer to return valid ADS-B message
-                    mock_deframe.return_value = [bytes.fromhex("8D4840D6202CC371C32CE0576098")]
+                    mock_deframe.return_value = iter([bytes.fromhex("8D4840D6202CC371C32CE0576098")])
                     
                     with patch('adsb_parser.adsb') as mock_adsb:
                         mock_adsb.df.return_value = 17
                         mock_adsb.icao.return_value = "4840D6"
                         mock_adsb.typecode.return_value = 4
-                        mock_adsb.callsign.return_value = "UAL1234 "
                         mock_adsb.category.return_value = 2
                         
                         result = self.parser.parse_message(gdl90_data)
@@ -80,7 +79,6 @@ class TestADSBParser:
                 mock_adsb.df.return_value = 17
                 mock_adsb.icao.return_value = "4840D6"
                 mock_adsb.typecode.return_value = 4
-                mock_adsb.callsign.return_value = "UAL1234 "
                 mock_adsb.category.return_value = 2
                 
                 result = self.parser.parse_message(raw_adsb)
@@ -90,6 +88,33 @@ class TestADSBParser:
                 assert result['icao'] == "4840D6"
                 assert self.parser.raw_messages_processed == 1
     
+    def test_parse_message_stops_at_first_payload(self):
+        """Test that payloads are consumed lazily up to the first successful parse"""
+        consumed = []
+        
+        def payloads(message):
+            for payload in ("8D4840D6202CC371C32CE0576098", "8D485020994409940838175B284F"):
+                consumed.append(payload)
+                yield bytes.fromhex(payload)
+        
+        with patch.object(self.parser, '_preprocess_message', side_effect=payloads):
+            result = self.parser.parse_message(b'frame')
+        
+        assert result['type_code'] == 4
+        assert len(consumed) == 1
+    
+    def test_parse_message_deframes_gdl90_lazily(self):
+        """Test that GDL-90 frames after the first successful parse are never deframed"""
+        frame = bytes.fromhex("7E26008D4840D6202CC371C32CE05760987E")
+        self.parser.log_parse_attempts = False
+        
+        with patch.object(self.parser, '_is_passcom_wrapped', return_value=False):
+            result = self.parser.parse_message(frame * 3)
+        
+        assert result['callsign'] == "KLM1023"
+        assert self.parser.gdl90_deframer.frames_processed == 1
+        assert self.parser.gdl90_deframer.frames_extracted == 1
+    
     def test_is_gdl90_wrapped(self):
         """Test GDL-90 frame detection"""
         # Should delegate to GDL90Deframer
@@ -110,10 +135,10 @@ class TestADSBParser:
         # Mock PASSCOM parser to return False so GDL-90 path is taken
         with patch.object(self.parser, '_is_passcom_wrapped', return_value=False):
             with patch.object(self.parser, '_is_gdl90_wrapped', return_value=True):
-                with patch.object(self.parser.gdl90_deframer, 'deframe_message') as mock_deframe:
-                    mock_deframe.return_value = [bytes.fromhex("8B9A7E479967CCD9C82B84D1FFEBCCA0")]
+                with patch.object(self.parser.gdl90_deframer, 'iter_deframe_message') as mock_deframe:
+                    mock_deframe.return_value = iter([bytes.fromhex("8B9A7E479967CCD9C82B84D1FFEBCCA0")])
                     
-                    result = self.parser._preprocess_message(gdl90_data)
+                    result = list(self.parser._preprocess_message(gdl90_data))
                     
                     assert len(result) == 1
                     assert self.parser.gdl90_messages_processed == 1
@@ -149,7 +174,6 @@ class TestADSBParser:
             mock_adsb.df.return_value = 17
             mock_adsb.icao.return_value = "4840D6"
             mock_adsb.typecode.return_value = 4
-            mock_adsb.callsign.return_value = "UAL1234 "
             mock_adsb.category.return_value = 2
             
             result = self.parser._parse_adsb_payload(valid_adsb)
@@ -157,7 +181,7 @@ class TestADSBParser:
             assert result is not None
             assert result['icao'] == "4840D6"
             assert result['type_code'] == 4
-            assert result['callsign'] == "UAL1234"
+            assert result['callsign'] == "KLM1023"
             assert self.parser.messages_parsed == 1
     
     def test_parse_adsb_payload_hex_string_input(self):
@@ -169,28 +193,33 @@ class TestADSBParser:
             mock_adsb.icao.return_value = "4840D6"
             mock_adsb.typecode.return_value = 4
             
-            result = self.parser._parse_adsb_payload(hex_string)
+            result = self.parser._parse_adsb_hex(hex_string)
             
-            # Should handle string input
-            mock_adsb.df.assert_called_with(hex_string)
+            # String input goes through its own entry point and the byte classifier
+            mock_adsb.df.assert_not_called()
+            mock_adsb.category.assert_called_with(hex_string.lower())
+            assert result['icao'] == "4840D6"
     
     def test_extract_aviation_data_identification(self):
         """Test extraction of aircraft identification data (TC 1-4)"""
         with patch('adsb_parser.adsb') as mock_adsb:
-            mock_adsb.callsign.return_value = "UAL1234 "
             mock_adsb.category.return_value = 2
             
-            result = self.parser._extract_aviation_data("test_msg", "4840D6", 4)
+            result = self.parser._extract_aviation_data("8D4840D6202CC371C32CE0576098", "4840D6", 4)
             
             assert result is not None
             assert result['icao'] == "4840D6"
             assert result['type_code'] == 4
-            assert result['callsign'] == "UAL1234"
+            assert result['callsign'] == "KLM1023"
             assert result['category'] == 2
             assert 'parsed_timestamp' in result
     
     def test_extract_aviation_data_position(self):
         """Test extraction of position data (TC 9-18)"""
+        # Local decoding against a reference needs a receiver location
+        with patch.object(config, 'ADSB_REFERENCE_LAT', 37.6), patch.object(config, 'ADSB_REFERENCE_LON', -122.4):
+            self.parser = ADSBParser()
+        
         with patch('adsb_parser.adsb') as mock_adsb:
             mock_adsb.position_with_ref.return_value = (37.7749, -122.4194)
             # Mock the altitude decoder to return enhanced altitude data
@@ -230,7 +259,7 @@ class TestADSBParser:
     
     def test_extract_aviation_data_exception(self):
         """Test extraction with exception from pyModeS"""
-        with patch('adsb_parser.adsb.callsign', side_effect=Exception("Parse error")):
+        with patch('adsb_parser.adsb.category', side_effect=Exception("Parse error")):
             result = self.parser._extract_aviation_data("test_msg", "4840D6", 4)
             
             assert result is None
@@ -289,6 +318,21 @@ class TestADSBParser:
             assert stats['gdl90_adsb_found'] == 3
             assert stats['gdl90_success_rate'] == 60.0
     
+    def test_stats_counters_are_live(self):
+        """Test that counter attributes and get_stats share one live dict"""
+        self.parser._parse_adsb_payload(bytes.fromhex("8D40621D58C382D690C8AC2863A7"))
+        
+        assert self.parser._stats['messages_parsed'] == self.parser.messages_parsed == 1
+        self.parser.parse_error_count += 1
+        
+        stats = self.parser.get_stats()
+        assert stats['messages_parsed'] == 1
+        assert stats['parse_errors'] == 1
+        assert stats['success_rate'] == 50.0
+        
+        stats['messages_parsed'] = 99  # Callers get a copy
+        assert self.parser.messages_parsed == 1
+    
     def test_reset_stats(self):
         """Test resetting parser statistics"""
         # Set some non-zero values
@@ -306,20 +350,38 @@ class TestADSBParser:
             assert self.parser.raw_messages_processed == 0
             mock_reset.assert_called_once()
     
+    def test_reset(self):
+        """Test that reset forgets aircraft, unpaired position frames and statistics"""
+        self.parser.parse_message(bytes.fromhex("8D4840D6202CC371C32CE0576098"))
+        self.parser.parse_message(bytes.fromhex("8D40621D58C382D690C8AC2863A7"))
+        assert self.parser.aircraft_data
+        assert self.parser._cpr_frames
+        
+        self.parser.reset()
+        
+        assert self.parser.get_aircraft_data() == {}
+        assert self.parser.get_latest_aviation_data() == {}
+        assert not self.parser._cpr_frames
+        assert self.parser.messages_parsed == 0
+        assert self.parser.raw_messages_processed == 0
+    
     def test_aircraft_data_accumulation(self):
         """Test that aircraft data accumulates correctly"""
+        # Local decoding against a reference needs a receiver location
+        with patch.object(config, 'ADSB_REFERENCE_LAT', 37.6), patch.object(config, 'ADSB_REFERENCE_LON', -122.4):
+            self.parser = ADSBParser()
+        
         # First parse for aircraft
         with patch('adsb_parser.adsb') as mock_adsb:
             mock_adsb.df.return_value = 17
             mock_adsb.icao.return_value = "4840D6"
             mock_adsb.typecode.return_value = 4
-            mock_adsb.callsign.return_value = "UAL1234 "
             mock_adsb.category.return_value = 2
             
             result1 = self.parser._parse_adsb_payload(bytes.fromhex("8D4840D6202CC371C32CE0576098"))
             
             assert "4840D6" in self.parser.aircraft_data
-            assert self.parser.aircraft_data["4840D6"]["callsign"] == "UAL1234"
+            assert self.parser.aircraft_data["4840D6"]["callsign"] == "KLM1023"
         
         # Second parse for same aircraft with position data
         with patch('adsb_parser.adsb') as mock_adsb:
@@ -332,9 +394,248 @@ class TestADSBParser:
             result2 = self.parser._parse_adsb_payload(bytes.fromhex("8D4840D658A302E6F15700D05448"))
             
             # Should accumulate data for same aircraft
-            assert self.parser.aircraft_data["4840D6"]["callsign"] == "UAL1234"  # Previous data preserved
+            assert self.parser.aircraft_data["4840D6"]["callsign"] == "KLM1023"  # Previous data preserved
             assert self.parser.aircraft_data["4840D6"]["latitude"] == 37.7749  # New data added
     
+    def test_quick_classify(self):
+        """Test DF/TC/ICAO extraction directly from payload bytes"""
+        assert self.parser._quick_classify(bytes.fromhex("8D4840D6202CC371C32CE0576098")) == (17, 4, "4840D6")
+        assert self.parser._quick_classify(bytes.fromhex("5D4840D6ABCDEF")) == (11, 0, "4840D6")
+        assert self.parser._quick_classify(bytes.fromhex("A0001838CA3E51F0A8000047A36A")) == (20, 0, None)
+        assert self.parser._quick_classify(bytes.fromhex("FF" * 14))[0] == 24
+        assert self.parser._quick_classify(bytearray.fromhex("8D485020994409940838175B284F")) == (17, 19, "485020")
+    
+    @patch('config.ACCEPTED_DOWNLINK_FORMATS', [18])
+    def test_accepted_df_mask(self):
+        """Test accepted downlink formats are resolved into a bitmask"""
+        parser = ADSBParser()
+        
+        assert parser._df_mask == 1 << 18
+        assert parser._parse_adsb_payload(bytes.fromhex("8D4840D6202CC371C32CE0576098")) is None
+        assert parser.messages_parsed == 0
+    
+    def test_log_parse_attempts_resolved_at_init(self):
+        """Test the parse logging flag is captured when the parser is built"""
+        with patch('config.LOG_PARSE_ATTEMPTS', False):
+            parser = ADSBParser()
+        
+        assert parser.log_parse_attempts is False
+        with patch('adsb_parser.logger') as mock_logger:
+            parser._parse_adsb_payload(bytes.fromhex("404840D6202CC371C32CE0576098"))
+            mock_logger.info.assert_not_called()
+            mock_logger.error.assert_not_called()
+    
+    @patch('config.ENABLE_GEOMETRIC_ALTITUDE', False)
+    def test_geometric_altitude_disabled(self):
+        """Test TC 31 gets no handler when geometric altitude is disabled"""
+        parser = ADSBParser()
+        
+        assert parser._extractors[31] is None
+        assert parser._extract_aviation_data("8D4840D6F8220136E0A1473D8A14", "4840D6", 31) is None
+    
+    def test_tc_extractor_table(self):
+        """Test type codes map to the expected specialized extractors"""
+        extractors = self.parser._extractors
+        
+        assert len(extractors) == 32
+        assert extractors[0] is None
+        assert all(extractors[tc] == self.parser._extract_ident for tc in range(1, 5))
+        assert all(extractors[tc] == self.parser._extract_surface_position for tc in range(5, 9))
+        assert all(extractors[tc] == self.parser._extract_airborne_position for tc in range(9, 19))
+        assert extractors[19] == self.parser._extract_velocity
+        assert extractors[20] is None
+        assert extractors[31] == self.parser._extract_geom_alt
+    
+    def test_parse_messages_batch(self):
+        """Test batch parsing returns results aligned with the input"""
+        batch = [
+            bytes.fromhex("8D4840D6202CC371C32CE0576098"),  # Identification
+            bytes.fromhex("5D4840D6ABCDEF"),                # DF 11, not accepted
+            b'',
+            bytes.fromhex("8D485020994409940838175B284F"),  # Velocity
+        ]
+        
+        results = self.parser.parse_messages(batch)
+        
+        assert len(results) == 4
+        assert results[0]['icao'] == "4840D6"
+        assert results[0]['callsign'] == "KLM1023"
+        assert results[1] is None
+        assert results[2] is None
+        assert results[3]['speed_knots'] == 159
+        assert results[0]['parsed_timestamp'] is results[3]['parsed_timestamp']
+        assert self.parser.messages_parsed == 2
+        assert set(self.parser.aircraft_data) == {"4840D6", "485020"}
+        
+        # Uniform 14-byte batches take the vectorized classification path
+        uniform = [batch[0], batch[3]]
+        assert self.parser._classify_batch(uniform) == ([17, 17], [4, 19])
+        assert [r['type_code'] for r in self.parser.parse_messages(uniform)] == [4, 19]
+    
+    def test_parse_batch_matches_parse_messages(self):
+        """Test process-parallel batch parsing keeps order, data and counters"""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        batch = [
+            bytes.fromhex("8D4840D6202CC371C32CE0576098"),
+            bytes.fromhex("5D4840D6ABCDEF"),
+            bytes.fromhex("8D40621D58C382D690C8AC2863A7"),
+            bytes.fromhex("8D485020994409940838175B284F"),
+            bytes.fromhex("8D40621D58C386435CC412692AD6"),  # Odd partner, in another chunk
+            b'',
+        ]
+        timestamps = [100.0 + i for i in range(len(batch))]
+        serial = ADSBParser()
+        expected = serial.parse_messages(batch, timestamps)
+        
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = self.parser.parse_batch(batch, executor=executor, chunk_size=2, timestamps=timestamps)
+        
+        assert results[4]['latitude'] == pytest.approx(52.2658, abs=1e-3)
+        
+        volatile = ('parsed_timestamp', 'altitude_decoded_at_ns')
+        strip = lambda r: r and {k: v for k, v in r.items() if k not in volatile}
+        assert [strip(r) for r in results] == [strip(r) for r in expected]
+        assert self.parser.messages_parsed == serial.messages_parsed
+        assert self.parser.raw_messages_processed == serial.raw_messages_processed
+        assert self.parser.altitude_decoder.get_stats() == serial.altitude_decoder.get_stats()
+        assert list(self.parser.aircraft_data) == list(serial.aircraft_data)
+    
+    def test_feed_batches_queued_messages(self):
+        """Test that fed messages are parsed in batches by the feed thread"""
+        self.parser.feed(bytes.fromhex("8D4840D6202CC371C32CE0576098"))
+        self.parser.feed(b'')
+        self.parser.feed(bytes.fromhex("8D485020994409940838175B284F"))
+        
+        # Nothing is parsed until the queue is drained
+        assert self.parser.aircraft_data == {}
+        
+        self.parser.start_feed()
+        self.parser.feed(bytes.fromhex("8D40621D58C382D690C8AC2863A7"))
+        self.parser.stop_feed()
+        
+        assert set(self.parser.get_aircraft_data()) == {"4840D6", "485020", "40621D"}
+        assert self.parser.raw_messages_processed == 3
+        assert self.parser.messages_parsed == 3
+        assert len(self.parser._feed_queue) == 0
+        assert not self.parser.feed_thread.is_alive()
+    
+    def test_aircraft_data_lru_eviction(self):
+        """Test that the aircraft store is bounded and evicts the least recently seen"""
+        self.parser.max_tracked_aircraft = 2
+        
+        self.parser._store_aviation_data("AAAAAA", {'icao': "AAAAAA"})
+        self.parser._store_aviation_data("BBBBBB", {'icao': "BBBBBB"})
+        self.parser._store_aviation_data("AAAAAA", {'callsign': "UAL1234"})
+        self.parser._store_aviation_data("CCCCCC", {'icao': "CCCCCC"})
+        
+        assert list(self.parser.aircraft_data) == ["AAAAAA", "CCCCCC"]
+        assert self.parser.aircraft_data["AAAAAA"] == {'icao': "AAAAAA", 'callsign': "UAL1234"}
+        assert type(self.parser.get_aircraft_data()) is dict
+        assert self.parser.get_latest_aviation_data() == {'icao': "CCCCCC"}
+    
+    def test_aircraft_store_uses_slotted_records(self):
+        """Test that per-aircraft state is an AviationRecord behaving as a mapping"""
+        self.parser._store_aviation_data("4840D6", {'icao': "4840D6", 'speed_knots': None})
+        self.parser._store_aviation_data("4840D6", {'callsign': "UAL1234", 'altitude_decoded_at': "x"})
+        
+        record = self.parser.aircraft_data["4840D6"]
+        assert isinstance(record, AviationRecord)
+        assert not hasattr(record, '__dict__')
+        assert record['callsign'] == "UAL1234"
+        assert record['speed_knots'] is None
+        assert record['altitude_decoded_at'] == "x"
+        assert 'latitude' not in record
+        assert record.get('latitude') is None
+        
+        latest = self.parser.get_latest_aviation_data()
+        assert type(latest) is dict
+        assert latest == {'icao': "4840D6", 'callsign': "UAL1234", 'speed_knots': None,
+                          'altitude_decoded_at': "x"}
+    
+    def test_icao_and_callsign_interned(self):
+        """Test that repeated ICAO and callsign strings share one object across records"""
+        with patch('adsb_parser.adsb') as mock_adsb:
+            mock_adsb.category.return_value = 3
+            
+            first = self.parser._extract_aviation_data("8D4840D6202CC371C32CE0576098", "".join(["4840", "D6"]), 4)
+            second = self.parser._extract_aviation_data("8D4840D6202CC371C32CE0576098", "".join(["4840", "D6"]), 4)
+        
+        assert first['icao'] is second['icao']
+        assert first['callsign'] is second['callsign']
+        
+        self.parser._store_aviation_data("".join(["4840", "D6"]), first)
+        assert next(iter(self.parser.aircraft_data)) is first['icao']
+    
+    def test_legacy_altitude_comparison_sampled(self):
+        """Test that the legacy altitude cross-check runs on 1 in N position messages"""
+        self.parser.log_altitude_decoding = True
+        self.parser.altitude_compare_interval = 3
+        
+        with patch('adsb_parser.adsb') as mock_adsb, \
+             patch.object(self.parser.altitude_decoder, 'decode_altitude', return_value={'altitude_baro_ft': 35000}):
+            mock_adsb.position_with_ref.side_effect = ValueError
+            mock_adsb.altitude.return_value = 35000
+            
+            results = [self.parser._extract_aviation_data("8D40621D58C382D690C8AC2863A7", "40621D", 11)
+                       for _ in range(7)]
+        
+        assert mock_adsb.altitude.call_count == 3
+        assert ['altitude_legacy_ft' in result for result in results] == [True, False, False, True, False, False, True]
+    
+    def test_position_uses_configured_reference(self):
+        """Test that positions decode against the configured reference, or not at all without one"""
+        with patch.object(config, 'ADSB_REFERENCE_LAT', 52.258), patch.object(config, 'ADSB_REFERENCE_LON', 3.918):
+            parser = ADSBParser()
+        
+        result = parser._extract_aviation_data("8D40621D58C382D690C8AC2863A7", "40621D", 11)
+        assert result['latitude'] == pytest.approx(52.2572, abs=1e-3)
+        assert result['longitude'] == pytest.approx(3.9194, abs=1e-3)
+        
+        with patch.object(config, 'ADSB_REFERENCE_LAT', None):
+            parser = ADSBParser()
+        
+        with patch('adsb_parser.adsb') as mock_adsb:
+            parser._extract_aviation_data("8D40621D58C382D690C8AC2863A7", "40621D", 11)
+            mock_adsb.position_with_ref.assert_not_called()
+        
+        # The shipped defaults configure no reference, so a lone frame has no position
+        result = ADSBParser()._extract_aviation_data("8D40621D58C382D690C8AC2863A7", "40621D", 11)
+        assert 'latitude' not in result
+    
+    def test_position_from_even_odd_pair(self):
+        """Test that an even/odd CPR pair decodes a global position without a reference"""
+        even_msg = bytes.fromhex("8D40621D58C382D690C8AC2863A7")
+        odd_msg = bytes.fromhex("8D40621D58C386435CC412692AD6")
+        with patch.object(config, 'ADSB_REFERENCE_LAT', None):
+            parser = ADSBParser()
+        
+        even = parser.parse_message(even_msg, received_at=100.0)
+        assert 'latitude' not in even
+        
+        # The newer (odd) frame's position is reported
+        odd = parser.parse_message(odd_msg, received_at=101.0)
+        assert odd['latitude'] == pytest.approx(52.2658, abs=1e-3)
+        assert odd['longitude'] == pytest.approx(3.9389, abs=1e-3)
+        
+        # Frames are paired by receive time, not by when they are parsed
+        stale = parser.parse_message(odd_msg, received_at=100.0 + parser.CPR_PAIR_WINDOW + 1)
+        assert 'latitude' not in stale
+    
+    def test_position_pairs_follow_receive_order(self):
+        """Test a late frame still decodes its own position, and surface frames need a reference"""
+        with patch.object(config, 'ADSB_REFERENCE_LAT', None):
+            parser = ADSBParser()
+        
+        parser.parse_message(bytes.fromhex("8D40621D58C386435CC412692AD6"), received_at=101.0)
+        even = parser.parse_message(bytes.fromhex("8D40621D58C382D690C8AC2863A7"), received_at=100.0)
+        assert even['latitude'] == pytest.approx(52.2572, abs=1e-3)
+        assert even['longitude'] == pytest.approx(3.9194, abs=1e-3)
+        
+        # Surface frames are neither cached nor paired without a receiver reference
+        assert parser._decode_cpr_pair("8C4841753AAB238733C8CD4020B1", "484175", 7) is None
+        assert ("484175", True) not in parser._cpr_frames
+    
     def test_parse_message_exception_handling(self):
         """Test that parse_message handles exceptions gracefully"""
         with patch.object(self.parser, '_preprocess_message', side_effect=Exception("Test error")):
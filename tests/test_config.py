@@ -36,8 +36,8 @@ class TestConfig:
     def test_protocol_configuration_defaults(self):
         """Test protocol configuration defaults"""
         assert config.PROTOCOL_MODE == 'nmea'
-        assert config.ADSB_REFERENCE_LAT == 0.0
-        assert config.ADSB_REFERENCE_LON == 0.0
+        assert config.ADSB_REFERENCE_LAT is None
+        assert config.ADSB_REFERENCE_LON is None
     
     def test_logging_configuration_defaults(self):
         """Test logging configuration defaults"""
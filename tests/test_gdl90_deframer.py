@@ -5,10 +5,12 @@ Unit tests for GDL90Deframer module
 import pytest
 import sys
 import os
+from unittest.mock import patch
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import gdl90_deframer
 from gdl90_deframer import GDL90Deframer, deframe_gdl90_data
 
 
@@ -27,6 +29,12 @@ class TestGDL90Deframer:
         assert self.deframer.deframing_errors == 0
         assert self.deframer.byte_unstuff_operations == 0
     
+    def test_counters_stored_in_slots(self):
+        """Test statistics counters use slots rather than the instance dict"""
+        self.deframer.deframe_message(bytes.fromhex("7E26008B9A7D5E479967CCD9C82B84D1FFEBCCA07E"))
+        assert self.deframer.frames_processed == 1
+        assert vars(self.deframer) == {}
+    
     def test_constants(self):
         """Test that GDL-90 constants are correct"""
         assert GDL90Deframer.FLAG_BYTE == 0x7E
@@ -87,6 +95,26 @@ class TestGDL90Deframer:
         boundaries = self.deframer._find_frame_boundaries(invalid_frame)
         assert len(boundaries) == 0
     
+    def test_find_frame_boundaries_skips_leading_bytes(self):
+        """Test frame boundary detection ignores data before the first flag and after the last"""
+        data = bytes.fromhex("0102037E26008B9A7E7E7E2600127EFFFF")
+        boundaries = self.deframer._find_frame_boundaries(data)
+        assert boundaries == [(3, 8), (10, 14)]
+        
+        assert self.deframer._find_frame_boundaries(bytes.fromhex("26008B9A")) == []
+    
+    def test_find_frame_boundaries_vectorized(self):
+        """Test the NumPy flag scan pairs frames like the bytes.find scan"""
+        data = bytes.fromhex("00" + "7E26008B9A7E7E7E2600127E" * 20 + "FF")
+        with patch.object(gdl90_deframer, 'VECTOR_BOUNDARY_MIN_FLAGS', 10**6):
+            expected = self.deframer._find_frame_boundaries(data)
+        assert len(expected) == 40
+        
+        with patch.object(gdl90_deframer, 'VECTOR_BOUNDARY_MIN_FLAGS', 1):
+            if gdl90_deframer.np is not None:
+                assert self.deframer._find_frame_boundaries(data) == expected
+            assert self.deframer._find_frame_boundaries(bytes.fromhex("7E26")) == []
+    
     def test_unstuff_bytes_flag_escape(self):
         """Test byte unstuffing for flag escape sequence"""
         # 0x7D 0x5E should become 0x7E
@@ -121,6 +149,33 @@ class TestGDL90Deframer:
         expected = bytes.fromhex("26007D12")
         assert result == expected
     
+    def test_unstuff_bytes_mixed_escapes(self):
+        """Test adjacent, invalid and trailing escapes unstuff like a byte-by-byte scan"""
+        cases = {
+            "7D5D5E": "7D5E",
+            "7D7D5E": "7D7E",
+            "7D5D7D5E7D": "7D7E7D",
+            "7D5E7D5E": "7E7E",
+        }
+        for stuffed, expected in cases.items():
+            assert self.deframer._unstuff_bytes(bytes.fromhex(stuffed)) == bytes.fromhex(expected)
+        
+        assert self.deframer.byte_unstuff_operations == 6
+    
+    @pytest.mark.skipif(gdl90_deframer.njit is None, reason="numba not installed")
+    def test_unstuff_bytes_jit_matches_replace(self):
+        """Test the JIT unstuffer used for large frames gives the same bytes and counts"""
+        stuffed = bytes.fromhex("26007D5D5E7D7D5E7D12" * 8 + "7D")
+        expected = self.deframer._unstuff_bytes(stuffed)
+        replace_ops = self.deframer.byte_unstuff_operations
+        
+        with patch.object(gdl90_deframer, 'JIT_UNSTUFF_MIN_BYTES', 1):
+            assert self.deframer._unstuff_bytes(stuffed) == expected
+            # A shorter frame reuses the larger output buffer
+            assert self.deframer._unstuff_bytes(bytes.fromhex("7D5E12")) == bytes.fromhex("7E12")
+            assert len(self.deframer._unstuff_buffer) == len(stuffed)
+        assert self.deframer.byte_unstuff_operations == 2 * replace_ops + 1
+    
     def test_unstuff_bytes_empty(self):
         """Test unstuffing empty data"""
         result = self.deframer._unstuff_bytes(b'')
@@ -136,6 +191,14 @@ class TestGDL90Deframer:
         
         assert payload == expected_payload
     
+    def test_extract_adsb_payload_14_byte(self):
+        """Test the 14-byte Mode S fast path accepts valid DFs and rejects others"""
+        payload = bytes.fromhex("8D4840D6202CC371C32CE0576098")
+        assert self.deframer._extract_adsb_payload(b"\x26\x00" + payload) == payload
+        
+        invalid_df = bytes.fromhex("5D4840D6202CC371C32CE0576098")
+        assert self.deframer._extract_adsb_payload(b"\x26\x00" + invalid_df) is None
+    
     def test_extract_adsb_payload_wrong_msg_type(self):
         """Test extraction with wrong message type"""
         # Wrong message ID (not 0x26)
@@ -267,6 +330,45 @@ class TestGDL90Deframer:
         # Should extract both messages
         assert len(messages) >= 1  # At least one should be valid ADS-B
     
+    def test_iter_deframe_message(self):
+        """Test messages are yielded frame by frame and stats land when iteration ends"""
+        frame = "7E26008B9A7D5E479967CCD9C82B84D1FFEBCCA07E"
+        messages = self.deframer.iter_deframe_message(bytes.fromhex(frame * 2))
+        
+        expected = bytes.fromhex("8B9A7E479967CCD9C82B84D1FFEBCCA0")
+        assert next(messages) == expected
+        assert list(messages) == [expected]
+        assert self.deframer.frames_processed == 2
+        assert self.deframer.adsb_messages_found == 2
+        assert self.deframer.frames_extracted == 2
+        
+        assert list(self.deframer.iter_deframe_message(b'')) == []
+    
+    def test_iter_deframe_message_closed_early(self):
+        """Test stats for already-yielded messages land when the consumer stops early"""
+        frame = "7E26008B9A7D5E479967CCD9C82B84D1FFEBCCA07E"
+        messages = self.deframer.iter_deframe_message(bytes.fromhex(frame * 3))
+        
+        next(messages)
+        messages.close()
+        assert self.deframer.frames_processed == 1
+        assert self.deframer.adsb_messages_found == 1
+        assert self.deframer.frames_extracted == 1
+    
+    def test_hex_summary_truncates_long_data(self):
+        """Test debug hex dumps keep short data whole and summarize long data"""
+        assert gdl90_deframer._hex_summary(bytes(range(64))) == bytes(range(64)).hex()
+        
+        long_data = bytes(range(100))
+        summary = gdl90_deframer._hex_summary(long_data)
+        assert summary == long_data[:32].hex() + "..." + long_data[-16:].hex()
+    
+    def test_lazy_hex_log_argument(self):
+        """Test debug log arguments are hex-encoded only when formatted"""
+        lazy = gdl90_deframer._LazyHex(bytes(range(100)))
+        assert str(lazy) == gdl90_deframer._hex_summary(bytes(range(100)))
+        assert "[GDL90] Frame %d: %s" % (1, gdl90_deframer._LazyHex(b"\x26\x00")) == "[GDL90] Frame 1: 2600"
+    
     def test_convenience_function(self):
         """Test standalone convenience function"""
         sample_data = bytes.fromhex("7E26008B9A7D5E479967CCD9C82B84D1FFEBCCA07E")
@@ -97,16 +97,15 @@ class TestSystemIntegration:
         with patch.object(adsb_parser, '_is_passcom_wrapped', return_value=False):
             # Mock GDL-90 deframing
             with patch.object(adsb_parser.gdl90_deframer, 'is_gdl90_frame', return_value=True):
-                with patch.object(adsb_parser.gdl90_deframer, 'deframe_message') as mock_deframe:
+                with patch.object(adsb_parser.gdl90_deframer, 'iter_deframe_message') as mock_deframe:
                     # Mock deframer to return valid ADS-B message
-                    mock_deframe.return_value = [bytes.fromhex("8D4840D6202CC371C32CE0576098")]
+                    mock_deframe.return_value = iter([bytes.fromhex("8D4840D6202CC371C32CE0576098")])
                     
                     # Mock pyModeS responses for the expected deframed message
                     with patch('adsb_parser.adsb') as mock_adsb:
                         mock_adsb.df.return_value = 17
                         mock_adsb.icao.return_value = "4840D6"
                         mock_adsb.typecode.return_value = 4
-                        mock_adsb.callsign.return_value = "UAL1234 "
                         mock_adsb.category.return_value = 2
                         
                         # Process message
@@ -115,14 +114,14 @@ class TestSystemIntegration:
                         # Verify parsing worked
                         assert result is not None
                         assert result['icao'] == "4840D6"
-                        assert result['callsign'] == "UAL1234"
+                        assert result['callsign'] == "KLM1023"
             
             # Get aviation data
             aviation_data = adsb_parser.get_latest_aviation_data()
             
             # Verify data
             assert aviation_data['icao'] == "4840D6"
-            assert aviation_data['callsign'] == "UAL1234"
+            assert aviation_data['callsign'] == "KLM1023"
             
             # Test display formatting
             parser_stats = adsb_parser.get_stats()
@@ -131,7 +130,7 @@ class TestSystemIntegration:
             # Verify display contains expected data
             assert "Novatel ProPak6 Aviation Data (ADS-B)" in display_output
             assert "ICAO:      4840D6" in display_output
-            assert "Callsign:  UAL1234" in display_output
+            assert "Callsign:  KLM1023" in display_output
     
     def test_udp_listener_integration(self):
         """Test UDP listener integration with parsers"""
@@ -186,6 +186,21 @@ class TestNavigationListener:
             
             mock_parse.assert_called_once_with(test_data)
     
+    def test_handle_adsb_data_feed(self):
+        """Test that ADS-B data goes through the parser feed while it is running"""
+        test_data = bytes.fromhex("8D4840D6202CC371C32CE0576098")
+        
+        with patch.object(self.listener, '_log_adsb_result') as mock_log:
+            self.listener.adsb_parser.start_feed(mock_log)
+            self.listener._handle_adsb_data(test_data)
+            self.listener.adsb_parser.stop_feed()
+        
+        mock_log.assert_called_once()
+        raw_data, parsed_data, received_at = mock_log.call_args[0]
+        assert raw_data == test_data
+        assert parsed_data['icao'] == '4840D6'
+        assert received_at > 0
+    
     @patch('config.PROTOCOL_MODE', 'nmea')
     def test_display_loop_nmea_mode(self):
         """Test display loop in NMEA mode"""
@@ -61,12 +61,10 @@ class TestPasscomIntegration(unittest.TestCase):
         """Test complete PASSCOM processing pipeline"""
         # Mock the PASSCOM parser and ADS-B decoding
         with patch.object(self.parser.passcom_parser, 'parse_passcom_frame') as mock_passcom:
-            mock_passcom.return_value = [bytes.fromhex("8D4840D6202CC371C32CE0576098")]
+            # DF/TC/ICAO are classified from the payload bytes, so use a real TC 11 frame
+            mock_passcom.return_value = [bytes.fromhex("8D40621D58C382D690C8AC2863A7")]
             
             with patch('adsb_parser.adsb') as mock_adsb:
-                mock_adsb.df.return_value = 17
-                mock_adsb.icao.return_value = "4840D6"
-                mock_adsb.typecode.return_value = 11
                 
                 # Mock altitude decoder
                 with patch.object(self.parser.altitude_decoder, 'decode_altitude') as mock_altitude:
@@ -76,7 +74,7 @@ class TestPasscomIntegration(unittest.TestCase):
                     
                     # Should successfully parse and extract data
                     self.assertIsNotNone(result)
-                    self.assertEqual(result['icao'], "4840D6")
+                    self.assertEqual(result['icao'], "40621D")
                     self.assertEqual(result['type_code'], 11)
                     self.assertEqual(result['altitude_baro_ft'], 35000)
     
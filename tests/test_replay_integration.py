@@ -13,6 +13,7 @@ import json
 import sys
 import os
 from pathlib import Path
+from unittest.mock import patch
 
 # Add parent directory to path to import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,7 +22,7 @@ from udp_replayer import UDPReplayer
 from message_inspector import MessageInspector
 from message_filter import MessageFilter
 from breakpoint_manager import BreakpointManager
-from interactive_debugger import SimpleDebugger
+from interactive_debugger import InteractiveDebugger, SimpleDebugger
 import config
 
 
@@ -231,6 +232,207 @@ class TestReplayIntegration(unittest.TestCase):
         self.assertIsNotNone(debugger.replayer)
         self.assertTrue(debugger.replayer.cache_loaded)
     
+    def test_interactive_display_single_write(self):
+        """Test the interactive debugger emits each display frame with one write"""
+        replayer = UDPReplayer(
+            log_file=self.temp_file.name,
+            target_host='localhost',
+            target_port=self.test_port
+        )
+        self.assertTrue(replayer.load_message_cache())
+        replayer.breakpoint_manager.add_size_breakpoint(min_size=1000)
+        replayer.current_message_data = b"$GPGGA,123519"
+        replayer.current_message_number = 0
+        
+        debugger = InteractiveDebugger(replayer)
+        debugger.show_hex_dump = True
+        
+        with patch('sys.stdout') as stdout:
+            debugger._update_display()
+        
+        stdout.write.assert_called_once()
+        stdout.flush.assert_called_once()
+        frame = stdout.write.call_args[0][0]
+        self.assertTrue(frame.startswith("\033[2J"))
+        self.assertIn("BREAKPOINTS:", frame)
+        self.assertIn("HEX DUMP:", frame)
+    
+    def test_interactive_key_dispatch(self):
+        """Test keys dispatch through the ordinal lookup table"""
+        replayer = UDPReplayer(
+            log_file=self.temp_file.name,
+            target_host='localhost',
+            target_port=self.test_port
+        )
+        debugger = InteractiveDebugger(replayer)
+        
+        for key, handler in debugger.key_bindings.items():
+            self.assertEqual(debugger._key_lut[ord(key)], handler)
+        
+        debugger._handle_key('h')
+        self.assertTrue(debugger.show_hex_dump)
+        
+        for key in ('z', '\u20ac', ''):
+            debugger._handle_key(key)
+            self.assertIn("Unknown key", debugger.status_message)
+    
+    def test_interactive_help_stays_until_next_refresh(self):
+        """Test the help key does not force a redraw over the help screen"""
+        debugger = InteractiveDebugger(UDPReplayer(log_file=self.temp_file.name))
+        
+        with patch('sys.stdout') as stdout:
+            debugger._handle_key('?')
+        
+        self.assertIn("Show this help", stdout.write.call_args[0][0])
+        self.assertFalse(debugger._redraw_now)
+        
+        debugger._handle_key('h')
+        self.assertTrue(debugger._redraw_now)
+    
+    def test_interactive_display_redraws_changed_rows(self):
+        """Test later display frames only rewrite the rows that changed"""
+        replayer = UDPReplayer(
+            log_file=self.temp_file.name,
+            target_host='localhost',
+            target_port=self.test_port
+        )
+        self.assertTrue(replayer.load_message_cache())
+        debugger = InteractiveDebugger(replayer)
+        
+        with patch('sys.stdout') as stdout:
+            debugger._update_display()
+            debugger._update_display()
+            self.assertEqual(stdout.write.call_count, 1)
+            
+            replayer.stats['messages_sent'] = 42
+            debugger._update_display()
+        
+        update = stdout.write.call_args[0][0]
+        self.assertNotIn("\033[2J", update)
+        self.assertIn("Messages Sent: 42", update)
+        self.assertNotIn("UDP REPLAY INTERACTIVE DEBUGGER", update)
+    
+    def test_interactive_display_full_redraw_after_other_output(self):
+        """Test the whole frame is repainted after something else wrote to the terminal"""
+        replayer = UDPReplayer(
+            log_file=self.temp_file.name,
+            target_host='localhost',
+            target_port=self.test_port
+        )
+        self.assertTrue(replayer.load_message_cache())
+        debugger = InteractiveDebugger(replayer)
+        
+        with patch('sys.stdout') as stdout:
+            debugger._update_display()
+            debugger.invalidate_screen()
+            debugger._update_display()
+            self.assertEqual(stdout.write.call_count, 2)
+            
+            update = stdout.write.call_args[0][0]
+            self.assertIn("\033[2J", update)
+            self.assertIn("UDP REPLAY INTERACTIVE DEBUGGER", update)
+            
+            # Back to row diffs once the screen has been repainted
+            debugger._update_display()
+            self.assertEqual(stdout.write.call_count, 2)
+    
+    def test_debugger_state_in_slots(self):
+        """Test debugger state is held in slots rather than the instance dict"""
+        replayer = UDPReplayer(log_file=self.temp_file.name)
+        
+        self.assertEqual(InteractiveDebugger(replayer).__dict__, {})
+        self.assertFalse(hasattr(SimpleDebugger(replayer), '__dict__'))
+    
+    def test_interactive_input_batch_dispatch(self):
+        """Test a batch of raw key bytes dispatches each key and drops escape sequences"""
+        debugger = InteractiveDebugger(UDPReplayer(log_file=self.temp_file.name))
+        
+        with patch.object(debugger, '_handle_key') as handle_key:
+            debugger._handle_input(b'h\x1b[Aq\x1b')
+        
+        self.assertEqual([c[0][0] for c in handle_key.call_args_list], ['h', 'q', '\x1b'])
+    
+    def test_interactive_breakpoint_rows_follow_version(self):
+        """Test breakpoint rows are reused until a breakpoint changes"""
+        replayer = UDPReplayer(log_file=self.temp_file.name)
+        bp_id = replayer.breakpoint_manager.add_size_breakpoint(min_size=1000, name="big")
+        debugger = InteractiveDebugger(replayer)
+        
+        rows = debugger._breakpoint_list_rows()
+        self.assertIs(debugger._breakpoint_list_rows(), rows)
+        self.assertEqual(rows, [f"  \u2713 [{bp_id}] big (size)"])
+        
+        replayer.breakpoint_manager.disable_breakpoint(bp_id)
+        self.assertEqual(debugger._breakpoint_list_rows(), [f"  \u2717 [{bp_id}] big (size)"])
+    
+    def test_interactive_hex_dump_cached(self):
+        """Test the hex dump is only reformatted when the message changes"""
+        replayer = UDPReplayer(
+            log_file=self.temp_file.name,
+            target_host='localhost',
+            target_port=self.test_port
+        )
+        replayer.current_message_data = b"$GPGGA,123519"
+        debugger = InteractiveDebugger(replayer)
+        debugger.show_hex_dump = True
+        
+        with patch('sys.stdout'), \
+             patch.object(debugger.inspector, 'hex_dump', wraps=debugger.inspector.hex_dump) as hex_dump:
+            debugger._update_display()
+            debugger._update_display()
+            self.assertEqual(hex_dump.call_count, 1)
+            
+            debugger.hex_dump_lines = 1
+            debugger._update_display()
+            self.assertEqual(hex_dump.call_count, 2)
+            
+            replayer.current_message_data = b"$GPRMC,123519"
+            debugger._update_display()
+            self.assertEqual(hex_dump.call_count, 3)
+    
+    @unittest.skipIf(sys.platform == 'win32', "needs a pseudo-terminal")
+    def test_interactive_write_uses_stdout_fd(self):
+        """Test frames go straight to the terminal fd as encoded bytes"""
+        debugger = InteractiveDebugger(UDPReplayer(log_file=self.temp_file.name))
+        read_fd, write_fd = os.pipe()
+        try:
+            debugger._stdout_fd = write_fd
+            debugger._stdout_encoding = 'utf-8'
+            with patch('sys.stdout') as stdout:
+                debugger._write("\033[1;1H  \u2713 [1] size\033[K")
+            
+            stdout.write.assert_not_called()
+            self.assertEqual(os.read(read_fd, 1024), "\033[1;1H  \u2713 [1] size\033[K".encode('utf-8'))
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+    
+    def test_interactive_event_loop_blocks_until_input(self):
+        """Test the event loop wakes on a key press and exits promptly on stop"""
+        import pty
+        master, slave = pty.openpty()
+        
+        with open(slave, 'r') as tty_in, patch('sys.stdin', tty_in), \
+             patch.object(InteractiveDebugger, '_update_display') as update_display, \
+             patch.object(InteractiveDebugger, '_show_welcome'):
+            debugger = InteractiveDebugger(UDPReplayer(log_file=self.temp_file.name))
+            debugger.display_interval = 60.0
+            debugger.start_interactive_mode()
+            
+            os.write(master, b'h')
+            deadline = time.time() + 2.0
+            while not update_display.called and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(debugger.show_hex_dump)
+            self.assertEqual(update_display.call_count, 1)
+            
+            started = time.time()
+            debugger.stop_interactive_mode()
+            self.assertLess(time.time() - started, 0.5)
+            self.assertFalse(debugger.event_thread.is_alive())
+        
+        os.close(master)
+    
     def test_error_handling_integration(self):
         """Test error handling in integration scenarios"""
         # Test with non-existent file
@@ -10,6 +10,7 @@ import threading
 import time
 import json
 from pathlib import Path
+from unittest.mock import patch
 import sys
 import os
 
@@ -19,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from udp_replayer import UDPReplayer
 from message_inspector import MessageInspector
 from message_filter import MessageFilter
+import breakpoint_manager
 from breakpoint_manager import BreakpointManager
 import config
 
@@ -155,6 +157,19 @@ class TestMessageFilter(unittest.TestCase):
         passed, failed = self.filter.apply_filters(wrong_pattern, 3)
         self.assertFalse(passed)
 
+    
+    def test_version_bumped_on_change(self):
+        """Test the filter version changes only when filters are added or cleared"""
+        version = self.filter.version
+        self.filter.add_size_filter(min_size=10)
+        self.assertGreater(self.filter.version, version)
+        
+        version = self.filter.version
+        self.filter.apply_filters(b"$GPGGA,123519", 1)
+        self.assertEqual(self.filter.version, version)
+        
+        self.filter.clear_filters()
+        self.assertGreater(self.filter.version, version)
 
 class TestBreakpointManager(unittest.TestCase):
     """Test breakpoint manager functionality"""
@@ -196,6 +211,53 @@ class TestBreakpointManager(unittest.TestCase):
         hit = self.bp_manager.check_breakpoints(other_data, 2)
         self.assertIsNone(hit)
     
+    def test_multiple_contains_patterns(self):
+        """Test that 'contains' patterns are matched in one scan and fire in registration order"""
+        for matcher in ('automaton', 'jit', 'fallback'):
+            with self.subTest(matcher=matcher), \
+                 patch.object(breakpoint_manager, 'ahocorasick',
+                              breakpoint_manager.ahocorasick if matcher == 'automaton' else None), \
+                 patch.object(breakpoint_manager, 'JIT_SCAN_MIN_PATTERNS', 1 if matcher == 'jit' else 10**6):
+                bp_manager = BreakpointManager()
+                gp_id = bp_manager.add_pattern_breakpoint(b"$GP")
+                sync_id = bp_manager.add_pattern_breakpoint(b"\xaa\x44\x12")
+                
+                hit = bp_manager.check_breakpoints(b"\x00\xaa\x44\x12\x1c $GPGGA", 1)
+                self.assertEqual(hit['breakpoint_id'], gp_id)
+                
+                hit = bp_manager.check_breakpoints(b"\x00\xaa\x44\x12\x1c", 2)
+                self.assertEqual(hit['breakpoint_id'], sync_id)
+                
+                self.assertTrue(bp_manager.remove_breakpoint(sync_id))
+                self.assertIsNone(bp_manager.check_breakpoints(b"\x00\xaa\x44\x12\x1c", 3))
+    
+    def test_bmh_shift_table_cached_per_pattern(self):
+        """Test the BMH shift table is built once, when a 'contains' pattern is added"""
+        shifts = breakpoint_manager._bmh_shift_table(b"ABCA")
+        self.assertEqual((shifts[ord('A')], shifts[ord('B')], shifts[ord('C')], shifts[0]), (3, 2, 1, 4))
+        
+        bp_id = self.bp_manager.add_pattern_breakpoint(b"ABCA")
+        self.assertEqual(self.bp_manager._contains_shifts[bp_id], shifts)
+        
+        self.bp_manager.remove_breakpoint(bp_id)
+        self.assertEqual(self.bp_manager._contains_shifts, {})
+    
+    def test_anchored_pattern_breakpoints(self):
+        """Test prefix, suffix and exact pattern breakpoints resolved by lookup"""
+        start_id = self.bp_manager.add_pattern_breakpoint(b"\xaa\x44", "starts_with")
+        end_id = self.bp_manager.add_pattern_breakpoint(b"*47", "ends_with")
+        exact_id = self.bp_manager.add_pattern_breakpoint(b"PING", "exact")
+        
+        self.assertEqual(self.bp_manager.check_breakpoints(b"\xaa\x44\x12\x1c", 1)['breakpoint_id'], start_id)
+        self.assertEqual(self.bp_manager.check_breakpoints(b"$GPGGA,1*47", 2)['breakpoint_id'], end_id)
+        self.assertEqual(self.bp_manager.check_breakpoints(b"PING", 3)['breakpoint_id'], exact_id)
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"PINGS", 4))
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"47", 5))
+        
+        self.assertTrue(self.bp_manager.remove_breakpoint(start_id))
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"\xaa\x44\x12\x1c", 6))
+        self.assertEqual(self.bp_manager._prefix_index, {})
+    
     def test_size_breakpoint(self):
         """Test size breakpoint"""
         bp_id = self.bp_manager.add_size_breakpoint(min_size=20)
@@ -230,6 +292,228 @@ class TestBreakpointManager(unittest.TestCase):
         # Should trigger when enabled
         hit = self.bp_manager.check_breakpoints(data, 2, context)
         self.assertIsNotNone(hit)
+    
+    def test_version_bumped_on_change(self):
+        """Test the breakpoint version changes on every add, toggle and removal"""
+        versions = [self.bp_manager.version]
+        bp_id = self.bp_manager.add_size_breakpoint(min_size=100)
+        versions.append(self.bp_manager.version)
+        self.bp_manager.check_breakpoints(b"x" * 200, 1)
+        self.assertEqual(self.bp_manager.version, versions[-1])
+        
+        self.bp_manager.disable_breakpoint(bp_id)
+        versions.append(self.bp_manager.version)
+        self.bp_manager.enable_all_breakpoints()
+        versions.append(self.bp_manager.version)
+        self.bp_manager.remove_breakpoint(bp_id)
+        versions.append(self.bp_manager.version)
+        
+        self.assertEqual(len(set(versions)), len(versions))
+    
+    def test_enabled_breakpoint_list(self):
+        """Test that only enabled breakpoints are checked, in registration order"""
+        error_id = self.bp_manager.add_error_breakpoint()
+        size_id = self.bp_manager.add_size_breakpoint(min_size=1)
+        
+        self.bp_manager.disable_all_breakpoints()
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"data", 1, {'parse_error': True}))
+        self.assertEqual(self.bp_manager.get_breakpoint_stats()['enabled_breakpoints'], 0)
+        self.assertEqual(self.bp_manager.stats['total_checks'], 1)
+        
+        self.bp_manager.enable_breakpoint(size_id)
+        hit = self.bp_manager.check_breakpoints(b"data", 2, {'parse_error': True})
+        self.assertEqual(hit['breakpoint_id'], size_id)
+        
+        self.bp_manager.enable_all_breakpoints()
+        hit = self.bp_manager.check_breakpoints(b"data", 3, {'parse_error': True})
+        self.assertEqual(hit['breakpoint_id'], error_id)
+        
+        self.bp_manager.remove_breakpoint(error_id)
+        self.assertEqual([bp.id for bp in self.bp_manager._enabled_bps], [size_id])
+    
+    def test_typed_buckets_keep_registration_order(self):
+        """Test the earliest matching breakpoint wins across type buckets"""
+        custom_calls = []
+        
+        def custom_condition(data, msg_num, context):
+            custom_calls.append(msg_num)
+            return True
+        
+        count_id = self.bp_manager.add_count_breakpoint(error_count=2)
+        pattern_id = self.bp_manager.add_pattern_breakpoint(b"\xaa", "contains")
+        custom_id = self.bp_manager.add_custom_breakpoint(custom_condition, "always")
+        
+        hit = self.bp_manager.check_breakpoints(b"\x00\xaa", 1, {'parse_error': True})
+        self.assertEqual(hit['breakpoint_id'], pattern_id)
+        self.assertEqual(custom_calls, [])
+        
+        hit = self.bp_manager.check_breakpoints(b"\x00", 2, {'parse_error': True})
+        self.assertEqual(hit['breakpoint_id'], count_id)
+        self.assertEqual(custom_calls, [])
+        
+        self.bp_manager.remove_breakpoint(count_id)
+        hit = self.bp_manager.check_breakpoints(b"\x00", 3, {})
+        self.assertEqual(hit['breakpoint_id'], custom_id)
+        
+        # IDs are never reused after a removal
+        self.assertNotIn(self.bp_manager.add_error_breakpoint(), (count_id, pattern_id, custom_id))
+    
+    def test_protocol_breakpoints_share_one_inspection(self):
+        """Test protocol breakpoints inspect each message once"""
+        nmea_id = self.bp_manager.add_protocol_breakpoint("NMEA")
+        self.bp_manager.add_protocol_breakpoint("novatel")
+        nmea_data = b"$GPGGA,123519,4807.038,N"
+        
+        with patch.object(self.bp_manager.inspector, 'inspect_message',
+                          wraps=self.bp_manager.inspector.inspect_message) as mock_inspect:
+            hit = self.bp_manager.check_breakpoints(nmea_data, 1)
+            self.assertEqual(hit['breakpoint_id'], nmea_id)
+            self.assertIsNone(self.bp_manager.check_breakpoints(b"\x01\x02\x03\x04", 2))
+        
+            # The debugger's inspection of the same message reuses the cached result
+            self.bp_manager.inspect_message(nmea_data, 1)
+            self.assertEqual(mock_inspect.call_count, 2)
+    
+    def test_hit_context_is_snapshot(self):
+        """Test breakpoint hits keep a JSON-serializable copy of the context"""
+        self.bp_manager.add_error_breakpoint()
+        self.bp_manager.add_size_breakpoint(min_size=1)
+        
+        context = {'parse_error': True}
+        hit = self.bp_manager.check_breakpoints(b"data", 1, context)
+        context['parse_error'] = False
+        self.assertEqual(hit['context'], {'parse_error': True})
+        self.assertEqual(json.loads(json.dumps(hit['context'])), {'parse_error': True})
+        
+        hit = self.bp_manager.check_breakpoints(b"data", 2)
+        self.assertEqual(len(hit['context']), 0)
+        self.assertNotIn("Context Information", self.bp_manager.format_breakpoint_report(hit))
+    
+    def test_hit_timestamp_formatted_in_report(self):
+        """Test hits carry an integer timestamp that reports render as ISO-8601"""
+        self.bp_manager.add_size_breakpoint(min_size=1)
+        
+        hit = self.bp_manager.check_breakpoints(b"data", 1)
+        self.assertIsInstance(hit['timestamp_ns'], int)
+        
+        hit['timestamp_ns'] = 1_700_000_000_250_000_000
+        report = self.bp_manager.format_breakpoint_report(hit)
+        self.assertIn("Timestamp: 2023-11-14T22:13:20.250000", report)
+    
+    def test_breakpoint_lookup_by_id(self):
+        """Test toggling and removing breakpoints by ID"""
+        first_id = self.bp_manager.add_error_breakpoint()
+        second_id = self.bp_manager.add_size_breakpoint(min_size=1)
+        
+        self.assertFalse(self.bp_manager.enable_breakpoint(99))
+        self.assertFalse(self.bp_manager.disable_breakpoint(99))
+        self.assertFalse(self.bp_manager.remove_breakpoint(99))
+        
+        self.assertTrue(self.bp_manager.disable_breakpoint(second_id))
+        self.assertTrue(self.bp_manager.remove_breakpoint(first_id))
+        self.assertFalse(self.bp_manager.remove_breakpoint(first_id))
+        self.assertEqual([bp['id'] for bp in self.bp_manager.get_breakpoint_list()], [second_id])
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"data", 1, {'parse_error': True}))
+        
+        self.assertTrue(self.bp_manager.enable_breakpoint(second_id))
+        self.assertIsNotNone(self.bp_manager.check_breakpoints(b"data", 2))
+    
+    def test_slotted_breakpoint_records(self):
+        """Test breakpoint records are slotted and hits keep their bp_ fields"""
+        self.bp_manager.add_size_breakpoint(min_size=4, name="big")
+        record = self.bp_manager.breakpoints[0]
+        self.assertFalse(hasattr(record, '__dict__'))
+        
+        hit = self.bp_manager.check_breakpoints(b"data", 1)
+        self.assertEqual(hit['bp_name'], "big")
+        self.assertEqual(hit['bp_min_size'], 4)
+        self.assertIsNone(hit['bp_max_size'])
+        self.assertNotIn('bp_pattern', hit)
+        self.assertNotIn('bp_condition', hit)
+        self.assertEqual(record.hit_fields, {key: value for key, value in hit.items() if key.startswith('bp_')})
+    
+    def test_hit_history_bounded(self):
+        """Test hit history keeps only the most recent hits"""
+        with patch.object(config, 'REPLAY_HIT_HISTORY_MAX', 3):
+            bp_manager = BreakpointManager()
+        bp_manager.add_size_breakpoint(min_size=1)
+        
+        for msg_num in range(5):
+            bp_manager.check_breakpoints(b"data", msg_num)
+        
+        history = bp_manager.get_hit_history()
+        self.assertEqual([hit['message_number'] for hit in history], [2, 3, 4])
+        self.assertEqual(bp_manager.get_breakpoint_stats()['recent_hits'], history)
+        self.assertEqual(bp_manager.stats['breakpoints_hit'], 5)
+    
+    def test_hex_pattern_parsing(self):
+        """Test hex pattern breakpoints accept spaces and 0x prefixes"""
+        breakpoint_manager._parse_hex_pattern.cache_clear()
+        bp_id = self.bp_manager.add_hex_pattern_breakpoint("0xaa 0x44", "starts_with")
+        self.bp_manager.add_hex_pattern_breakpoint("0xaa 0x44", "ends_with")
+        self.assertEqual(breakpoint_manager._parse_hex_pattern.cache_info().hits, 1)
+        
+        hit = self.bp_manager.check_breakpoints(b"\xaa\x44\x12", 1)
+        self.assertEqual(hit['breakpoint_id'], bp_id)
+        self.assertEqual(hit['bp_pattern'], "aa44")
+        
+        self.assertEqual(self.bp_manager.add_hex_pattern_breakpoint("A0 ZZ"), -1)
+    
+    def test_short_messages_skip_pattern_scan(self):
+        """Test messages shorter than every pattern never reach the pattern scan"""
+        self.bp_manager.add_pattern_breakpoint(b"\xaa\x44\x12\x1c", "starts_with")
+        bp_id = self.bp_manager.add_pattern_breakpoint(b"\x12\x1c", "ends_with")
+        self.assertEqual(self.bp_manager._min_pattern_len, 2)
+        
+        with patch.object(self.bp_manager, '_scan_patterns', wraps=self.bp_manager._scan_patterns) as scan:
+            self.assertIsNone(self.bp_manager.check_breakpoints(b"\x12", 1))
+            scan.assert_not_called()
+            self.assertEqual(self.bp_manager.check_breakpoints(b"\x12\x1c", 2)['breakpoint_id'], bp_id)
+            scan.assert_called_once()
+    
+    def test_size_breakpoints_vectorized(self):
+        """Test size breakpoints give the same hits with the compiled, NumPy and loop checks"""
+        for matcher in ('compiled', 'numpy', 'loop'):
+            vectorized = matcher != 'loop'
+            with self.subTest(matcher=matcher), \
+                 patch.object(breakpoint_manager, 'breakpoint_core',
+                              breakpoint_manager.breakpoint_core if matcher == 'compiled' else None), \
+                 patch.object(breakpoint_manager, 'VECTOR_SIZE_MIN_BPS', 1 if vectorized else 10**6), \
+                 patch.object(breakpoint_manager, 'COMPILED_SIZE_MIN_BPS', 1 if vectorized else 10**6):
+                bp_manager = BreakpointManager()
+                error_id = bp_manager.add_error_breakpoint()
+                big_id = bp_manager.add_size_breakpoint(min_size=100)
+                tiny_id = bp_manager.add_size_breakpoint(max_size=2)
+                either_id = bp_manager.add_size_breakpoint(min_size=50, max_size=4)
+                self.assertEqual(bp_manager._size_bounds is not None, vectorized)
+        
+                self.assertIsNone(bp_manager.check_breakpoints(b"x" * 10, 1))
+                self.assertEqual(bp_manager.check_breakpoints(b"x" * 60, 2)['breakpoint_id'], either_id)
+                self.assertEqual(bp_manager.check_breakpoints(b"x" * 200, 3)['breakpoint_id'], big_id)
+                self.assertEqual(bp_manager.check_breakpoints(b"x", 4)['breakpoint_id'], tiny_id)
+                self.assertEqual(bp_manager.check_breakpoints(b"x", 5, {'parse_error': True})['breakpoint_id'],
+                                 error_id)
+    
+    def test_count_breakpoints_share_totals(self):
+        """Test count breakpoints track shared totals and keep progress while disabled"""
+        success_id = self.bp_manager.add_count_breakpoint(success_count=3)
+        error_id = self.bp_manager.add_count_breakpoint(error_count=2)
+        
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"x", 1, {'parse_success': True}))
+        self.assertIsNone(self.bp_manager.check_breakpoints(b"x", 2, {'parse_error': True}))
+        
+        # Progress made before a disable is kept; messages while disabled are not counted
+        self.bp_manager.disable_breakpoint(success_id)
+        hit = self.bp_manager.check_breakpoints(b"x", 3, {'parse_success': True, 'parse_error': True})
+        self.assertEqual(hit['breakpoint_id'], error_id)
+        self.assertEqual(hit['bp_custom_data']['error_count'], 2)
+        
+        self.bp_manager.enable_breakpoint(success_id)
+        hit = self.bp_manager.check_breakpoints(b"x", 4, {'parse_success': True})
+        self.assertEqual(hit['breakpoint_id'], error_id)
+        hit = self.bp_manager.check_breakpoints(b"x", 5, {'parse_success': True})
+        self.assertEqual(hit['breakpoint_id'], success_id)
+        self.assertEqual(hit['bp_custom_data']['success_count'], 3)
 
 
 class TestUDPReplayer(unittest.TestCase):
@@ -385,6 +669,23 @@ class TestUDPReplayer(unittest.TestCase):
         inspection = self.replayer.inspect_current_message()
         self.assertIsNotNone(inspection)
         self.assertEqual(inspection['message_number'], 0)
+    
+    def test_current_message_info_built_once_per_message(self):
+        """Test message info is only rebuilt when the current message changes"""
+        self.assertTrue(self.replayer.load_message_cache())
+        self.replayer.current_message_number = 0
+        self.replayer.current_message_data = self.replayer.message_cache[0]
+        
+        with patch.object(self.replayer.inspector, 'detect_protocol', return_value='nmea') as detect:
+            first = self.replayer.get_current_message_info()
+            first['message_size'] = -1
+            self.assertGreater(self.replayer.get_current_message_info()['message_size'], 0)
+            self.assertEqual(detect.call_count, 1)
+            
+            self.replayer.current_message_number = 1
+            self.replayer.current_message_data = self.replayer.message_cache[1]
+            self.assertEqual(self.replayer.get_current_message_info()['message_number'], 1)
+            self.assertEqual(detect.call_count, 2)
 
 
 class TestIntegration(unittest.TestCase):
@@ -77,6 +77,8 @@ class UDPReplayer:
         # Message tracking
         self.current_message_data: Optional[bytes] = None
         self.current_message_number = 0
+        # (message data, message number, info) for the last get_current_message_info()
+        self._message_info_cache: Tuple[Optional[bytes], int, Dict[str, Any]] = (None, -1, {})
         self.message_cache: List[bytes] = []
         self.cache_loaded = False
         
@@ -277,23 +279,32 @@ class UDPReplayer:
     
     def get_current_message_info(self) -> Optional[Dict[str, Any]]:
         """Get information about the current message"""
-        if not self.current_message_data or self.current_message_number < 0:
+        data = self.current_message_data
+        number = self.current_message_number
+        if not data or number < 0:
             return None
         
-        return {
-            'message_number': self.current_message_number,
-            'message_size': len(self.current_message_data),
-            'hex_preview': self.current_message_data[:50].hex().upper(),
-            'ascii_preview': self.inspector.get_ascii_preview(self.current_message_data, 100),
-            'protocol_detected': self.inspector.detect_protocol(self.current_message_data)
-        }
+        # Built once per message rather than on every display refresh; the replay
+        # loop itself never pays for it
+        cached_data, cached_number, info = self._message_info_cache
+        if cached_data is not data or cached_number != number:
+            info = {
+                'message_number': number,
+                'message_size': len(data),
+                'hex_preview': data[:50].hex().upper(),
+                'ascii_preview': self.inspector.get_ascii_preview(data, 100),
+                'protocol_detected': self.inspector.detect_protocol(data)
+            }
+            self._message_info_cache = (data, number, info)
+        return info.copy()
     
     def inspect_current_message(self) -> Optional[Dict[str, Any]]:
         """Perform detailed inspection of current message"""
         if not self.current_message_data:
             return None
         
-        return self.inspector.inspect_message(self.current_message_data, self.current_message_number)
+        # Shares the inspection already made for protocol breakpoints, if any
+        return self.breakpoint_manager.inspect_message(self.current_message_data, self.current_message_number)
     
     def get_replay_stats(self) -> Dict[str, Any]:
         """Get comprehensive replay statistics"""